@@ -1,21 +1,28 @@
 # app.py
 # This is the main application file. It sets up the Tkinter window,
-# manages the different frames (screens), handles database interactions (via DatabaseManager),
-# and runs the email reminder thread.
+# manages the different frames (screens) and runs the email reminder thread.
+# The task logic itself (saving, validating, the task list, the reminder schedule)
+# lives in TaskService; this file connects it to the windows.
+
+import time # For timing the startup (see STARTUP_BENCHMARK)
+STARTED_AT = time.perf_counter() # When app.py started loading, before the imports below
 
 import tkinter as tk
 from tkinter import ttk, messagebox
-from frames import Tasks, AddEdit, Info # Import the frame classes we created
+import frames # The frame classes we created (each one is imported when it's first shown)
 from database_manager import DatabaseManager # Import the DB handling class
-from datetime import date, datetime, timedelta # Need these for date/time logic
-from task import Task # Import the Task class definition
+from datetime import date # Need this for date logic
+from task_service import TaskService # The task logic, without any windows
+from recurrence import describe_rule # "Every week" etc. for the Info frame
+from background import BackgroundExecutor # Runs database reads off the Tk thread
+import profiling # Opt-in timing spans and cProfile (see --profile)
 import threading # For running email reminders in the background
-import time      # For pausing the reminder thread
-import smtplib   # For sending emails (Simple Mail Transfer Protocol)
-from email.message import EmailMessage # For constructing email messages easily
+import logging   # Level-controlled messages for the reminders
 import os        # To get environment variables for email credentials
 import sys       # To help find resource paths when packaged (PyInstaller)
 from dotenv import load_dotenv # To load environment variables from a .env file
+# The email modules (smtplib, email, reminder_email, mail_transport, reminder_dispatcher, async_reminders) are imported
+# where they're used, after the window is shown: the reminders don't need them any sooner.
 
 # Load environment variables from .env file if it exists.
 # This is useful for storing credentials locally during development.
@@ -35,8 +42,31 @@ SMTP_SERVER = os.getenv("SMTP_SERVER", "smtp.gmail.com") # Default to Gmail SMTP
 SMTP_PORT = int(os.getenv("SMTP_PORT", 587))           # Default to standard TLS port
 EMAIL_SENDER_ADDRESS = os.getenv("EMAIL_ADDRESS")        # Your email address (sender)
 EMAIL_SENDER_PASSWORD = os.getenv("EMAIL_PASSWORD")      # Your email app password
-REMINDER_CHECK_INTERVAL_SECONDS = 60 # How often (in seconds) to check for reminders
+SMTP_USE_TLS = os.getenv("SMTP_USE_TLS", "1") != "0"     # Set to 0 for a local test server without TLS
+SMTP_IDLE_TIMEOUT_SECONDS = float(os.getenv("SMTP_IDLE_TIMEOUT_SECONDS", 60)) # Close the SMTP session after this much idle time
+TASK_PAGE_SIZE = 200                 # How many tasks the list loads from the database at a time
+REMINDER_MAX_SLEEP_SECONDS = 3600   # Longest the reminder thread sleeps without re-checking the clock
 REMINDER_WINDOW_MINUTES = 5          # How many minutes before due time to send reminder
+REMINDER_SEND_WORKERS = int(os.getenv("REMINDER_SEND_WORKERS", 4))      # Threads sending reminder emails
+REMINDER_QUEUE_SIZE = int(os.getenv("REMINDER_QUEUE_SIZE", 1000))       # Max. reminders waiting to be sent
+REMINDER_QUEUE_FULL_POLICY = os.getenv("REMINDER_QUEUE_FULL_POLICY", "block") # "block" or "drop" when the queue is full
+REMINDER_PER_DOMAIN_LIMIT = int(os.getenv("REMINDER_PER_DOMAIN_LIMIT", 2)) # Max. parallel sends to one recipient domain
+REMINDER_MAX_RETRIES = int(os.getenv("REMINDER_MAX_RETRIES", 3))        # Retries for temporary SMTP errors
+REMINDER_RETRY_BACKOFF_SECONDS = float(os.getenv("REMINDER_RETRY_BACKOFF_SECONDS", 2)) # First retry delay (doubles each time)
+REMINDER_ENGINE = os.getenv("REMINDER_ENGINE", "threads") # "threads" (sender threads) or "asyncio" (one event loop)
+REMINDER_SMTP_CONNECTIONS = int(os.getenv("REMINDER_SMTP_CONNECTIONS", 2)) # SMTP sessions of the asyncio engine
+# DEBUG also shows a line for every queued/sent reminder; WARNING only shows problems
+LOG_LEVEL = os.getenv("TASK_MANAGER_LOG_LEVEL", "INFO").upper()
+# Set e.g. to 9464 to serve the reminder metrics at http://127.0.0.1:9464/metrics (see metrics.py)
+METRICS_PORT = int(os.getenv("TASK_MANAGER_METRICS_PORT", 0))
+# Profiling (see profiling.py): "spans" or "cprofile", also set with "python app.py --profile[=cprofile]"
+PROFILE_MODE = os.getenv("TASK_MANAGER_PROFILE", "")
+PROFILE_DIR = os.getenv("TASK_MANAGER_PROFILE_DIR", "profiles")         # Where the results are written on exit
+PROFILE_CPROFILE_SECONDS = float(os.getenv("TASK_MANAGER_PROFILE_SECONDS", 60)) # cProfile runs this long after startup
+# Set to 1 by benchmarks/bench_startup.py: print the startup times and close again right away
+STARTUP_BENCHMARK = os.getenv("TASK_MANAGER_STARTUP_BENCHMARK") == "1"
+
+log = logging.getLogger("app")
 
 # --- Helper Function ---
 def get_resource_path(relative_path):
@@ -93,8 +123,10 @@ class TaskManager(tk.Tk):
         # --- Database ---
         # Get the path to the database file using the helper function
         db_file = get_resource_path("task_database.db")
-        # Create an instance of the DatabaseManager to handle DB operations
-        self.db_manager = DatabaseManager(db_file)
+        # The task logic works on a DatabaseManager; the windows only talk to the service
+        self.task_service = TaskService(
+            DatabaseManager(db_file), REMINDER_WINDOW_MINUTES, REMINDER_MAX_SLEEP_SECONDS, TASK_PAGE_SIZE
+        )
 
         # --- Tkinter Variables ---
         # These variables are shared across different frames or hold application state.
@@ -110,120 +142,219 @@ class TaskManager(tk.Tk):
         self.selected_task_time_str = tk.StringVar(value="N/A") # Due Time (string for display)
         self.selected_task_email_str = tk.StringVar(value="N/A")# Email (string for display)
         self.selected_task_status_str = tk.StringVar(value="Pending") # Status ("Pending" or "Done")
+        self.selected_task_recurrence = tk.StringVar()  # Repeat rule as stored ("" if it doesn't repeat)
+        self.selected_task_repeat_str = tk.StringVar(value="N/A") # Repeat rule in words (for display)
+
+        # Database reads for the UI run on this worker thread, so a slow disk doesn't freeze
+        # the window; their results come back to the Tk thread through after().
+        self.background = BackgroundExecutor(self, on_busy=self.on_loading_changed)
 
         # --- Main Container Frame ---
         # This frame holds all other frames (Tasks, AddEdit, Info)
-        container = ttk.Frame(self, style="container.TFrame")
-        container.grid(row=0, column=0, sticky="nesw", padx=5, pady=5) # Fill the main window
+        self.container = ttk.Frame(self, style="container.TFrame")
+        self.container.grid(row=0, column=0, sticky="nesw", padx=5, pady=5) # Fill the main window
 
         # --- Frames Initialization ---
-        # Dictionary to store references to the different frame instances
+        # Dictionary to store references to the different frame instances, by class name.
+        # Only the Tasks frame is built now; the others are built the first time they're
+        # shown (see get_frame), so the window appears sooner.
         self.frames = dict()
-
-        # Create instances of each frame (screen)
-        # Pass 'self' (the controller) and necessary callback functions (lambdas) for switching frames.
-        tasks_frame = Tasks(container, self, lambda: self.show_frame(AddEdit), lambda: self.show_frame(Info))
-        add_edit_frame = AddEdit(container, self, lambda: self.show_frame(Tasks))
-        info_frame = Info(container, self, lambda: self.show_frame(Tasks), lambda: self.show_frame(AddEdit))
-
-        # Place all frames in the same grid cell; only one will be visible at a time.
-        tasks_frame.grid(row=0, column=0, sticky="nesw")
-        add_edit_frame.grid(row=0, column=0, sticky="nsew")
-        info_frame.grid(row=0, column=0, sticky="nesw")
-
-        # Store frame instances in the dictionary for easy access by class name
-        self.frames[Tasks] = tasks_frame
-        self.frames[AddEdit] = add_edit_frame
-        self.frames[Info] = info_frame
+        # The functions each frame gets for switching to the other frames
+        self.frame_callbacks = {
+            "Tasks": (lambda: self.show_frame("AddEdit"), lambda: self.show_frame("Info")),
+            "AddEdit": (lambda: self.show_frame("Tasks"),),
+            "Info": (lambda: self.show_frame("Tasks"), lambda: self.show_frame("AddEdit")),
+        }
 
         # --- Initial State ---
-        # Load tasks from the database and populate the listbox in the Tasks frame
-        self.fill_listbox(self.db_manager.get_all_tasks())
-        # Show the main Tasks frame first when the app starts
-        self.show_frame(Tasks)
+        # Every change to the task list updates the listbox
+        self.task_service.task_model.subscribe(self.on_task_model_changed)
+        # Show the main Tasks frame first when the app starts (still empty, see finish_startup)
+        self.show_frame("Tasks")
 
         # --- Reminder Thread ---
         # Set up an event flag to signal the reminder thread to stop when the app closes.
         self.stop_reminder_event = threading.Event()
+        self.reminder_thread = None     # Started in finish_startup
+        self.reminder_dispatcher = None # Created by the reminder thread (see run_reminders)
+        self.metrics_server = None      # Started in finish_startup if METRICS_PORT is set
+
+        # --- Graceful Shutdown ---
+        # Register a function ('on_closing') to be called when the user clicks the window's close button (X).
+        self.protocol("WM_DELETE_WINDOW", self.on_closing)
+
+        # Load the tasks and start the reminders once the window is on screen
+        self.after(0, self.finish_startup)
+        if profiling.is_enabled():
+            # cProfile (if it runs) only covers a limited window, the stats would get huge otherwise
+            self.after(int(PROFILE_CPROFILE_SECONDS * 1000), profiling.stop_cprofile)
+
+    def finish_startup(self):
+        """
+        The part of the startup that can wait until the window is visible:
+        loads the first page of tasks into the list and starts the reminder thread.
+        Runs from the event loop right after the app starts.
+        """
+        self.update_idletasks() # Draw the window first
+        first_paint = time.perf_counter()
+        # Load the first page of tasks from the database and populate the listbox in the Tasks frame
+        # (arrives a moment later, see load_tasks)
+        self.fill_listbox()
         # Create the background thread that will run the 'run_reminders' function.
         # daemon=True makes the thread exit automatically when the main app exits.
         self.reminder_thread = threading.Thread(target=self.run_reminders, daemon=True)
         # Start the reminder thread.
         self.reminder_thread.start()
+        if METRICS_PORT:
+            self.start_metrics_server()
 
-        # --- Graceful Shutdown ---
-        # Register a function ('on_closing') to be called when the user clicks the window's close button (X).
-        self.protocol("WM_DELETE_WINDOW", self.on_closing)
+        if STARTUP_BENCHMARK:
+            self.report_startup(first_paint)
+
+    def report_startup(self, first_paint):
+        """
+        For benchmarks/bench_startup.py: waits until the first page of tasks is shown,
+        prints the startup times and closes the app.
+        Args:
+            first_paint (float): time.perf_counter() when the window was drawn.
+        """
+        if self.background.is_pending("task_page"):
+            self.after(5, lambda: self.report_startup(first_paint)) # Not loaded yet
+            return
+        self.update_idletasks() # Draw the filled list too
+        # Parsed by benchmarks/bench_startup.py
+        print(f"STARTUP first_paint_ms={(first_paint - STARTED_AT) * 1000:.1f} "
+              f"list_filled_ms={(time.perf_counter() - STARTED_AT) * 1000:.1f}")
+        self.after(0, self.on_closing)
+
+    def start_metrics_server(self):
+        """
+        Serves the reminder metrics (see metrics.py) at http://127.0.0.1:METRICS_PORT/metrics.
+        """
+        from metrics import start_http_server
+        try:
+            self.metrics_server = start_http_server(METRICS_PORT)
+        except OSError as e:
+            log.error("metrics endpoint not started port=%d error=%s", METRICS_PORT, e) # e.g. port in use
+            return
+        log.info("metrics endpoint url=http://127.0.0.1:%d/metrics", METRICS_PORT)
+
+    def get_frame(self, name):
+        """
+        Returns a frame (screen), building it the first time it's needed.
+        Args:
+            name (str): The frame's class name ("Tasks", "AddEdit" or "Info").
+        Returns:
+            ttk.Frame: The frame instance.
+        """
+        frame = self.frames.get(name)
+        if frame is None:
+            frame_class = getattr(frames, name) # Imports the frame's module on first use
+            # Pass 'self' (the controller) and the callback functions for switching frames.
+            frame = frame_class(self.container, self, *self.frame_callbacks[name])
+            # Place all frames in the same grid cell; only one will be visible at a time.
+            frame.grid(row=0, column=0, sticky="nesw")
+            self.frames[name] = frame
+        return frame
 
     def show_frame(self, container_class):
         """
         Brings the specified frame (identified by its class name) to the front, making it visible.
         Args:
-            container_class: The class name of the frame to show (e.g., Tasks, AddEdit, Info).
+            container_class (str): The class name of the frame to show (e.g., "Tasks", "AddEdit", "Info").
         """
-        frame = self.frames[container_class]
+        frame = self.get_frame(container_class)
         # Special handling when switching to the AddEdit frame
-        if container_class == AddEdit and self.add_or_edit.get() == "Add Task":
+        if container_class == "AddEdit" and self.add_or_edit.get() == "Add Task":
              # If we are adding a new task, clear any old input first
              frame.clear_frame()
              # Set focus to the description field automatically
              frame.task_desc_input.focus()
-        elif container_class == Info:
+        elif container_class == "Info":
              # When showing the Info frame, update the button states (Edit/Done)
              # based on the loaded task's status.
              frame.update_button_states()
         # Raise the requested frame to the top of the stacking order.
         frame.tkraise()
 
-    def fill_listbox(self, task_list):
+    def fill_listbox(self, task_list=None):
         """
         Populates the listbox in the Tasks frame with task descriptions.
         Sorts tasks by due date/time (if available) before displaying.
+        Only needed for a full (re)load; single changes go through self.task_service.
         Args:
-            task_list (list[Task]): The list of Task objects to display.
-        """
-        listbox = self.frames[Tasks].tasks_listbox
-        listbox.delete(0, tk.END) # Clear any existing items first
-
-        # Define a sorting key function for tasks:
-        # - Tasks with due date/time come first, sorted chronologically.
-        # - Tasks without due date/time come after, sorted by ID (for stable order).
-        def sort_key(task):
-            dt = task.due_datetime # Get the combined datetime object (or None)
-            # Return a tuple for sorting: (primary_key, secondary_key)
-            return (0, dt) if dt else (1, task.id) # (0 means has date, 1 means no date)
-
-        # Sort the task list using the defined key
-        sorted_tasks = sorted(task_list, key=sort_key)
-
-        # Dictionary to map the listbox index to the actual task ID.
-        # This is needed because listbox indices can change if items are deleted/reordered.
-        self.task_id_map = {}
-
-        # Add each task to the listbox
-        for index, task in enumerate(sorted_tasks):
-            # Create the display text (description + optional date/time)
-            display_text = f"{task.desc}"
-            if task.due_date:
-                display_text += f" ({task.due_date}"
-                if task.due_time:
-                    display_text += f" {task.due_time}"
-                display_text += ")"
-            # Add a marker if the task is done
-            if task.status == 1:
-                 display_text += " [Done]"
-            # Insert the text into the listbox
-            listbox.insert(tk.END, display_text)
-            # Store the mapping: listbox index -> task ID
-            self.task_id_map[index] = task.id
-
-        # Optional: Color 'Done' items differently for visual cue
-        for i in range(listbox.size()):
-             item_text = listbox.get(i)
-             if "[Done]" in item_text:
-                 listbox.itemconfig(i, {'fg': 'grey'}) # Set color to grey
-             else:
-                 listbox.itemconfig(i, {'fg': COLOUR_LIGHT_TEXT}) # Use standard text color
+            task_list (list[Task], optional): The list of Task objects to display. If None, the
+                                              first page is loaded from the database and the
+                                              rest follows as the user scrolls.
+        """
+        # The model sorts the tasks (see task_model.task_sort_key) and tells
+        # on_task_model_changed to redraw the list.
+        if task_list is None:
+            self.load_tasks(reload=True)
+        else:
+            self.task_service.task_model.reset(task_list)
+
+
+    def load_tasks(self, reload=False):
+        """
+        Loads the next page of the task list (or the first page again) on the background
+        thread and adds it to the list when it arrives.
+        Args:
+            reload (bool): True to throw away the loaded tasks and start from the first page.
+        """
+        task_model = self.task_service.task_model
+        if reload:
+            after = None # Also replaces a page request that is still on its way
+        elif not task_model.has_more or self.background.is_pending("task_page"):
+            return # Everything is loaded, or the next page is already coming
+        else:
+            after = task_model.cursor
+        change_count = task_model.change_count
+
+        def add_page(page):
+            # Runs on the Tk thread once the page is read
+            if task_model.add_page(after, page, replace=reload, change_count=change_count) is None:
+                # Tasks were saved/deleted while the page was loading, it may be out of date
+                self.load_tasks(reload)
+
+        self.background.submit(self.task_service.fetch_page, after, key="task_page", on_done=add_page)
+
+
+    def on_loading_changed(self, busy):
+        """
+        Called by the background executor when it starts and stops working on database reads.
+        Shows a busy mouse cursor and the loading indicator of the Tasks frame.
+        Args:
+            busy (bool): True while reads are pending.
+        """
+        self.configure(cursor="watch" if busy else "")
+        tasks_frame = self.frames.get("Tasks") # May not be built yet at the very start
+        if tasks_frame is not None:
+            tasks_frame.show_loading(busy)
+
+
+    def on_task_model_changed(self, event, task, old_index, new_index):
+        """
+        Called by the task model after every change. Patches the list widget in place.
+        (The service keeps the reminder schedule in sync itself.)
+        Args:
+            event (str): "reset", "extend", "insert", "update" or "remove".
+            task (Task): The changed task (None for "reset" and "extend").
+            old_index (int): The task's position before the change (or None).
+            new_index (int): The task's position after the change (or None).
+        """
+        tasks_frame = self.get_frame("Tasks")
+        listbox = tasks_frame.tasks_listbox
+        if tasks_frame.is_searching():
+            # The list shows search results, search again so they include the change
+            self.refresh_search_results()
+        elif event == "reset":
+            # The list widget shares the model's list, so it only needs to redraw.
+            listbox.set_items(self.task_service.task_model.tasks)
+        elif event == "extend":
+            listbox.items_changed() # Another page was added at the end
+        else:
+            listbox.items_changed(old_index, new_index)
 
 
     def on_double_click(self, event=None):
@@ -233,28 +364,42 @@ class TaskManager(tk.Tk):
         Args:
             event: The event object passed by Tkinter (we don't use it directly here).
         """
-        listbox = self.frames[Tasks].tasks_listbox
-        selected_indices = listbox.curselection() # Get tuple of selected indices (usually just one)
-        if not selected_indices:
+        listbox = self.get_frame("Tasks").tasks_listbox
+        # The list widget knows which task is shown in the selected row
+        listed_task = listbox.selected_item()
+        if listed_task is None:
             return # Do nothing if nothing is selected
+        task_id = listed_task.id
 
-        selected_index = selected_indices[0] # Get the index of the selected item
-        try:
-             # Look up the actual task ID using the map we created in fill_listbox
-             task_id = self.task_id_map[selected_index]
-        except KeyError:
-             # This might happen if the map is out of sync (shouldn't normally occur)
-             messagebox.showerror("Error", "Could not find the selected task ID.")
-             return
+        # Usually the task was just listed, so it's in the task cache: show it right away
+        selected_task = self.task_service.get_cached_task(task_id)
+        if selected_task is not None:
+            self.background.cancel("selected_task") # An older, slower request mustn't replace it
+            self.show_task_info(task_id, selected_task)
+            return
 
-        # Retrieve the full task details from the database using the ID
-        selected_task = self.db_manager.get_task_by_id(task_id)
+        # Otherwise retrieve the full task details from the database using the ID, in the background.
+        # A quick second double-click replaces this request (only the last one is shown).
+        self.background.submit(
+            self.task_service.get_task, task_id, key="selected_task",
+            on_done=lambda selected_task: self.show_task_info(task_id, selected_task),
+            on_error=lambda e: messagebox.showerror("Error", f"Could not load the task: {e}"),
+        )
 
+
+    def show_task_info(self, task_id, selected_task):
+        """
+        Loads a task's details into the shared variables and shows the Info frame.
+        Called by on_double_click with the cached task or the result of its database read.
+        Args:
+            task_id (int): The ID of the double-clicked task.
+            selected_task (Task or None): The task as read from the database (None if it's gone).
+        """
         if not selected_task:
              # If task not found in DB (maybe deleted unexpectedly?)
              messagebox.showerror("Error", f"Task with ID {task_id} not found in database.")
              # Refresh the listbox to reflect the current DB state
-             self.fill_listbox(self.db_manager.get_all_tasks())
+             self.fill_listbox()
              return
 
         # --- Update the shared Tkinter variables ---
@@ -268,35 +413,55 @@ class TaskManager(tk.Tk):
         self.selected_task_date_str.set(selected_task.due_date if selected_task.due_date else "N/A")
         self.selected_task_time_str.set(selected_task.due_time if selected_task.due_time else "N/A")
         self.selected_task_email_str.set(selected_task.email if selected_task.email else "N/A")
+        self.selected_task_recurrence.set(selected_task.recurrence or "")
+        self.selected_task_repeat_str.set(describe_rule(selected_task.recurrence) if selected_task.recurrence else "N/A")
         # Set status string based on the status value (0 or 1)
         self.selected_task_status_str.set("Pending" if selected_task.status == 0 else "Done")
 
         # Switch to the Info frame to display these details
-        self.show_frame(Info)
+        self.show_frame("Info")
 
 
     def change_status(self, task_id):
         """
         Marks a task as 'Done' in the database and updates the UI.
+        A repeating task moves on to its next occurrence instead, which the Info frame then shows.
         Args:
             task_id (int): The ID of the task to mark as done.
         """
-        self.db_manager.update_status(task_id) # Update the database
-        self.selected_task_status_str.set("Done") # Update the shared variable (for Info frame)
-        # Refresh the main listbox to show the "[Done]" marker and potentially re-sort/re-color
-        self.fill_listbox(self.db_manager.get_all_tasks())
+        # Saves it, drops its reminder and updates just this task in the list (the "[Done]" marker)
+        next_task = self.task_service.mark_done(task_id)
+        if next_task is not None:
+            # Still pending, just with its next date
+            self.selected_task_date_str.set(next_task.due_date)
+        else:
+            self.selected_task_status_str.set("Done") # Update the shared variable (for Info frame)
+        self.refresh_search_results() # In case the task is listed as a search result
         # Update the button states in the Info frame (disable Edit/Done buttons)
         # Need to access the frame instance directly here
-        self.frames[Info].update_button_states()
+        self.get_frame("Info").update_button_states()
 
 
     def delete_task(self, task_id):
         """
-        Deletes a task from the database. (Actual deletion logic is in db_manager).
+        Deletes a task. (Actual deletion logic is in the task service).
         Args:
             task_id (int): The ID of the task to delete.
         """
-        self.db_manager.delete_task(task_id)
+        # Deletes it from the database, forgets its reminder and takes it out of the list
+        self.task_service.delete_task(task_id)
+        self.refresh_search_results() # In case the task is listed as a search result
+
+
+    def refresh_search_results(self):
+        """
+        Runs the search again (debounced) if the Tasks frame shows search results.
+        Results can include tasks from pages that aren't loaded yet; the task model
+        doesn't report changes to those, so the app asks for a fresh search itself.
+        """
+        tasks_frame = self.get_frame("Tasks")
+        if tasks_frame.is_searching():
+            tasks_frame.schedule_search()
 
 
     def show_delete_confirmation(self, task_id):
@@ -305,9 +470,9 @@ class TaskManager(tk.Tk):
         Args:
             task_id (int): The ID of the task potentially being deleted.
         """
-        # Get the task description to show in the confirmation message
-        task = self.db_manager.get_task_by_id(task_id)
-        task_name = task.desc if task else f"Task ID {task_id}" # Use description or ID if task not found
+        # The task description to show in the confirmation message (it's the task shown in the
+        # Info frame, loaded by on_double_click, so there's no need to read it again)
+        task_name = self.selected_task_desc.get() or f"Task ID {task_id}"
 
         # Ask the user for confirmation
         yes_no = messagebox.askyesno(
@@ -317,12 +482,9 @@ class TaskManager(tk.Tk):
         )
         # If the user clicks "Yes"...
         if yes_no:
-            self.delete_task(task_id) # ...delete the task...
-            # ...refresh the main listbox...
-            task_list = self.db_manager.get_all_tasks()
-            self.fill_listbox(task_list)
+            self.delete_task(task_id) # ...delete the task (also removes it from the list)...
             # ...and switch back to the Tasks frame.
-            self.show_frame(Tasks)
+            self.show_frame("Tasks")
         # else: User clicked "No", do nothing.
 
 
@@ -332,7 +494,7 @@ class TaskManager(tk.Tk):
         Populates the input fields with the selected task's details.
         Called before switching to the AddEdit frame for editing.
         """
-        frame = self.frames[AddEdit] # Get the AddEdit frame instance
+        frame = self.get_frame("AddEdit") # Get the AddEdit frame instance
         self.add_or_edit.set("Edit Task") # Set the title label for the frame
 
         # Populate the input fields using the shared selected_task variables
@@ -342,6 +504,7 @@ class TaskManager(tk.Tk):
         frame.task_note_input.insert("1.0", self.selected_task_note.get())
         # Set email, use empty string if it was "N/A"
         frame.task_email.set(self.selected_task_email_str.get() if self.selected_task_email_str.get() != "N/A" else "")
+        frame.task_recurrence.set(self.selected_task_recurrence.get())
 
         # --- Handle Date and Time Setup ---
         # Check if the selected task has a date
@@ -410,159 +573,206 @@ class TaskManager(tk.Tk):
         frame.task_desc_input.focus()
 
 
-    def is_desc_unique(self, new_desc, current_task_id=None):
-         """
-         Checks if a given task description is unique among all tasks.
-         Optionally excludes a specific task ID from the check (used during editing).
-         Args:
-             new_desc (str): The description string to check for uniqueness.
-             current_task_id (int, optional): The ID of the task being edited, to exclude it
-                                             from the uniqueness check against itself. Defaults to None.
-         Returns:
-             bool: True if the description is unique (or belongs to current_task_id), False otherwise.
-         """
-         tasks = self.db_manager.get_all_tasks() # Get all tasks
-         for task in tasks:
-             # If we are editing (current_task_id is provided) and this task is the one
-             # we are currently editing, skip the comparison with itself.
-             if current_task_id is not None and task.id == current_task_id:
-                 continue
-             # Compare the new description (case-insensitive) with existing ones
-             if new_desc.strip().lower() == task.desc.strip().lower():
-                 return False # Found a duplicate description
-         return True # No duplicates found
-
-
     # --- Email Reminder Logic ---
 
     def run_reminders(self):
         """
         The main function for the background reminder thread.
-        Periodically checks the database for tasks due soon and sends email reminders.
-        Runs in a loop until the stop_reminder_event is set.
+        Starts the sender threads, then the service's reminder loop sleeps until the next
+        reminder window starts and hands the due tasks to queue_reminders.
+        Runs until the stop_reminder_event is set, then stops the sender threads again.
+        With REMINDER_ENGINE=asyncio the thread runs the asyncio engine instead (see run_async_reminders).
         """
-        print("---- Reminder thread started ----")
-        # Loop indefinitely until the main app signals to stop
-        while not self.stop_reminder_event.is_set():
-            try:
-                # Get the current local time
-                now = datetime.now()
-                print(f"\n[{now.strftime('%Y-%m-%d %H:%M:%S')}] Reminder check running...")
-                # Get tasks eligible for reminders from the database
-                tasks_to_check = self.db_manager.get_tasks_for_reminder()
-
-                if not tasks_to_check:
-                    print("  - No tasks found needing reminders (pending, with date, time, and email).")
-                else:
-                     print(f"  - Found {len(tasks_to_check)} potential task(s) for reminder.")
-
-                # Iterate through the eligible tasks
-                for task in tasks_to_check:
-                    print(f"  - Checking task: ID={task.id}, Desc='{task.desc}', DueDate={task.due_date}, DueTime={task.due_time}, Email={task.email}, Status={task.status}")
-                    # Get the combined datetime object for the task's due date/time
-                    due_dt = task.due_datetime
-                    if due_dt: # Proceed only if date/time was parsed correctly
-                        # Calculate the start time for the reminder window
-                        reminder_time_start = due_dt - timedelta(minutes=REMINDER_WINDOW_MINUTES)
-                        # Check if the current time 'now' is within the reminder window
-                        is_condition_met = reminder_time_start <= now < due_dt
-                        print(f"    - Task {task.id}: Now='{now}', Due='{due_dt}', ReminderStart='{reminder_time_start}'")
-                        print(f"    - Condition Met (ReminderStart <= Now < Due): {is_condition_met}")
-
-                        # If the current time is within the window...
-                        if is_condition_met:
-                             print(f"    ======> Sending reminder for task: '{task.desc}' (ID: {task.id}) to {task.email}")
-                             # ...call the function to send the actual email...
-                             self.send_reminder_email(task)
-                             # IMPORTANT TODO: Implement logic to mark this task as 'reminder sent'
-                             # in the database to prevent sending multiple emails for the same task.
-                             # This would require adding a 'reminder_sent' column to the DB
-                             # and updating it here.
-                    else:
-                         # Log if date/time parsing failed for a task
-                         print(f"    - Task {task.id}: Could not parse due_datetime (Date: {task.due_date}, Time: {task.due_time}).")
-
-            except Exception as e:
-                # Catch any unexpected errors during the reminder check loop
-                print(f"!!!!!!!! ERROR in reminder thread loop: {e} !!!!!!!!")
-                import traceback
-                traceback.print_exc() # Print the full error details
-
-            # Pause the thread for the specified interval before the next check
-            # print(f" Reminder check finished. Waiting {REMINDER_CHECK_INTERVAL_SECONDS} seconds...")
-            # Wait efficiently using the event flag (allows quick exit if stop is signaled)
-            self.stop_reminder_event.wait(REMINDER_CHECK_INTERVAL_SECONDS)
-
-        print("---- Reminder thread stopped ----")
-
-
-    def send_reminder_email(self, task):
+        if REMINDER_ENGINE == "asyncio":
+            self.run_async_reminders()
+            return
+
+        # Imported here, in the background, so loading smtplib doesn't delay the window
+        from reminder_dispatcher import ReminderDispatcher # Worker pool that sends the reminder emails
+
+        # Sender threads for the reminder emails. The reminder thread only queues the due
+        # tasks, so a slow mail server never delays finding the next ones.
+        self.reminder_dispatcher = ReminderDispatcher(
+            send=self.send_reminder_email,
+            transport_factory=self.create_mail_transport, # Every worker keeps its own SMTP session
+            on_sent=self.on_reminder_sent,
+            on_failed=self.on_reminder_failed,
+            workers=REMINDER_SEND_WORKERS,
+            queue_size=REMINDER_QUEUE_SIZE,
+            per_domain_limit=REMINDER_PER_DOMAIN_LIMIT,
+            max_retries=REMINDER_MAX_RETRIES,
+            backoff_seconds=REMINDER_RETRY_BACKOFF_SECONDS,
+            block_when_full=REMINDER_QUEUE_FULL_POLICY != "drop",
+        )
+        self.reminder_dispatcher.start()
+        try:
+            self.task_service.run_reminders(self.stop_reminder_event, self.queue_reminders)
+        finally:
+            # Stop the sender threads (they close their SMTP sessions)
+            self.reminder_dispatcher.stop(timeout=1)
+
+
+    def run_async_reminders(self):
+        """
+        The reminder thread with REMINDER_ENGINE=asyncio: runs an event loop that finds the due
+        reminders and sends them all concurrently over REMINDER_SMTP_CONNECTIONS SMTP sessions.
+        Same behaviour as the threaded engine (ledger, retries, per-domain limit, queue policy).
+        Runs until the stop_reminder_event is set.
+        """
+        from async_reminders import AsyncReminderEngine # Imported in the background, like the dispatcher
+
+        # Stored as the dispatcher: it has the same submit()/stats(), so queue_reminders works for both
+        self.reminder_dispatcher = AsyncReminderEngine(
+            self.task_service,
+            send=self.send_reminder_email_async,
+            transport_factory=self.create_async_mail_transport,
+            on_sent=self.on_reminder_sent,
+            on_failed=self.on_reminder_failed,
+            connections=REMINDER_SMTP_CONNECTIONS,
+            queue_size=REMINDER_QUEUE_SIZE,
+            per_domain_limit=REMINDER_PER_DOMAIN_LIMIT,
+            max_retries=REMINDER_MAX_RETRIES,
+            backoff_seconds=REMINDER_RETRY_BACKOFF_SECONDS,
+            block_when_full=REMINDER_QUEUE_FULL_POLICY != "drop",
+        )
+        # Returns after the stop event is set; closes its SMTP sessions on the way out
+        self.reminder_dispatcher.run(self.stop_reminder_event, self.queue_reminders)
+
+
+    def queue_reminders(self, due_tasks, now):
+        """
+        Hands the tasks whose reminder is due to the sender threads.
+        Called by the reminder thread.
+        Args:
+            due_tasks (list[Task]): The tasks to remind about.
+            now (datetime): When the reminder thread found them.
+        """
+        if not self.is_email_configured():
+            return # Nothing we can send (warning logged by is_email_configured)
+        log.info("reminders due count=%d at=%s", len(due_tasks), now.strftime('%Y-%m-%d %H:%M:%S'))
+        for task in due_tasks:
+            log.debug("reminder queued task_id=%s email=%s", task.id, task.email)
+            # Hand it to the sender threads (waits or drops if the queue is full)
+            if not self.reminder_dispatcher.submit(task):
+                log.warning("reminder queue full, reminder dropped task_id=%s dropped_total=%d",
+                            task.id, self.reminder_dispatcher.stats()['dropped'])
+
+
+    def build_reminder_email(self, task):
+        """
+        Constructs the reminder email for a specific task.
+        Args:
+            task (Task): The task object for which to send a reminder.
+        Returns:
+            EmailMessage: The message, ready to be sent.
+        """
+        # The message itself is built in reminder_email.py (also used without the windows)
+        from reminder_email import build_reminder_email
+        return build_reminder_email(task, EMAIL_SENDER_ADDRESS)
+
+
+    def send_reminder_email(self, task, transport):
         """
         Constructs and sends the reminder email for a specific task.
-        Uses smtplib to connect to the SMTP server and send the message.
+        Runs in one of the reminder sender threads.
         Args:
             task (Task): The task object for which to send a reminder.
+            transport (SMTPTransport): The sender thread's SMTP session.
+        Raises:
+            smtplib.SMTPException or OSError: If the email couldn't be sent.
         """
-        # Check if necessary email configuration exists
-        if not task.email or not EMAIL_SENDER_ADDRESS or not EMAIL_SENDER_PASSWORD:
-            print("Email configuration incomplete (sender/password/recipient missing), cannot send reminder.")
-            return
+        transport.send(self.build_reminder_email(task))
+
+
+    async def send_reminder_email_async(self, task, transport):
+        """
+        Constructs and sends the reminder email for a specific task, for the asyncio engine.
+        Args:
+            task (Task): The task object for which to send a reminder.
+            transport (AsyncSMTPTransport): One of the engine's SMTP sessions.
+        Raises:
+            smtplib.SMTPException or OSError: If the email couldn't be sent.
+        """
+        await transport.send(self.build_reminder_email(task))
+
+
+    def create_mail_transport(self):
+        """
+        Creates an SMTP transport with the app's email settings.
+        Called once for every reminder sender thread.
+        Returns:
+            SMTPTransport: A transport that keeps its session open between reminders.
+        """
+        from mail_transport import SMTPTransport # Reusable SMTP session for reminder emails
+        return SMTPTransport(
+            SMTP_SERVER, SMTP_PORT, EMAIL_SENDER_ADDRESS, EMAIL_SENDER_PASSWORD,
+            use_tls=SMTP_USE_TLS, timeout=30, idle_timeout=SMTP_IDLE_TIMEOUT_SECONDS
+        )
+
+
+    def create_async_mail_transport(self):
+        """
+        Creates an asyncio SMTP transport with the app's email settings.
+        Called once for every SMTP session of the asyncio engine.
+        Returns:
+            AsyncSMTPTransport: A transport that keeps its session open between reminders.
+        """
+        from async_mail_transport import AsyncSMTPTransport
+        return AsyncSMTPTransport(
+            SMTP_SERVER, SMTP_PORT, EMAIL_SENDER_ADDRESS, EMAIL_SENDER_PASSWORD,
+            use_tls=SMTP_USE_TLS, timeout=30, idle_timeout=SMTP_IDLE_TIMEOUT_SECONDS
+        )
+
+
+    def is_email_configured(self):
+        """
+        Checks if the sender address, password and SMTP server are set.
+        Returns:
+            bool: True if reminders can be sent, False otherwise.
+        """
+        if not EMAIL_SENDER_ADDRESS or not EMAIL_SENDER_PASSWORD:
+            log.warning("email configuration incomplete (sender/password missing), cannot send reminders")
+            return False
         if not SMTP_SERVER:
-             print("SMTP server not configured, cannot send reminder.")
-             return
+             log.warning("SMTP server not configured, cannot send reminders")
+             return False
+        return True
 
-        # Create the email message object
-        msg = EmailMessage()
-        msg['Subject'] = f"Task Reminder: {task.desc}" # Email subject
-        msg['From'] = EMAIL_SENDER_ADDRESS           # Sender address
-        msg['To'] = task.email                       # Recipient address (from task)
-
-        # Format the due date and time nicely for the email body
-        due_datetime_obj = task.due_datetime
-        due_time_str = due_datetime_obj.strftime('%I:%M %p') if due_datetime_obj else "N/A" # e.g., 02:30 PM
-        due_date_str = due_datetime_obj.strftime('%A, %B %d, %Y') if due_datetime_obj else "N/A" # e.g., Tuesday, May 06, 2025
-
-        # Construct the email body
-        body = f"Hi,\n\nThis is a reminder for your upcoming task:\n\n"
-        body += f"  Task:       {task.desc}\n"
-        if task.note: # Only include note if it exists
-             body += f"  Note:       {task.note}\n"
-        body += f"  Due:        {due_date_str} at {due_time_str}\n\n"
-        body += f"Task Manager App\n" # Signature
-
-        # Set the email content
-        msg.set_content(body)
-
-        # --- Try sending the email ---
-        try:
-            print(f"    - Attempting to connect to SMTP server: {SMTP_SERVER}:{SMTP_PORT}")
-            # Connect to the SMTP server (using 'with' ensures connection is closed)
-            with smtplib.SMTP(SMTP_SERVER, SMTP_PORT, timeout=30) as server: # Added timeout
-                # print("    - Connection successful. Starting TLS...") # Debug
-                server.starttls() # Secure the connection using TLS
-                # print("    - TLS started. Logging in...") # Debug
-                # Log in to the sender's email account
-                server.login(EMAIL_SENDER_ADDRESS, EMAIL_SENDER_PASSWORD)
-                # print("    - Login successful. Sending message...") # Debug
-                # Send the email message
-                server.send_message(msg)
-                # print("    - Message sent.") # Debug
-            print(f"    - Reminder email sent successfully to {task.email} for task '{task.desc}'.")
-        except smtplib.SMTPAuthenticationError:
+
+    def on_reminder_sent(self, task):
+        """
+        Called by a sender thread after a reminder email went out.
+        Args:
+            task (Task): The task the reminder was for.
+        """
+        log.debug("reminder sent task_id=%s email=%s", task.id, task.email)
+        # Remember it, so it isn't sent again (e.g. after a restart)
+        self.task_service.reminder_sent(task)
+
+
+    def on_reminder_failed(self, task, error):
+        """
+        Called by a sender thread when a reminder email couldn't be sent (after any retries).
+        Args:
+            task (Task): The task the reminder was for.
+            error (Exception): The last error.
+        """
+        import smtplib # Already loaded by the sender threads, just for the error classes
+        # (The error types are also counted in the reminder_send_errors_total metric)
+        if isinstance(error, smtplib.SMTPAuthenticationError):
              # Handle login failure (wrong email/password/app password)
-             print(f"    - SMTP Authentication Error: Failed to login for email '{EMAIL_SENDER_ADDRESS}'. Check email/password/app password.")
-        except smtplib.SMTPConnectError:
+             log.error("SMTP login failed sender=%s (check email/password/app password) task_id=%s",
+                       EMAIL_SENDER_ADDRESS, task.id)
+        elif isinstance(error, smtplib.SMTPConnectError):
              # Handle failure to connect to the server
-             print(f"    - SMTP Connect Error: Failed to connect to server '{SMTP_SERVER}:{SMTP_PORT}'. Check server/port.")
-        except smtplib.SMTPServerDisconnected:
-             print(f"    - SMTP Error: Server disconnected unexpectedly.")
-        except TimeoutError:
-             print(f"    - SMTP Error: Connection to server timed out.")
-        except Exception as e:
-            # Catch any other exceptions during email sending
-            print(f"    - Failed to send email reminder for task '{task.desc}' to {task.email}: {e}")
-            import traceback
-            traceback.print_exc() # Print full traceback for unexpected errors
+             log.error("SMTP connect failed server=%s:%s (check server/port) task_id=%s", SMTP_SERVER, SMTP_PORT, task.id)
+        elif isinstance(error, smtplib.SMTPServerDisconnected):
+             log.error("SMTP server disconnected unexpectedly task_id=%s", task.id)
+        elif isinstance(error, TimeoutError):
+             log.error("SMTP connection timed out task_id=%s", task.id)
+        else:
+            # Any other error while sending this email
+            log.error("reminder send failed task_id=%s email=%s error=%r", task.id, task.email, error)
 
 
     def on_closing(self):
@@ -571,22 +781,61 @@ class TaskManager(tk.Tk):
         Called when the user closes the window (e.g., clicks the 'X' button or the Exit button).
         """
         print("Closing application...")
+        self.background.shutdown() # Finish the current database read, drop the rest
         # Signal the reminder thread that it should stop its loop
         self.stop_reminder_event.set()
-        # Wait a very short time to allow the thread to potentially finish its current cycle cleanly
-        # self.reminder_thread.join(timeout=0.5) # Optional: uncomment to wait slightly longer
+        self.task_service.stop_reminders() # Don't let the thread sleep until the next reminder
+        if self.reminder_thread is not None:
+            # On its way out the thread stops the sender threads (they close their SMTP sessions,
+            # which takes at most about a second)
+            self.reminder_thread.join(timeout=1.5)
+        if self.metrics_server is not None:
+            self.metrics_server.shutdown()
+        if profiling.is_enabled():
+            for path in profiling.dump():
+                log.info("profile written path=%s", path)
 
         # Close the database connection gracefully
-        if self.db_manager:
-            self.db_manager.close()
+        if self.task_service:
+            self.task_service.close()
         # Destroy the main Tkinter window
         self.destroy()
         print("Application closed.")
 
 
+def enable_profiling(mode):
+    """
+    Switches profiling on and wraps the app's entry points in timing spans.
+    Nothing is wrapped unless this is called, so normal runs don't pay for it.
+    Args:
+        mode (str): "spans" or "cprofile" (see profiling.enable).
+    """
+    from reminder_scheduler import ReminderScheduler
+    profiling.enable(mode, output_dir=PROFILE_DIR)
+    profiling.instrument(TaskManager, [
+        "finish_startup", "fill_listbox", "load_tasks", "on_task_model_changed", "on_double_click",
+        "show_task_info", "change_status", "delete_task", "refresh_search_results", "queue_reminders",
+    ])
+    profiling.instrument(TaskService, [
+        "fetch_page", "get_task", "search", "validate", "add_task", "update_task", "mark_done", "delete_task",
+    ])
+    profiling.instrument(ReminderScheduler, ["pop_due", "schedule"])
+    profiling.instrument(frames.Tasks, ["run_search", "show_search_results"])
+    log.info("profiling on mode=%s output=%s", mode, PROFILE_DIR)
+
+
 # --- Main Execution Block ---
 # This code runs only when the script is executed directly (not imported as a module).
 if __name__ == "__main__":
+    # One line per message: time, level, module and the message (with key=value details)
+    logging.basicConfig(level=LOG_LEVEL, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    import argparse
+    parser = argparse.ArgumentParser(description="Task Manager")
+    parser.add_argument("--profile", nargs="?", const="spans", default=PROFILE_MODE or None,
+                        choices=("spans", "cprofile"), help="time the app's hot paths (see profiling.py)")
+    args = parser.parse_args()
+    if args.profile:
+        enable_profiling(args.profile)
     try:
         # Create an instance of the main application class
         app = TaskManager()
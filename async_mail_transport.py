@@ -0,0 +1,288 @@
+# async_mail_transport.py
+# A small SMTP client for asyncio, used by the asyncio reminder engine (async_reminders.py).
+# It speaks just the part of SMTP the reminders need (EHLO, STARTTLS, AUTH PLAIN/LOGIN,
+# MAIL/RCPT/DATA, RSET, QUIT) and raises the same exceptions as smtplib, so the retry
+# rules in reminder_dispatcher.is_transient_error work for both engines.
+
+import asyncio  # Streams, locks and timers
+import base64   # AUTH PLAIN/LOGIN send the credentials base64 encoded
+import copy     # The message is sent without its Bcc header, on a copy
+import logging  # For errors while closing an idle session
+import re       # For dot-stuffing the message
+import smtplib  # Only for its exception classes
+import socket   # Our host name for EHLO
+import ssl      # For STARTTLS
+import time     # To know how long the session has been idle
+from email.utils import getaddresses # Recipient addresses from the message headers
+
+SMTP_LINE_LIMIT = 8192 # Longest reply line we accept
+
+log = logging.getLogger(__name__)
+
+class AsyncSMTPTransport:
+    """
+    One SMTP session, used from a single event loop, that stays open between messages
+    (like mail_transport.SMTPTransport, but the waiting doesn't block a thread).
+    The session is opened on the first send, reconnected if the server drops it,
+    and closed after it has been idle for idle_timeout seconds.
+    A session sends one message at a time; use several transports to send in parallel.
+    """
+    def __init__(self, host, port, username=None, password=None, use_tls=True, timeout=30, idle_timeout=60):
+        """
+        Args:
+            host (str): The SMTP server.
+            port (int): The SMTP server port.
+            username (str, optional): Login name. If None, no login is done (e.g. a local test server).
+            password (str, optional): Login password.
+            use_tls (bool): Whether to upgrade the connection with STARTTLS.
+            timeout (float): Seconds to wait for the server (connecting, and every reply).
+            idle_timeout (float): Seconds without a send after which the session is closed.
+        """
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.use_tls = use_tls
+        self.timeout = timeout
+        self.idle_timeout = idle_timeout
+        self._reader = None     # asyncio.StreamReader of the open session (or None)
+        self._writer = None     # asyncio.StreamWriter of the open session (or None)
+        self._features = {}     # ESMTP extensions from the last EHLO reply, e.g. {"auth": "PLAIN LOGIN"}
+        self._last_used = 0.0   # time.monotonic() of the last send
+        self._idle_handle = None # loop.call_later handle that closes the idle session
+        self._idle_closes = set() # Running _close_if_idle tasks (the loop only keeps weak references)
+        self._lock = None       # asyncio.Lock, created in the event loop on first use
+
+    async def send(self, msg):
+        """
+        Sends one message over the session, connecting first if needed.
+        If the server dropped the session since the last send, reconnects once and retries.
+        Args:
+            msg (EmailMessage): The message to send.
+        Raises:
+            smtplib.SMTPException or OSError: If the message couldn't be sent.
+        """
+        async with self._get_lock():
+            try:
+                await self._ensure_connected()
+                await self._send_message(msg)
+            except smtplib.SMTPServerDisconnected:
+                # Servers close sessions they consider idle; a fresh one usually works.
+                self._discard()
+                await self._ensure_connected()
+                await self._send_message(msg)
+            except (OSError, asyncio.IncompleteReadError, asyncio.LimitOverrunError, asyncio.CancelledError):
+                # Half-finished conversation (or cancelled in the middle), the session can't be trusted
+                self._discard()
+                raise
+            self._touch()
+
+    async def close(self):
+        """
+        Ends the session politely (QUIT), if one is open. The next send opens a new one.
+        """
+        async with self._get_lock(): # Not in the middle of a message
+            self._cancel_idle_timer()
+            if self._writer is None:
+                return
+            try:
+                await self._command("QUIT")
+            except (smtplib.SMTPException, OSError, asyncio.IncompleteReadError):
+                pass # Already gone, nothing to do
+            self._discard()
+
+    @property
+    def is_connected(self):
+        """
+        bool: True while a session is open.
+        """
+        return self._writer is not None
+
+    def _get_lock(self):
+        # The lock has to be created inside the event loop that uses it
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        return self._lock
+
+    async def _ensure_connected(self):
+        # Opens, secures and logs in a new session if there isn't one yet.
+        if self._writer is not None:
+            return
+        try:
+            self._reader, self._writer = await asyncio.wait_for(
+                asyncio.open_connection(self.host, self.port, limit=SMTP_LINE_LIMIT), self.timeout
+            )
+        except (OSError, asyncio.TimeoutError) as e: # (asyncio's own timeout class before Python 3.11)
+            raise smtplib.SMTPConnectError(-1, (str(e) or "Connection timed out").encode()) from e
+        try:
+            code, message = await self._read_reply()
+            if code != 220:
+                raise smtplib.SMTPConnectError(code, message)
+            await self._ehlo()
+            if self.use_tls:
+                if "starttls" not in self._features:
+                    raise smtplib.SMTPNotSupportedError("The server doesn't support STARTTLS.")
+                await self._expect("STARTTLS", 220)
+                # (StreamWriter.start_tls needs Python 3.11)
+                await self._writer.start_tls(ssl.create_default_context(), server_hostname=self.host)
+                await self._ehlo() # The extensions may differ after TLS
+            if self.username:
+                await self._login()
+        except BaseException:
+            self._discard()
+            raise
+
+    async def _ehlo(self):
+        # Greets the server and remembers which extensions it has
+        code, message = await self._command(f"EHLO {socket.gethostname() or 'localhost'}")
+        if code != 250:
+            raise smtplib.SMTPHeloError(code, message)
+        self._features = {}
+        for line in message.decode("latin-1").splitlines()[1:]: # The first line is the greeting
+            name, _, params = line.partition(" ")
+            self._features[name.lower()] = params
+
+    async def _login(self):
+        # AUTH PLAIN if the server has it, otherwise AUTH LOGIN
+        methods = self._features.get("auth", "").upper().split()
+        if "PLAIN" in methods or not methods:
+            token = base64.b64encode(f"\0{self.username}\0{self.password}".encode()).decode()
+            code, message = await self._command(f"AUTH PLAIN {token}")
+        else:
+            code, message = await self._command("AUTH LOGIN")
+            if code == 334:
+                code, message = await self._command(base64.b64encode(self.username.encode()).decode())
+            if code == 334:
+                code, message = await self._command(base64.b64encode(self.password.encode()).decode())
+        if code != 235:
+            raise smtplib.SMTPAuthenticationError(code, message)
+
+    async def _send_message(self, msg):
+        # One mail transaction: MAIL FROM, RCPT TO for every recipient, DATA
+        sender = getaddresses([msg["Sender"] or msg["From"] or ""])[0][1]
+        recipients = [address for _, address in getaddresses(msg.get_all("To", []) + msg.get_all("Cc", [])
+                                                             + msg.get_all("Bcc", [])) if address]
+        if not recipients:
+            raise smtplib.SMTPRecipientsRefused({})
+
+        code, message = await self._command(f"MAIL FROM:<{sender}>")
+        if code != 250:
+            await self._reset()
+            raise smtplib.SMTPSenderRefused(code, message, sender)
+        refused = {}
+        for recipient in recipients:
+            code, message = await self._command(f"RCPT TO:<{recipient}>")
+            if code not in (250, 251):
+                refused[recipient] = (code, message)
+        if len(refused) == len(recipients):
+            await self._reset()
+            raise smtplib.SMTPRecipientsRefused(refused)
+
+        code, message = await self._command("DATA")
+        if code != 354:
+            await self._reset()
+            raise smtplib.SMTPDataError(code, message)
+        await self._write_data(msg)
+        code, message = await self._read_reply()
+        if code != 250:
+            raise smtplib.SMTPDataError(code, message)
+        # Like smtplib, a message that reached some of its recipients counts as sent
+
+    async def _write_data(self, msg):
+        # The message without Bcc, with CRLF line ends, leading dots doubled, and the final "."
+        if msg["Bcc"] is not None:
+            msg = copy.copy(msg)
+            del msg["Bcc"] # (smtplib leaves it out of the sent message too)
+        data = msg.as_bytes(policy=msg.policy.clone(linesep="\r\n"))
+        data = re.sub(rb"(?m)^\.", b"..", data)
+        if not data.endswith(b"\r\n"):
+            data += b"\r\n"
+        self._writer.write(data + b".\r\n")
+        await self._writer.drain()
+
+    async def _reset(self):
+        # Drops the failed transaction, so the session can be used for the next message
+        try:
+            await self._command("RSET")
+        except (smtplib.SMTPException, OSError):
+            self._discard()
+
+    async def _expect(self, line, expected_code):
+        code, message = await self._command(line)
+        if code != expected_code:
+            raise smtplib.SMTPResponseException(code, message)
+
+    async def _command(self, line):
+        # Sends one command line and returns the server's reply
+        if self._writer is None:
+            raise smtplib.SMTPServerDisconnected("Not connected.")
+        self._writer.write(line.encode() + b"\r\n")
+        await self._writer.drain()
+        return await self._read_reply()
+
+    async def _read_reply(self):
+        """
+        Reads one (possibly multi-line) reply, e.g. "250-first line" ... "250 last line".
+        Returns:
+            tuple: (code, message as bytes with the lines joined by newlines)
+        Raises:
+            smtplib.SMTPServerDisconnected: If the server closed the connection.
+            TimeoutError: If the server doesn't answer within the timeout.
+        """
+        lines = []
+        while True:
+            try:
+                line = await asyncio.wait_for(self._reader.readline(), self.timeout)
+            except asyncio.TimeoutError:
+                # Before Python 3.11 this isn't the builtin TimeoutError (an OSError), which
+                # is_transient_error and the app's error messages expect
+                raise TimeoutError("The SMTP server didn't answer in time.") from None
+            if not line:
+                self._discard()
+                raise smtplib.SMTPServerDisconnected("Connection unexpectedly closed.")
+            try:
+                code = int(line[:3])
+            except ValueError:
+                self._discard()
+                raise smtplib.SMTPServerDisconnected(f"Bad reply from the server: {line!r}") from None
+            lines.append(line[4:].strip())
+            if line[3:4] != b"-": # No dash: last line of the reply
+                return code, b"\n".join(lines)
+
+    def _discard(self):
+        # Drops the session without talking to the server.
+        self._cancel_idle_timer()
+        if self._writer is not None:
+            self._writer.close()
+        self._reader = self._writer = None
+
+    def _touch(self):
+        # Remembers when the session was last used and (re)starts the idle timer.
+        self._last_used = time.monotonic()
+        self._cancel_idle_timer()
+        loop = asyncio.get_running_loop()
+        self._idle_handle = loop.call_later(self.idle_timeout, self._start_idle_close, loop)
+
+    def _start_idle_close(self, loop):
+        # Called by the idle timer. Keeps the task until it's done, so it can't be garbage
+        # collected halfway, and its errors are logged instead of lost.
+        closing = loop.create_task(self._close_if_idle())
+        self._idle_closes.add(closing)
+        closing.add_done_callback(self._idle_close_done)
+
+    def _idle_close_done(self, closing):
+        self._idle_closes.discard(closing)
+        if not closing.cancelled() and closing.exception() is not None:
+            log.warning("closing the idle SMTP session failed error=%r", closing.exception())
+
+    async def _close_if_idle(self):
+        self._idle_handle = None
+        # (A send that is running right now restarts the timer when it's done)
+        if self._writer is not None and not self._get_lock().locked() \
+                and time.monotonic() - self._last_used >= self.idle_timeout:
+            await self.close()
+
+    def _cancel_idle_timer(self):
+        if self._idle_handle is not None:
+            self._idle_handle.cancel()
+            self._idle_handle = None
@@ -0,0 +1,219 @@
+# async_reminders.py
+# The asyncio reminder engine, an alternative to the reminder thread + sender threads
+# (TaskService.run_reminders + ReminderDispatcher). One event loop, running in the reminder
+# thread, finds the due tasks and sends every reminder as a coroutine over a few shared
+# SMTP sessions (async_mail_transport.AsyncSMTPTransport), so thousands of reminders can
+# be on their way at once without a thread (and a connection) for each.
+# Chosen with REMINDER_ENGINE=asyncio (see app.py).
+
+import asyncio # The event loop
+import logging # Level-controlled messages instead of prints
+import time    # For the send times
+from datetime import datetime # For the due check
+import profiling # Timing spans (only when profiling is switched on)
+# Same retry rules and metrics as the threaded senders
+from reminder_dispatcher import is_transient_error, REMINDERS_TOTAL, SEND_ERRORS_TOTAL, SEND_SECONDS
+
+log = logging.getLogger(__name__)
+
+class AsyncReminderEngine:
+    """
+    Reminder loop plus delivery, all in one asyncio event loop:
+    - the loop waits for the reminder scheduler (ReminderScheduler.wait runs in a helper thread,
+      so a task change or stop_reminders() wakes it up at once),
+    - every due task becomes a delivery coroutine; deliveries share a pool of SMTP sessions,
+    - at most per_domain_limit emails go to the same recipient domain at the same time,
+    - temporary SMTP errors are retried with exponential backoff,
+    - the sent-reminder ledger is written in a helper thread, so SQLite never blocks the loop.
+    It has the same submit()/stats() as ReminderDispatcher, so the app queues reminders the same way.
+    """
+    def __init__(self, task_service, send, transport_factory, on_sent=None, on_failed=None, connections=2,
+                 queue_size=1000, per_domain_limit=2, max_retries=3, backoff_seconds=2.0, block_when_full=True):
+        """
+        Args:
+            task_service (TaskService): Holds the reminder schedule and the sent-reminder ledger.
+            send: Coroutine function send(task, transport) that sends the reminder for a task, raises on failure.
+            transport_factory: Function that creates a new AsyncSMTPTransport.
+            on_sent: Optional function on_sent(task), called (in a helper thread) after a successful send.
+            on_failed: Optional function on_failed(task, error), called when a task is given up on.
+            connections (int): Number of SMTP sessions shared by all deliveries.
+            queue_size (int): How many reminders may be on their way before the loop stops looking
+                              for more due tasks. It is checked between scans: with block_when_full,
+                              every due task of one scan is accepted, so a burst can go past it
+                              (sending is still limited by connections and per_domain_limit).
+            per_domain_limit (int): Max. emails sent to one recipient domain at the same time.
+            max_retries (int): How often a temporary failure is retried.
+            backoff_seconds (float): Wait before the first retry, doubled for every further retry.
+            block_when_full (bool): True = the next scan waits until there is room,
+                                    False = reminders beyond queue_size are dropped (a hard limit).
+        """
+        self.task_service = task_service
+        self.send = send
+        self.transport_factory = transport_factory
+        self.on_sent = on_sent
+        self.on_failed = on_failed
+        self.connection_count = connections
+        self.queue_size = queue_size
+        self.per_domain_limit = per_domain_limit
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+        self.block_when_full = block_when_full
+
+        self._deliveries = set()  # Running delivery coroutines (asyncio.Task)
+        self._transports = []     # Every SMTP session, to close them at the end
+        self._pool = None         # asyncio.Queue of the idle SMTP sessions
+        self._domain_limits = {}  # domain -> asyncio.Semaphore
+        self._room = None         # asyncio.Event, set while fewer than queue_size deliveries are running
+        # Counters (read them with stats()). Only changed in the event loop.
+        self._stats = {"submitted": 0, "sent": 0, "failed": 0, "retried": 0, "dropped": 0}
+
+    def run(self, stop_event, on_due):
+        """
+        Runs the event loop until stop_event is set (call task_service.stop_reminders() after
+        setting it). Meant to be the target of the reminder thread, like TaskService.run_reminders.
+        Args:
+            stop_event (threading.Event): Set when the app is closing.
+            on_due: Function on_due(tasks, now), called in the event loop, that submit()s the reminders.
+        """
+        asyncio.run(self._main(stop_event, on_due))
+
+    def submit(self, task):
+        """
+        Starts the delivery of a reminder. Called from on_due, in the event loop.
+        With block_when_full it never refuses a reminder, even past queue_size: it only holds
+        back the next scan (see queue_size in __init__).
+        Args:
+            task (Task): The task to send a reminder for.
+        Returns:
+            bool: True if the reminder is on its way, False if it was dropped (too many running).
+        """
+        if len(self._deliveries) >= self.queue_size and not self.block_when_full:
+            self._count("dropped")
+            return False
+        # With block_when_full the reminder is still accepted (a waiting coroutine is cheap);
+        # the loop finds no new due tasks until there is room again.
+        self._count("submitted")
+        delivery = asyncio.get_running_loop().create_task(self._deliver(task))
+        self._deliveries.add(delivery)
+        delivery.add_done_callback(self._delivery_done)
+        if len(self._deliveries) >= self.queue_size:
+            self._room.clear()
+        return True
+
+    def stats(self):
+        """
+        Returns:
+            dict: Copy of the counters (submitted, sent, failed, retried, dropped) plus the number
+                  of reminders still on their way ("queued").
+        """
+        stats = dict(self._stats)
+        stats["queued"] = len(self._deliveries)
+        return stats
+
+    async def _main(self, stop_event, on_due):
+        # The same loop as TaskService.run_reminders, with awaits instead of blocking waits
+        log.info("reminder event loop started")
+        scheduler = self.task_service.reminder_scheduler
+        self._pool = asyncio.Queue()
+        for _ in range(self.connection_count):
+            transport = self.transport_factory() # Connects on its first send
+            self._transports.append(transport)
+            self._pool.put_nowait(transport)
+        self._room = asyncio.Event()
+        self._room.set()
+        try:
+            try:
+                count = await asyncio.to_thread(self.task_service.load_reminders)
+                log.info("reminders scheduled count=%d", count)
+            except Exception:
+                log.exception("loading reminders failed")
+
+            while not stop_event.is_set():
+                if not self._room.is_set():
+                    # Too many reminders on their way: let some finish first (but notice a stop)
+                    try:
+                        await asyncio.wait_for(self._room.wait(), 0.5)
+                    except asyncio.TimeoutError: # (Not the builtin TimeoutError before Python 3.11)
+                        pass
+                    continue
+                try:
+                    with profiling.span("reminder.tick"):
+                        now = datetime.now()
+                        due_tasks = scheduler.pop_due(now)
+                        if due_tasks:
+                            on_due(due_tasks, now)
+                except Exception:
+                    log.exception("error in reminder event loop")
+                # Sleep until the next reminder is due (or the tasks change, or the app is closing).
+                # The scheduler's wait is a blocking one, so it gets a helper thread.
+                await asyncio.to_thread(scheduler.wait, stop_event)
+        finally:
+            await self._shutdown()
+        log.info("reminder event loop stopped")
+
+    async def _shutdown(self, timeout=1):
+        # Reminders still on their way are not sent (like the threaded senders' queue)
+        for delivery in list(self._deliveries):
+            delivery.cancel()
+        await asyncio.gather(*self._deliveries, return_exceptions=True)
+        try:
+            await asyncio.wait_for(asyncio.gather(*(t.close() for t in self._transports), return_exceptions=True),
+                                   timeout)
+        except asyncio.TimeoutError:
+            pass # The server is slow to say goodbye; the connections are dropped with the loop
+        self._transports = []
+
+    def _delivery_done(self, delivery):
+        self._deliveries.discard(delivery)
+        if len(self._deliveries) < self.queue_size:
+            self._room.set()
+
+    async def _deliver(self, task):
+        # Sends one reminder, respecting the domain limit and retrying temporary errors.
+        # The domain slot is only held while sending, not while waiting to retry (see
+        # ReminderDispatcher._deliver).
+        domain_limit = self._domain_limit(task.email)
+        attempt = 0
+        while True:
+            async with domain_limit:
+                transport = await self._pool.get() # Wait for a free SMTP session
+                started = time.perf_counter()
+                try:
+                    await self.send(task, transport)
+                except Exception as e:
+                    error = e
+                else:
+                    error = None
+                finally:
+                    self._pool.put_nowait(transport)
+                SEND_SECONDS.observe(time.perf_counter() - started)
+            if error is None:
+                break
+            SEND_ERRORS_TOTAL.inc(label_value=type(error).__name__)
+            if attempt < self.max_retries and is_transient_error(error):
+                self._count("retried")
+                log.debug("reminder send failed, retrying task_id=%s attempt=%d error=%r", task.id, attempt + 1, error)
+                # 1x, 2x, 4x... the base delay (cancelled right away if the app is closing)
+                await asyncio.sleep(self.backoff_seconds * (2 ** attempt))
+                attempt += 1
+                continue
+            self._count("failed")
+            if self.on_failed:
+                self.on_failed(task, error)
+            return
+        self._count("sent")
+        if self.on_sent:
+            await asyncio.to_thread(self.on_sent, task) # Writes the sent-reminder ledger
+
+    def _count(self, name):
+        self._stats[name] += 1
+        REMINDERS_TOTAL.inc(label_value=name)
+
+    def _domain_limit(self, email):
+        # Returns the semaphore that limits parallel sends to this email's domain
+        domain = email.rsplit("@", 1)[-1].lower() if email else ""
+        limit = self._domain_limits.get(domain)
+        if limit is None:
+            limit = asyncio.Semaphore(self.per_domain_limit)
+            self._domain_limits[domain] = limit
+        return limit
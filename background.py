@@ -0,0 +1,147 @@
+# background.py
+# Runs slow work (database queries) on a worker thread and hands the results back to the
+# Tk thread, so the window keeps responding while the disk is busy.
+# Tk widgets may only be touched from the thread running mainloop, so results are not
+# delivered by the worker: the Tk thread picks them up itself with after() polling.
+
+import itertools # Numbers for the requests
+import queue     # Thread-safe queues between the Tk thread and the worker
+import threading # The worker thread
+import traceback # To print errors nobody handles
+
+class BackgroundExecutor:
+    """
+    One worker thread plus a result queue that is polled from the Tk event loop.
+    - submit() queues a function; its result is passed to on_done on the Tk thread.
+    - Requests can have a key (e.g. "search"). A new request with the same key makes the
+      older one stale: if it hasn't started yet it is skipped, otherwise its result is dropped.
+    - on_busy(True/False) is called when the first request starts waiting and when the last
+      one is done, e.g. to show a loading indicator.
+    Polling only runs while requests are pending, so an idle app doesn't wake up for nothing.
+    """
+    def __init__(self, widget, on_busy=None, poll_ms=15):
+        """
+        Args:
+            widget: Any Tk widget (used for after()); the results are delivered in its thread.
+            on_busy: Optional function on_busy(busy) called on the Tk thread.
+            poll_ms (int): How often finished results are picked up while something is pending.
+        """
+        self.widget = widget
+        self.on_busy = on_busy
+        self.poll_ms = poll_ms
+        self._jobs = queue.Queue()    # (request_id, key, func, args) for the worker
+        self._results = queue.Queue() # (request_id, key, result, error) for the Tk thread
+        self._callbacks = {}          # request_id -> (on_done, on_error), only used on the Tk thread
+        self._latest = {}             # key -> request_id of the newest request with that key
+        self._ids = itertools.count(1)
+        self._poll_id = None          # Pending after() call, if polling
+        self._closed = False
+        self._worker = threading.Thread(target=self._worker_loop, name="ui-background", daemon=True)
+        self._worker.start()
+
+    def submit(self, func, *args, on_done=None, on_error=None, key=None):
+        """
+        Runs func(*args) on the worker thread. Call this from the Tk thread.
+        Args:
+            func: The function to run (it must not touch any widgets).
+            *args: Its arguments.
+            on_done: Optional function on_done(result), called on the Tk thread.
+            on_error: Optional function on_error(exception), called on the Tk thread if func raised.
+                      Without it the error is printed.
+            key (str, optional): Requests with the same key replace each other (only the newest
+                                 one's result is delivered).
+        Returns:
+            int: The request's number.
+        """
+        request_id = next(self._ids)
+        if key is not None:
+            self._latest[key] = request_id # Older requests with this key are stale now
+        if not self._callbacks and self.on_busy:
+            self.on_busy(True)
+        self._callbacks[request_id] = (on_done, on_error)
+        self._jobs.put((request_id, key, func, args))
+        if self._poll_id is None:
+            self._poll_id = self.widget.after(self.poll_ms, self._poll)
+        return request_id
+
+    def cancel(self, key):
+        """
+        Makes the pending request with this key stale (its result won't be delivered).
+        Args:
+            key (str): The request key.
+        """
+        self._latest.pop(key, None)
+
+    def is_pending(self, key):
+        """
+        Returns:
+            bool: True if a request with this key was submitted and its result isn't delivered yet.
+        """
+        return key in self._latest
+
+    def shutdown(self, timeout=1):
+        """
+        Stops the worker (after the function it's running, if any) and stops polling.
+        Results that arrive afterwards are dropped.
+        Args:
+            timeout (float): How long to wait for the worker to finish.
+        """
+        self._closed = True
+        if self._poll_id is not None:
+            self.widget.after_cancel(self._poll_id)
+            self._poll_id = None
+        self._jobs.put(None) # Tells the worker to stop
+        self._worker.join(timeout)
+
+    def _is_stale(self, request_id, key):
+        return key is not None and self._latest.get(key) != request_id
+
+    def _worker_loop(self):
+        # Runs in the worker thread: one job at a time, in the order they were submitted
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                return
+            request_id, key, func, args = job
+            if self._is_stale(request_id, key):
+                # Replaced or cancelled before it started, don't waste the time
+                self._results.put((request_id, key, None, None))
+                continue
+            try:
+                self._results.put((request_id, key, func(*args), None))
+            except Exception as e:
+                self._results.put((request_id, key, None, e))
+
+    def _poll(self):
+        # Runs on the Tk thread: delivers the finished results
+        self._poll_id = None
+        if self._closed:
+            return
+        while True:
+            try:
+                request_id, key, result, error = self._results.get_nowait()
+            except queue.Empty:
+                break
+            on_done, on_error = self._callbacks.pop(request_id)
+            if self._is_stale(request_id, key):
+                continue # A newer request with the same key is on its way (or it was cancelled)
+            if key is not None:
+                del self._latest[key]
+            try:
+                if error is None:
+                    if on_done:
+                        on_done(result)
+                elif on_error:
+                    on_error(error)
+                else:
+                    print(f"Background task failed: {error}")
+                    # (The one-argument form needs Python 3.10)
+                    traceback.print_exception(type(error), error, error.__traceback__)
+            except Exception:
+                # A broken callback mustn't stop the other results from being delivered
+                traceback.print_exc()
+        if self._callbacks:
+            if self._poll_id is None: # (A callback may have submitted a request and started polling)
+                self._poll_id = self.widget.after(self.poll_ms, self._poll)
+        elif self.on_busy:
+            self.on_busy(False)
@@ -0,0 +1,78 @@
+# benchmarks/bench_bulk.py
+# Loads, edits, finishes and deletes lots of tasks, once with the single-task methods
+# (one transaction per row) and once with the bulk methods (one transaction per batch).
+# The single-task side only does a sample of the rows; its time is scaled up to the full count.
+#
+# Run from the project folder:  python benchmarks/bench_bulk.py [number_of_tasks] [single_task_sample]
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from database_manager import DatabaseManager # noqa: E402 (needs the path set up above)
+from task import Task # noqa: E402
+
+
+def make_tasks(count, prefix="Task"):
+    """
+    Creates count new tasks (no IDs yet), all with a due date/time and an email.
+    """
+    return [
+        Task(f"{prefix} {n}", None, f"2030-{n % 12 + 1:02d}-{n % 28 + 1:02d}", f"{n % 24:02d}:{n % 60:02d}", "a@example.com")
+        for n in range(count)
+    ]
+
+
+def timed(func):
+    started = time.perf_counter()
+    func()
+    return time.perf_counter() - started
+
+
+def run_single(db_manager, count):
+    tasks = make_tasks(count, "Single")
+    results = {}
+    results["insert"] = timed(lambda: [db_manager.insert_task(task) for task in tasks])
+    results["update"] = timed(lambda: [
+        db_manager.update_task(task.id, task.desc, "edited", task.due_date, "23:59", task.email) for task in tasks
+    ])
+    results["mark done"] = timed(lambda: [db_manager.update_status(task.id) for task in tasks])
+    results["delete"] = timed(lambda: [db_manager.delete_task(task.id) for task in tasks])
+    return results
+
+
+def run_bulk(db_manager, count):
+    tasks = make_tasks(count, "Bulk")
+    results = {}
+    results["insert"] = timed(lambda: db_manager.insert_tasks(tasks))
+    for task in tasks:
+        task.update_details(task.desc, "edited", task.due_date, "23:59", task.email)
+    results["update"] = timed(lambda: db_manager.update_tasks(tasks))
+    ids = [task.id for task in tasks]
+    results["mark done"] = timed(lambda: db_manager.mark_done(ids))
+    results["delete"] = timed(lambda: db_manager.delete_tasks(ids))
+    return results
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    sample = int(sys.argv[2]) if len(sys.argv) > 2 else 5_000
+    with tempfile.TemporaryDirectory() as folder:
+        db_manager = DatabaseManager(os.path.join(folder, "bench.db"))
+        single = run_single(db_manager, sample)
+        bulk = run_bulk(db_manager, count)
+
+        # A batch with duplicates: every conflict is reported, the rest is still saved
+        batch = make_tasks(10, "Dup") + make_tasks(5, "Dup")
+        conflicts = db_manager.insert_tasks(batch)
+        db_manager.close()
+
+    print(f"{count} tasks (single-task methods timed on {sample} and scaled up):")
+    print(f"  {'':10} {'single':>10} {'bulk':>10} {'speed-up':>9}")
+    for step in bulk:
+        single_total = single[step] * count / sample
+        print(f"  {step:10} {single_total:9.2f}s {bulk[step]:9.2f}s {single_total / bulk[step]:8.0f}x")
+    print(f"Duplicate check: {len(conflicts)} of {len(batch)} tasks reported as conflicts (expected 5)")
+    sys.exit(0 if len(conflicts) == 5 else 1)
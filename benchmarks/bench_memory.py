@@ -0,0 +1,70 @@
+# benchmarks/bench_memory.py
+# Memory benchmark: how much memory does loading many tasks from the database take?
+# Uses tracemalloc to measure the peak while DatabaseManager.get_all_tasks() runs,
+# once with the slotted Task class and once with a plain __dict__ based copy of it.
+#
+# Run from the project folder:  python benchmarks/bench_memory.py [number_of_tasks]
+
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import database_manager # noqa: E402 (needs the path set up above)
+from database_manager import DatabaseManager # noqa: E402
+from task import Task # noqa: E402
+
+
+class DictTask(Task):
+    """
+    Same as Task, but (like before __slots__) every object gets its own __dict__.
+    A subclass without __slots__ adds the __dict__ back.
+    """
+
+
+def fill_database(db_manager, count):
+    """
+    Inserts count tasks in one transaction (about 80% with due date and time).
+    """
+    with db_manager.connection:
+        db_manager.connection.executemany(
+            "INSERT INTO tasks (description, note, date, time, email) VALUES (?, ?, ?, ?, ?)",
+            (
+                (f"Task {n}", "Some note" if n % 3 == 0 else None,
+                 f"2030-{n % 12 + 1:02d}-{n % 28 + 1:02d}" if n % 5 else None,
+                 f"{n % 24:02d}:{n % 60:02d}" if n % 5 else None,
+                 "someone@example.com" if n % 2 else None)
+                for n in range(count)
+            ),
+        )
+
+
+def measure(db_manager, task_class):
+    """
+    Loads all tasks with the given class and returns (peak bytes, seconds, number of tasks).
+    """
+    database_manager.Task = task_class # get_all_tasks() creates the objects through this name
+    try:
+        tracemalloc.start()
+        started = time.perf_counter()
+        tasks = db_manager.get_all_tasks()
+        seconds = time.perf_counter() - started
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return peak, seconds, len(tasks)
+    finally:
+        database_manager.Task = Task
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    with tempfile.TemporaryDirectory() as folder:
+        db_manager = DatabaseManager(os.path.join(folder, "bench.db"))
+        fill_database(db_manager, count)
+        print(f"Loading {count} tasks with get_all_tasks()")
+        for label, task_class in (("__dict__ (before)", DictTask), ("__slots__ (after)", Task)):
+            peak, seconds, loaded = measure(db_manager, task_class)
+            print(f"  {label:18} peak {peak / 1024 / 1024:7.1f} MiB, {peak / loaded:6.0f} bytes/task, {seconds:.3f} s")
+        db_manager.close()
@@ -0,0 +1,65 @@
+# benchmarks/bench_search.py
+# Times DatabaseManager.search() on a big database, with the full-text index and with the
+# LIKE fallback (used when SQLite has no FTS5). The database is built once and kept in
+# a temporary folder only for this run.
+#
+# Run from the project folder:  python benchmarks/bench_search.py [number_of_tasks]
+
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from database_manager import DatabaseManager # noqa: E402 (needs the path set up above)
+from task import Task # noqa: E402
+
+WORDS = (
+    "buy milk call mum meeting report invoice dentist gym review budget plan email "
+    "project deadline groceries laundry taxes renew passport book flight birthday gift "
+    "clean kitchen fix bike write blog update resume pay rent water plants walk dog"
+).split()
+
+QUERIES = ["milk", "me", "meeting report", "pass", "fix bike", "deadline tax", "zzz-not-there"]
+
+
+def make_tasks(count, seed=7):
+    """
+    Creates count tasks with a few random words each (and a note on every other one).
+    """
+    rng = random.Random(seed)
+    for n in range(count):
+        desc = " ".join(rng.sample(WORDS, 3)) + f" #{n}" # The number keeps descriptions unique
+        note = " ".join(rng.sample(WORDS, 6)) if n % 2 else None
+        yield Task(desc, note)
+
+
+def time_queries(db_manager, runs=5):
+    results = {}
+    for query in QUERIES:
+        best = float("inf")
+        for _ in range(runs):
+            started = time.perf_counter()
+            found = db_manager.search(query, limit=50)
+            best = min(best, time.perf_counter() - started)
+        results[query] = (best, len(found))
+    return results
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    with tempfile.TemporaryDirectory() as folder:
+        db_manager = DatabaseManager(os.path.join(folder, "search.db"))
+        started = time.perf_counter()
+        db_manager.insert_tasks(make_tasks(count))
+        print(f"Inserted {count} tasks (index kept up to date by triggers) in {time.perf_counter() - started:.1f}s")
+
+        fts = time_queries(db_manager)
+        db_manager.has_search_index = False # Same database, LIKE fallback
+        like = time_queries(db_manager, runs=1)
+        db_manager.close()
+
+    print(f"  {'query':16} {'FTS5':>10} {'LIKE':>10}  results")
+    for query in QUERIES:
+        print(f"  {query!r:16} {fts[query][0] * 1000:8.1f}ms {like[query][0] * 1000:8.1f}ms  {fts[query][1]}")
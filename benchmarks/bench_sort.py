@@ -0,0 +1,80 @@
+# benchmarks/bench_sort.py
+# Micro-benchmark for sorting the task list (the sort key reads Task.due_datetime).
+# Compares the old way (two strptime calls on every access) with the cached, ISO-parsed property.
+#
+# Run from the project folder:  python benchmarks/bench_sort.py [number_of_tasks]
+
+import datetime
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from task import Task # noqa: E402 (needs the path set up above)
+from task_model import task_sort_key # noqa: E402
+
+
+def legacy_due_datetime(task):
+    """
+    The property as it was before caching: parses both strings with strptime on every call.
+    """
+    if task.due_date and task.due_time:
+        try:
+            date_part = datetime.datetime.strptime(task.due_date, '%Y-%m-%d').date()
+            time_part = datetime.datetime.strptime(task.due_time, '%H:%M').time()
+            return datetime.datetime.combine(date_part, time_part)
+        except (ValueError, TypeError):
+            return None
+    return None
+
+
+def legacy_sort_key(task):
+    dt = legacy_due_datetime(task)
+    return (0, dt, task.id) if dt else (1, task.id)
+
+
+def make_tasks(count, seed=42):
+    """
+    Creates count tasks, about 80% of them with a due date and time.
+    """
+    rng = random.Random(seed)
+    start = datetime.date.today()
+    tasks = []
+    for task_id in range(1, count + 1):
+        if rng.random() < 0.8:
+            due = start + datetime.timedelta(days=rng.randrange(365))
+            tasks.append(Task(f"Task {task_id}", None, due.isoformat(), f"{rng.randrange(24):02d}:{rng.randrange(60):02d}", None, task_id))
+        else:
+            tasks.append(Task(f"Task {task_id}", None, None, None, None, task_id))
+    return tasks
+
+
+def best_of(runs, func, setup=None):
+    """
+    Runs func() several times and returns the fastest time in seconds.
+    If setup is given, func(setup()) is timed and setup() itself isn't.
+    """
+    best = float("inf")
+    for _ in range(runs):
+        argument = setup() if setup else None
+        started = time.perf_counter()
+        func(argument) if setup else func()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    print(f"Sorting {count} tasks (best of 3)")
+
+    before = best_of(3, lambda tasks: sorted(tasks, key=legacy_sort_key), lambda: make_tasks(count))
+    # Fresh tasks every run, so the first (uncached) parse is part of the measurement
+    after_cold = best_of(3, lambda tasks: sorted(tasks, key=task_sort_key), lambda: make_tasks(count))
+    tasks = make_tasks(count)
+    sorted(tasks, key=task_sort_key) # Fill the caches
+    after_warm = best_of(3, lambda: sorted(tasks, key=task_sort_key))
+
+    print(f"  before (strptime on every access): {before:.3f} s")
+    print(f"  after, first sort (parse + cache): {after_cold:.3f} s")
+    print(f"  after, re-sort (cached):           {after_warm:.3f} s")
@@ -0,0 +1,100 @@
+# benchmarks/bench_startup.py
+# Measures how quickly the app starts, in two parts:
+# 1. Imports: runs 'python -X importtime -c "import app"' and lists the slowest imports
+#    (and checks that the email modules and tkcalendar are no longer loaded up front).
+# 2. First paint: starts app.py with TASK_MANAGER_STARTUP_BENCHMARK=1, which makes the app
+#    print when its window was drawn and when the task list was filled, and close again.
+#    This part needs a display (on a headless Linux box e.g. run it under xvfb-run).
+#
+# Run from the project folder:  python benchmarks/bench_startup.py [runs]
+
+import os
+import re
+import subprocess
+import sys
+import time
+
+PROJECT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules that should only be loaded after the window is shown (or when the Add/Edit screen opens)
+DEFERRED_MODULES = ("smtplib", "email.message", "tkcalendar", "frames.add_edit", "frames.info")
+
+# One line of -X importtime output: "import time:  self_us | cumulative_us | indented name"
+IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def run_importtime():
+    """
+    Imports app in a fresh interpreter with -X importtime.
+    Returns:
+        tuple: (list of (cumulative_us, self_us, depth, module), error text or None)
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app"],
+        cwd=PROJECT, capture_output=True, text=True,
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            rows.append((int(cumulative_us), int(self_us), len(indent) // 2, module))
+    error = result.stderr.strip().splitlines()[-1] if result.returncode else None
+    return rows, error
+
+
+def run_first_paint():
+    """
+    Starts the app once in startup benchmark mode.
+    Returns:
+        tuple or str: (first paint, filled list, whole run) in ms, or the error text.
+    """
+    env = dict(os.environ, TASK_MANAGER_STARTUP_BENCHMARK="1")
+    started = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "app.py"], cwd=PROJECT, env=env, capture_output=True, text=True, timeout=60,
+        stdin=subprocess.DEVNULL, # app.py waits for Enter after an error; don't let it hang
+    )
+    launched_ms = (time.perf_counter() - started) * 1000
+    match = re.search(r"STARTUP first_paint_ms=([\d.]+) list_filled_ms=([\d.]+)", result.stdout)
+    if not match:
+        # The first exception message (e.g. "_tkinter.TclError: no display name...")
+        errors = re.findall(r"^[\w.]+(?:Error|Exception): .*$", result.stderr + result.stdout, re.MULTILINE)
+        return errors[0] if errors else f"app exited with code {result.returncode}"
+    # The app measures from when app.py started loading; the interpreter's own startup
+    # comes on top, so report both
+    return float(match.group(1)), float(match.group(2)), launched_ms
+
+
+if __name__ == "__main__":
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+
+    print("Imports ('import app', best of runs):")
+    best_rows, error = None, None
+    for _ in range(runs):
+        rows, error = run_importtime()
+        if error:
+            break
+        total = max(rows)[0] if rows else 0
+        if best_rows is None or total < max(best_rows)[0]:
+            best_rows = rows
+    if error:
+        print(f"  could not import app: {error}")
+    else:
+        print(f"  total {max(best_rows)[0] / 1000:.1f} ms")
+        for cumulative_us, self_us, depth, module in sorted(best_rows, reverse=True)[1:11]:
+            print(f"  {cumulative_us / 1000:7.1f} ms  {module}")
+        loaded = {module for _, _, _, module in best_rows}
+        for module in DEFERRED_MODULES:
+            print(f"  {module:16} {'LOADED AT STARTUP' if module in loaded else 'deferred'}")
+
+    print("First paint (app.py, best of runs):")
+    results = [run_first_paint() for _ in range(runs)]
+    timings = [result for result in results if isinstance(result, tuple)]
+    if not timings:
+        print(f"  could not start the app: {results[0]}")
+    else:
+        first_paint, list_filled, launched = min(timings)
+        print(f"  window drawn    {first_paint:7.1f} ms after app.py started loading")
+        print(f"  list filled     {list_filled:7.1f} ms")
+        print(f"  whole run       {launched:7.1f} ms (interpreter start to exit)")
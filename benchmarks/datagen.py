@@ -0,0 +1,118 @@
+# benchmarks/datagen.py
+# Synthetic task data for the benchmarks: reproducible (seeded) task lists with a controlled
+# mix of dated, timed, emailed and done tasks, and ready-made databases filled with them.
+
+import os
+import random
+import sys
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from database_manager import DatabaseManager # noqa: E402 (needs the path set up above)
+from task import Task # noqa: E402
+
+WORDS = (
+    "buy milk call mum meeting report invoice dentist gym review budget plan email "
+    "project deadline groceries laundry taxes renew passport book flight birthday gift "
+    "clean kitchen fix bike write blog update resume pay rent water plants walk dog"
+).split()
+
+DOMAINS = ["example.com", "example.org", "example.net", "mail.test"]
+
+
+class TaskMix:
+    """
+    What share of the generated tasks has which fields. Every share is a fraction (0 to 1):
+    - dated: tasks with a due date,
+    - timed: dated tasks that also have a due time,
+    - emailed: timed tasks that also have a reminder email,
+    - done: tasks marked as done,
+    - noted: tasks with a note.
+    """
+    def __init__(self, dated=0.7, timed=0.7, emailed=0.6, done=0.2, noted=0.5):
+        self.dated = dated
+        self.timed = timed
+        self.emailed = emailed
+        self.done = done
+        self.noted = noted
+
+    def as_dict(self):
+        return {"dated": self.dated, "timed": self.timed, "emailed": self.emailed, "done": self.done,
+                "noted": self.noted}
+
+    def key(self):
+        # Short text that identifies the mix (used in cached database file names)
+        return "-".join(f"{value:g}" for value in self.as_dict().values())
+
+
+DEFAULT_MIX = TaskMix()
+
+
+def generate_tasks(count, mix=DEFAULT_MIX, seed=1, start=None, days=365, prefix="Task"):
+    """
+    Yields count new tasks (without IDs). The same arguments always give the same tasks,
+    except that the due dates are spread over the days after start (default: tomorrow),
+    so the dated tasks are always upcoming and the reminder scan has work to do.
+    Args:
+        count (int): How many tasks.
+        mix (TaskMix): Which fields the tasks have.
+        seed (int): Random seed.
+        start (date, optional): First possible due date.
+        days (int): The due dates are spread over this many days.
+        prefix (str): Start of the descriptions (they end with a running number, so they're unique).
+    """
+    rng = random.Random(seed)
+    start = start or date.today() + timedelta(days=1)
+    for n in range(count):
+        desc = f"{prefix} {n} " + " ".join(rng.sample(WORDS, 3))
+        note = " ".join(rng.sample(WORDS, 6)) if rng.random() < mix.noted else None
+        due_date = due_time = email = None
+        if rng.random() < mix.dated:
+            due_date = (start + timedelta(days=rng.randrange(days))).isoformat()
+            if rng.random() < mix.timed:
+                due_time = f"{rng.randrange(24):02d}:{rng.randrange(60):02d}"
+                if rng.random() < mix.emailed:
+                    email = f"user{n}@{rng.choice(DOMAINS)}"
+        status = 1 if rng.random() < mix.done else 0
+        yield Task(desc, note, due_date, due_time, email, status=status)
+
+
+def build_database(path, count, mix=DEFAULT_MIX, seed=1, chunk_size=10_000):
+    """
+    Creates a database file with count generated tasks (in chunks, like the import tool).
+    An existing file at path is replaced.
+    Args:
+        path (str): Where to create the database.
+        count (int): How many tasks.
+        mix (TaskMix): Which fields the tasks have.
+        seed (int): Random seed.
+        chunk_size (int): Tasks saved per transaction.
+    Returns:
+        DatabaseManager: The open database.
+    """
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+    db_manager = DatabaseManager(path)
+    chunk = []
+    for task in generate_tasks(count, mix, seed):
+        chunk.append(task)
+        if len(chunk) >= chunk_size:
+            db_manager.insert_tasks(chunk)
+            chunk = []
+    if chunk:
+        db_manager.insert_tasks(chunk)
+    return db_manager
+
+
+def open_database(folder, count, mix=DEFAULT_MIX, seed=1):
+    """
+    Opens the generated database for these arguments from folder, building it first if it
+    isn't there yet (building 1M tasks takes a while, so a kept folder saves time on re-runs).
+    Returns:
+        DatabaseManager: The open database.
+    """
+    path = os.path.join(folder, f"tasks-{count}-{mix.key()}-{seed}-{date.today().isoformat()}.db")
+    if os.path.exists(path):
+        return DatabaseManager(path)
+    return build_database(path, count, mix, seed)
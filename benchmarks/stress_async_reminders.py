@@ -0,0 +1,199 @@
+# benchmarks/stress_async_reminders.py
+# Sends thousands of due reminders through both reminder engines, against a local asyncio
+# SMTP stand-in (no real mail goes out):
+# - "threads": TaskService.run_reminders + ReminderDispatcher (sender threads, smtplib),
+# - "asyncio": AsyncReminderEngine (one event loop, a few AsyncSMTPTransport sessions).
+# The stand-in answers slowly (like a real server over the network) and turns away a few
+# messages with a temporary 451 error, so retries are exercised too. For each engine it shows
+# the time, the peak number of SMTP connections and threads, and checks that every reminder
+# reached the server and the sent-reminder ledger exactly once.
+#
+# Run from the project folder:  python benchmarks/stress_async_reminders.py [reminders] [reply_delay_ms]
+
+import asyncio
+import os
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+from email.message import EmailMessage
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from database_manager import DatabaseManager # noqa: E402 (needs the path set up above)
+from task import Task # noqa: E402
+from task_service import TaskService # noqa: E402
+from reminder_dispatcher import ReminderDispatcher # noqa: E402
+from mail_transport import SMTPTransport # noqa: E402
+from async_reminders import AsyncReminderEngine # noqa: E402
+from async_mail_transport import AsyncSMTPTransport # noqa: E402
+
+DOMAINS = ["example.com", "example.org", "example.net", "mail.test", "inbox.test"]
+
+
+class LocalSMTPServer:
+    """
+    A tiny SMTP server on 127.0.0.1 that accepts everything (no TLS, no login) and counts
+    the messages per recipient. Every fail_every-th message gets a temporary "451" reply.
+    Runs its own event loop in a background thread.
+    """
+    def __init__(self, reply_delay=0.005, fail_every=50):
+        self.reply_delay = reply_delay
+        self.fail_every = fail_every
+        self.received = {}      # recipient -> number of messages
+        self.connections = 0
+        self.peak_connections = 0
+        self._data_count = 0
+        self._loop = asyncio.new_event_loop()
+        self._ready = threading.Event()
+        self.port = None
+        threading.Thread(target=self._run, name="smtp-stand-in", daemon=True).start()
+        self._ready.wait()
+
+    def _run(self):
+        asyncio.set_event_loop(self._loop)
+        server = self._loop.run_until_complete(asyncio.start_server(self._session, "127.0.0.1", 0))
+        self.port = server.sockets[0].getsockname()[1]
+        self._ready.set()
+        self._loop.run_forever()
+
+    async def _session(self, reader, writer):
+        self.connections += 1
+        self.peak_connections = max(self.peak_connections, self.connections)
+
+        async def reply(line):
+            await asyncio.sleep(self.reply_delay) # Network round trip + server work
+            writer.write(line.encode() + b"\r\n")
+            await writer.drain()
+
+        try:
+            await reply("220 stand-in ESMTP")
+            recipients = []
+            while True:
+                line = await reader.readline()
+                if not line:
+                    return
+                command = line.decode().strip()
+                verb = command[:4].upper()
+                if verb in ("EHLO", "HELO"):
+                    await reply("250-stand-in\r\n250 8BITMIME")
+                elif verb == "MAIL":
+                    recipients = []
+                    await reply("250 OK")
+                elif verb == "RCPT":
+                    recipients.append(command.split(":", 1)[1].strip("<> "))
+                    await reply("250 OK")
+                elif verb == "DATA":
+                    await reply("354 End data with <CR><LF>.<CR><LF>")
+                    while (await reader.readline()) not in (b".\r\n", b""):
+                        pass
+                    self._data_count += 1
+                    if self.fail_every and self._data_count % self.fail_every == 0:
+                        await reply("451 Try again later")
+                    else:
+                        for recipient in recipients:
+                            self.received[recipient] = self.received.get(recipient, 0) + 1
+                        await reply("250 Queued")
+                elif verb == "RSET":
+                    recipients = []
+                    await reply("250 OK")
+                elif verb == "QUIT":
+                    await reply("221 Bye")
+                    return
+                else:
+                    await reply("502 Not implemented")
+        finally:
+            self.connections -= 1
+            writer.close()
+
+
+def make_due_tasks(db_manager, count):
+    """
+    Saves count tasks whose reminder window (5 minutes) has already started.
+    """
+    due = datetime.now() + timedelta(minutes=3)
+    tasks = [Task(f"Reminder {n}", None, due.strftime("%Y-%m-%d"), due.strftime("%H:%M"),
+                  f"user{n}@{DOMAINS[n % len(DOMAINS)]}") for n in range(count)]
+    db_manager.insert_tasks(tasks)
+
+
+def build_message(task):
+    msg = EmailMessage()
+    msg["Subject"] = f"Task Reminder: {task.desc}"
+    msg["From"] = "reminders@example.com"
+    msg["To"] = task.email
+    msg.set_content(f"Reminder for {task.desc}\n.leading dot, to check the dot-stuffing\n")
+    return msg
+
+
+def run_engine(engine_name, count, server):
+    with tempfile.TemporaryDirectory() as folder:
+        db_manager = DatabaseManager(os.path.join(folder, "reminders.db"))
+        make_due_tasks(db_manager, count)
+        service = TaskService(db_manager, reminder_window_minutes=5)
+        stop_event = threading.Event()
+        failed = []
+
+        if engine_name == "threads":
+            dispatcher = ReminderDispatcher(
+                send=lambda task, transport: transport.send(build_message(task)),
+                transport_factory=lambda: SMTPTransport("127.0.0.1", server.port, use_tls=False),
+                on_sent=service.reminder_sent, on_failed=lambda task, e: failed.append(e),
+                workers=16, queue_size=count, per_domain_limit=8, backoff_seconds=0.05,
+            )
+            dispatcher.start()
+
+            def target():
+                try:
+                    service.run_reminders(stop_event, lambda tasks, now: [dispatcher.submit(t) for t in tasks])
+                finally:
+                    dispatcher.stop(timeout=1)
+        else:
+            async def send(task, transport):
+                await transport.send(build_message(task))
+            dispatcher = AsyncReminderEngine(
+                service, send=send,
+                transport_factory=lambda: AsyncSMTPTransport("127.0.0.1", server.port, use_tls=False),
+                on_sent=service.reminder_sent, on_failed=lambda task, e: failed.append(e),
+                connections=16, queue_size=count, per_domain_limit=count, backoff_seconds=0.05,
+            )
+
+            def target():
+                dispatcher.run(stop_event, lambda tasks, now: [dispatcher.submit(t) for t in tasks])
+
+        server.received.clear()
+        started = time.perf_counter()
+        thread = threading.Thread(target=target, name=f"{engine_name}-reminders")
+        thread.start()
+        peak_threads = 0
+        while True:
+            peak_threads = max(peak_threads, threading.active_count())
+            stats = dispatcher.stats()
+            if stats["sent"] + stats["failed"] >= count:
+                break
+            time.sleep(0.01)
+        elapsed = time.perf_counter() - started
+        stop_event.set()
+        service.stop_reminders()
+        thread.join()
+
+        ledger = db_manager.connection.execute("SELECT COUNT(*) FROM reminder_deliveries").fetchone()[0]
+        db_manager.close()
+
+    duplicates = sum(1 for n in server.received.values() if n > 1)
+    print(f"  {engine_name:8} {elapsed:6.2f}s  {count / elapsed:7.0f} reminders/s  "
+          f"peak {server.peak_connections} SMTP connections, {peak_threads} threads  "
+          f"sent {stats['sent']} failed {stats['failed']} retried {stats['retried']}  "
+          f"ledger {ledger}  received {len(server.received)} (duplicates {duplicates})")
+    if failed:
+        print(f"    first failure: {failed[0]!r}")
+    server.peak_connections = server.connections
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    reply_delay_ms = float(sys.argv[2]) if len(sys.argv) > 2 else 2
+    server = LocalSMTPServer(reply_delay=reply_delay_ms / 1000)
+    print(f"{count} due reminders, SMTP stand-in answering after {reply_delay_ms} ms:")
+    for engine_name in ("threads", "asyncio"):
+        run_engine(engine_name, count, server)
@@ -0,0 +1,98 @@
+# benchmarks/stress_concurrency.py
+# Concurrency stress test for DatabaseManager: a "UI" thread keeps adding, editing and
+# finishing tasks while "reminder" threads keep scanning for reminder candidates and
+# recording sent reminders. Counts "database is locked" errors (there should be none)
+# and shows how long the slowest single call on each side took.
+#
+# Run from the project folder:  python benchmarks/stress_concurrency.py [seconds] [initial_tasks]
+
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from database_manager import DatabaseManager # noqa: E402 (needs the path set up above)
+from task import Task # noqa: E402
+
+
+class SideStats:
+    """
+    Call count, locked errors, other errors and the slowest call of one side of the test.
+    """
+    def __init__(self, name):
+        self.name = name
+        self.calls = 0
+        self.locked = 0
+        self.errors = 0
+        self.slowest = 0.0
+
+    def run(self, func):
+        started = time.perf_counter()
+        try:
+            func()
+        except sqlite3.OperationalError as e:
+            if "locked" in str(e):
+                self.locked += 1
+            else:
+                self.errors += 1
+        except sqlite3.Error:
+            self.errors += 1
+        self.calls += 1
+        self.slowest = max(self.slowest, time.perf_counter() - started)
+
+    def __str__(self):
+        return (f"  {self.name:9} {self.calls:7} calls, {self.locked} 'database is locked', "
+                f"{self.errors} other errors, slowest call {self.slowest * 1000:.1f} ms")
+
+
+def ui_side(db_manager, stats, stop):
+    number = 0
+    while not stop.is_set():
+        number += 1
+        task = Task(f"Stress task {number}", None, "2030-01-01", f"{number % 24:02d}:{number % 60:02d}", "a@example.com")
+        stats.run(lambda: db_manager.insert_task(task))
+        if task.id is not None:
+            stats.run(lambda: db_manager.update_task(task.id, task.desc, "edited", "2030-01-02", "10:00", task.email))
+            stats.run(lambda: db_manager.get_task_by_id(task.id))
+            if number % 3 == 0:
+                stats.run(lambda: db_manager.update_status(task.id))
+
+
+def reminder_side(db_manager, stats, stop):
+    while not stop.is_set():
+        candidates = []
+        stats.run(lambda: candidates.extend(db_manager.get_tasks_for_reminder()))
+        for task in candidates[:20]:
+            stats.run(lambda: db_manager.mark_reminder_sent(task))
+
+
+if __name__ == "__main__":
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 5
+    initial = int(sys.argv[2]) if len(sys.argv) > 2 else 20_000
+    with tempfile.TemporaryDirectory() as folder:
+        db_manager = DatabaseManager(os.path.join(folder, "stress.db"))
+        with db_manager.connection:
+            db_manager.connection.executemany(
+                "INSERT INTO tasks (description, date, time, email) VALUES (?, '2030-01-01', '12:00', 'b@example.com')",
+                ((f"Seed task {n}",) for n in range(initial)),
+            )
+        stop = threading.Event()
+        ui_stats = SideStats("UI")
+        reminder_stats = [SideStats(f"reminder{n}") for n in range(2)]
+        threads = [threading.Thread(target=ui_side, args=(db_manager, ui_stats, stop))]
+        threads += [threading.Thread(target=reminder_side, args=(db_manager, stats, stop)) for stats in reminder_stats]
+        for thread in threads:
+            thread.start()
+        time.sleep(seconds)
+        stop.set()
+        for thread in threads:
+            thread.join()
+        print(f"{seconds:.0f} s with {initial} initial tasks:")
+        for stats in [ui_stats] + reminder_stats:
+            print(stats)
+        db_manager.close()
+        failed = any(stats.locked or stats.errors for stats in [ui_stats] + reminder_stats)
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,471 @@
+# benchmarks/suite.py
+# The benchmark suite: times the hot paths of DatabaseManager and the task logic behind the
+# window (TaskService, TaskListModel, ReminderScheduler, reminder emails) on generated databases
+# of several sizes, and saves the results as JSON so two commits can be compared.
+# Runs without a display (the app's work is done through TaskService, like the window does);
+# the one Tk case only runs when a display is available (e.g. under xvfb-run).
+#
+# Run from the project folder:
+#   python benchmarks/suite.py                                  # 1k, 10k and 100k tasks
+#   python benchmarks/suite.py --sizes 1000,1000000 --data-dir /tmp/bench-data
+#   python benchmarks/suite.py --filter reminder --repeat 10
+#   python benchmarks/suite.py --compare benchmarks/results/OLD.json
+# The other scripts in this folder are one-off comparisons (old vs new way) for single changes.
+
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from datagen import TaskMix, generate_tasks, open_database # noqa: E402 (needs the path set up above)
+from reminder_email import build_reminder_email # noqa: E402
+from reminder_scheduler import ReminderScheduler # noqa: E402
+from recurrence import next_occurrence # noqa: E402
+from task import Task # noqa: E402
+from task_model import TaskListModel # noqa: E402
+from task_service import TaskService # noqa: E402
+
+PROJECT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_FOLDER = os.path.join(PROJECT, "benchmarks", "results")
+
+CASES = [] # (name, prepare function, ops per run), in the order they run
+
+
+def case(name, ops=1):
+    """
+    Registers a benchmark case. The decorated function prepare(ctx) does the untimed setup
+    and returns the function to time; it's called again before every repetition.
+    Args:
+        name (str): "group.what", e.g. "db.get_task_by_id".
+        ops: Operations per timed run (for the time per operation): a number, or a
+             function ops(ctx) for cases that depend on the database size.
+    """
+    def register(prepare):
+        CASES.append((name, prepare, ops))
+        return prepare
+    return register
+
+
+class Context:
+    """
+    What the cases work with: the generated database, a TaskService on top of it, and a few
+    things that are slow to load and don't change (loaded once, on first use).
+    """
+    def __init__(self, db_manager, size, seed):
+        self.db_manager = db_manager
+        self.size = size
+        self.service = TaskService(db_manager, reminder_window_minutes=5)
+        self.rng = random.Random(seed)
+        self.cleanups = [] # Untimed functions to run after the timed part (e.g. delete what was added)
+        self._run_number = 0
+        self._all_tasks = None
+        self._candidates = None
+        ids = [row[0] for row in db_manager.connection.execute("SELECT id FROM tasks")]
+        self.sample_ids = self.rng.sample(ids, min(1000, len(ids)))
+        self.sample_descs = [row[0] for row in db_manager.connection.execute(
+            f"SELECT description FROM tasks WHERE id IN ({','.join('?' * len(self.sample_ids))})", self.sample_ids)]
+
+    @property
+    def all_tasks(self):
+        if self._all_tasks is None:
+            self._all_tasks = self.db_manager.get_all_tasks()
+        return self._all_tasks
+
+    @property
+    def candidates(self):
+        if self._candidates is None:
+            self._candidates = self.db_manager.get_tasks_for_reminder()
+        return self._candidates
+
+    def new_tasks(self, count):
+        """
+        Returns count new tasks (not saved) whose descriptions differ from every earlier run.
+        """
+        self._run_number += 1
+        return list(generate_tasks(count, seed=self._run_number, prefix=f"Bench run {self._run_number}"))
+
+    def insert_new(self, count):
+        """
+        Saves count new tasks (untimed) and registers their removal after the run.
+        """
+        tasks = self.new_tasks(count)
+        self.db_manager.insert_tasks(tasks)
+        self.cleanups.append(lambda: self.db_manager.delete_tasks([task.id for task in tasks]))
+        return tasks
+
+
+# --- CRUD ---
+
+@case("db.insert_task", ops=200)
+def insert_task(ctx):
+    tasks = ctx.new_tasks(200)
+    ctx.cleanups.append(lambda: ctx.db_manager.delete_tasks([task.id for task in tasks]))
+    return lambda: [ctx.db_manager.insert_task(task) for task in tasks]
+
+@case("db.insert_tasks_bulk", ops=1000)
+def insert_tasks_bulk(ctx):
+    tasks = ctx.new_tasks(1000)
+    ctx.cleanups.append(lambda: ctx.db_manager.delete_tasks([task.id for task in tasks]))
+    return lambda: ctx.db_manager.insert_tasks(tasks)
+
+@case("db.update_task", ops=200)
+def update_task(ctx):
+    tasks = ctx.insert_new(200)
+    return lambda: [ctx.db_manager.update_task(t.id, t.desc, "edited", t.due_date, t.due_time, t.email)
+                    for t in tasks]
+
+@case("db.update_status", ops=200)
+def update_status(ctx):
+    tasks = ctx.insert_new(200)
+    return lambda: [ctx.db_manager.update_status(task.id) for task in tasks]
+
+@case("db.delete_task", ops=200)
+def delete_task(ctx):
+    tasks = ctx.new_tasks(200)
+    ctx.db_manager.insert_tasks(tasks)
+    return lambda: [ctx.db_manager.delete_task(task.id) for task in tasks]
+
+@case("db.get_task_by_id", ops=1000)
+def get_task_by_id(ctx):
+    # Every lookup is a query (the task cache starts empty and the IDs are all different)
+    ctx.db_manager.task_cache.invalidate()
+    return lambda: [ctx.db_manager.get_task_by_id(task_id) for task_id in ctx.sample_ids]
+
+@case("db.get_task_by_id.cached", ops=1000)
+def get_task_by_id_cached(ctx):
+    # Opening tasks that were just listed: every lookup is answered by the task cache
+    for task_id in ctx.sample_ids:
+        ctx.db_manager.get_task_by_id(task_id)
+    return lambda: [ctx.db_manager.get_task_by_id(task_id) for task_id in ctx.sample_ids]
+
+@case("service.add_task", ops=200)
+def service_add_task(ctx):
+    # Validation + uniqueness check + insert + list and schedule update, like the Add screen
+    tasks = ctx.new_tasks(200)
+    added = []
+    ctx.cleanups.append(lambda: ctx.db_manager.delete_tasks([task.id for task in added]))
+    return lambda: [added.append(ctx.service.add_task(t.desc, t.note, t.due_date, t.due_time, t.email))
+                    for t in tasks]
+
+# --- Listing ---
+
+@case("db.get_all_tasks", ops=lambda ctx: ctx.size)
+def get_all_tasks(ctx):
+    return ctx.db_manager.get_all_tasks
+
+@case("db.iter_tasks", ops=lambda ctx: ctx.size)
+def iter_tasks(ctx):
+    return lambda: sum(1 for _ in ctx.db_manager.iter_tasks())
+
+@case("db.get_tasks_page.first", ops=100)
+def first_page(ctx):
+    return lambda: [ctx.db_manager.get_tasks_page(None, 200) for _ in range(100)]
+
+@case("db.get_tasks_page.walk_50", ops=50)
+def walk_pages(ctx):
+    def walk():
+        after = None
+        for _ in range(50):
+            page = ctx.db_manager.get_tasks_page(after, 200)
+            if not page:
+                return
+            after = ctx.db_manager.page_cursor(page[-1])
+    return walk
+
+@case("service.reload", ops=1)
+def service_reload(ctx):
+    # What fill_listbox does: (re)load the first page into the sorted list
+    return ctx.service.reload
+
+@case("service.load_more", ops=20)
+def service_load_more(ctx):
+    ctx.service.reload()
+    return lambda: [ctx.service.load_more() for _ in range(20)]
+
+# --- Sorting ---
+
+@case("model.reset_sort", ops=lambda ctx: ctx.size)
+def model_reset(ctx):
+    tasks = ctx.all_tasks
+    model = TaskListModel()
+    return lambda: model.reset(tasks)
+
+@case("model.insert", ops=1000)
+def model_insert(ctx):
+    model = TaskListModel()
+    model.reset(ctx.all_tasks)
+    tasks = ctx.new_tasks(1000)
+    for number, task in enumerate(tasks):
+        task.id = -1 - number # Not saved, just unique
+    return lambda: [model.insert(task) for task in tasks]
+
+# --- Uniqueness ---
+
+@case("db.description_exists.hit", ops=1000)
+def description_hit(ctx):
+    descs = [desc.upper() for desc in ctx.sample_descs] # The check ignores upper/lower case
+    return lambda: [ctx.db_manager.description_exists(desc) for desc in descs]
+
+@case("db.description_exists.miss", ops=1000)
+def description_miss(ctx):
+    descs = [f"not there {n}" for n in range(1000)]
+    return lambda: [ctx.db_manager.description_exists(desc) for desc in descs]
+
+@case("service.validate", ops=1000)
+def service_validate(ctx):
+    fields = [(f"new task {n}", "2030-01-01", "10:00", "someone@example.com") for n in range(1000)]
+    return lambda: [ctx.service.validate(*field) for field in fields]
+
+# --- Reminders ---
+
+@case("db.get_tasks_for_reminder", ops=1)
+def reminder_candidates(ctx):
+    return ctx.db_manager.get_tasks_for_reminder
+
+@case("reminder.rebuild", ops=lambda ctx: len(ctx.candidates))
+def reminder_rebuild(ctx):
+    scheduler = ReminderScheduler(5)
+    candidates = ctx.candidates
+    return lambda: scheduler.rebuild(candidates)
+
+@case("reminder.tick", ops=1)
+def reminder_tick(ctx):
+    # One wake-up of the reminder loop around midday tomorrow: pop the due reminders
+    scheduler = ReminderScheduler(5)
+    scheduler.rebuild(ctx.candidates)
+    now = datetime.combine(date.today() + timedelta(days=1), datetime.min.time()) + timedelta(hours=12)
+    return lambda: scheduler.pop_due(now)
+
+@case("reminder.schedule", ops=1000)
+def reminder_schedule(ctx):
+    scheduler = ReminderScheduler(5)
+    scheduler.rebuild(ctx.candidates)
+    tasks = [task for task in ctx.candidates[:1000]]
+    return lambda: [scheduler.schedule(task) for task in tasks]
+
+@case("recurrence.next_occurrence", ops=1000)
+def recurrence_next(ctx):
+    # The work done per popped reminder of a repeating task (rules that need a few periods)
+    rules = ["FREQ=DAILY", "FREQ=WEEKLY;BYDAY=MO,WE,FR", "FREQ=MONTHLY;BYDAY=-1FR", "FREQ=MONTHLY;BYMONTHDAY=31"]
+    tasks = [Task(f"repeat {i}", "", "2030-01-31", "10:00", "someone@example.com", i + 1,
+                  recurrence=rules[i % len(rules)]) for i in range(1000)]
+    after = datetime(2030, 1, 31, 12, 0)
+    return lambda: [next_occurrence(task, after) for task in tasks]
+
+@case("db.mark_reminder_sent", ops=200)
+def mark_reminder_sent(ctx):
+    tasks = ctx.new_tasks(200)
+    for task in tasks: # Reminder candidates, whatever the mix
+        task.due_date, task.due_time, task.email = "2030-01-01", "10:00", "someone@example.com"
+    ctx.db_manager.insert_tasks(tasks)
+    ctx.cleanups.append(lambda: ctx.db_manager.delete_tasks([task.id for task in tasks]))
+    return lambda: [ctx.db_manager.mark_reminder_sent(task) for task in tasks]
+
+# --- Email rendering ---
+
+@case("email.build", ops=1000)
+def email_build(ctx):
+    tasks = (ctx.candidates * 1000)[:1000] or ctx.new_tasks(1000)
+    return lambda: [build_reminder_email(task, "reminders@example.com") for task in tasks]
+
+@case("email.render_bytes", ops=1000)
+def email_render(ctx):
+    tasks = (ctx.candidates * 1000)[:1000] or ctx.new_tasks(1000)
+    messages = [build_reminder_email(task, "reminders@example.com") for task in tasks]
+    return lambda: [msg.as_bytes() for msg in messages]
+
+# --- Search ---
+
+@case("db.search", ops=6)
+def search(ctx):
+    queries = ["milk", "me", "meeting report", "pass", "fix bike", "zzz-not-there"]
+    return lambda: [ctx.db_manager.search(query) for query in queries]
+
+# --- Tk (only with a display) ---
+
+@case("tk.virtual_listbox.set_items", ops=1)
+def tk_set_items(ctx):
+    import tkinter as tk
+    from frames.tasks import VirtualListbox, format_task
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        raise Skipped(f"no display ({e})")
+    listbox = VirtualListbox(root, format_item=format_task, item_key=lambda task: task.id)
+    listbox.pack()
+    ctx.cleanups.append(root.destroy)
+    tasks = ctx.all_tasks
+
+    def fill():
+        listbox.set_items(tasks)
+        root.update_idletasks()
+    return fill
+
+
+class Skipped(Exception):
+    """
+    Raised by a case's prepare function when the case can't run here.
+    """
+
+
+def run_case(ctx, prepare, ops, repeat):
+    """
+    Times one case repeat times (garbage collection off during the timed part, like timeit).
+    Returns:
+        dict: The timings, or {"skipped": reason}.
+    """
+    times = []
+    for _ in range(repeat):
+        try:
+            run = prepare(ctx)
+        except Skipped as e:
+            return {"skipped": str(e)}
+        gc.collect()
+        gc.disable()
+        try:
+            started = time.perf_counter()
+            run()
+            times.append(time.perf_counter() - started)
+        finally:
+            gc.enable()
+            for cleanup in ctx.cleanups:
+                cleanup()
+            ctx.cleanups = []
+    ops = ops(ctx) if callable(ops) else ops
+    best = min(times)
+    return {
+        "ops": ops,
+        "best_s": best,
+        "median_s": statistics.median(times),
+        "per_op_us": best / ops * 1e6 if ops else None,
+        "repeat": repeat,
+    }
+
+
+def git_info():
+    """
+    Returns:
+        dict: The commit being measured and whether the tree had uncommitted changes.
+    """
+    def git(*args):
+        try:
+            return subprocess.run(["git", *args], cwd=PROJECT, capture_output=True, text=True).stdout.strip()
+        except OSError:
+            return ""
+    return {"commit": git("rev-parse", "HEAD") or None, "dirty": bool(git("status", "--porcelain", "--untracked-files=no"))}
+
+
+def compare(old_results, new_results, threshold):
+    """
+    Prints the time per operation of both runs for every case they share.
+    Returns:
+        int: How many cases got slower by more than threshold (e.g. 0.1 = 10%).
+    """
+    old_by_key = {(r["case"], r["size"]): r for r in old_results["results"] if "per_op_us" in r}
+    regressions = 0
+    print(f"\nCompared with {(old_results['meta'].get('commit') or 'unknown')[:10]}:")
+    for result in new_results["results"]:
+        old = old_by_key.get((result["case"], result["size"]))
+        if old is None or "per_op_us" not in result:
+            continue
+        ratio = result["per_op_us"] / old["per_op_us"] if old["per_op_us"] else float("inf")
+        flag = ""
+        if ratio > 1 + threshold:
+            flag = "  SLOWER"
+            regressions += 1
+        elif ratio < 1 - threshold:
+            flag = "  faster"
+        print(f"  {result['case']:32} {result['size']:>8}  {old['per_op_us']:12.2f} -> "
+              f"{result['per_op_us']:12.2f} us/op  x{ratio:5.2f}{flag}")
+    return regressions
+
+
+def parse_mix(text):
+    values = dict(item.split("=") for item in text.split(",")) if text else {}
+    return TaskMix(**{name: float(value) for name, value in values.items()})
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the Task Manager benchmark suite.")
+    parser.add_argument("--sizes", default="1000,10000,100000", help="database sizes (comma separated)")
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs per case (the best one counts)")
+    parser.add_argument("--filter", default="", help="only run cases whose name contains this text")
+    parser.add_argument("--mix", default="", help="task mix, e.g. dated=0.9,timed=0.8,emailed=0.5,done=0.1,noted=0.5")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--data-dir", help="keep the generated databases here and reuse them (default: temporary)")
+    parser.add_argument("--output", help=f"results file (default: {os.path.relpath(RESULTS_FOLDER, PROJECT)}/<commit>-<time>.json)")
+    parser.add_argument("--compare", help="earlier results file to compare with")
+    parser.add_argument("--threshold", type=float, default=0.10, help="slowdown that counts as a regression (default 0.10)")
+    parser.add_argument("--list", action="store_true", help="list the cases and exit")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        for name, _, _ in CASES:
+            print(name)
+        return 0
+
+    sizes = [int(size) for size in args.sizes.split(",")]
+    mix = parse_mix(args.mix)
+    cases = [(name, prepare, ops) for name, prepare, ops in CASES if args.filter in name]
+    results = {
+        "meta": {
+            **git_info(),
+            "date": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "sizes": sizes,
+            "mix": mix.as_dict(),
+            "seed": args.seed,
+            "repeat": args.repeat,
+        },
+        "results": [],
+    }
+
+    with tempfile.TemporaryDirectory() as temporary_folder:
+        data_folder = args.data_dir or temporary_folder
+        os.makedirs(data_folder, exist_ok=True)
+        for size in sizes:
+            started = time.perf_counter()
+            db_manager = open_database(data_folder, size, mix, args.seed)
+            print(f"{size} tasks (database ready in {time.perf_counter() - started:.1f}s):")
+            ctx = Context(db_manager, size, args.seed)
+            for name, prepare, ops in cases:
+                result = run_case(ctx, prepare, ops, args.repeat)
+                results["results"].append({"case": name, "size": size, **result})
+                if "skipped" in result:
+                    print(f"  {name:32} skipped: {result['skipped']}")
+                else:
+                    print(f"  {name:32} {result['per_op_us']:12.2f} us/op  (best run {result['best_s'] * 1000:9.2f} ms)")
+            db_manager.close()
+
+    output = args.output
+    if output is None:
+        os.makedirs(RESULTS_FOLDER, exist_ok=True)
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        output = os.path.join(RESULTS_FOLDER, f"{(results['meta']['commit'] or 'nogit')[:10]}-{stamp}.json")
+    with open(output, "w", encoding="utf-8") as file:
+        json.dump(results, file, indent=2)
+    print(f"Results saved to {output}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as file:
+            old_results = json.load(file)
+        if compare(old_results, results, args.threshold):
+            return 1 # Some case got slower
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
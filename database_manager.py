@@ -1,31 +1,392 @@
 # database_manager.py
 # Handles all the interactions with the SQLite database for tasks.
 
+import functools # lru_cache for the page query texts
 import sqlite3 as sql
+import threading # The UI thread and the reminder threads use the database at the same time
+from contextlib import contextmanager # For the _reading()/_writing() helpers
+from pathlib import Path # To build the read-only 'file:' URI for the database file
 from task import Task # Need the Task class definition
+from task_cache import TaskCache # Recently listed tasks, so opening one doesn't need a query
+# Prepared statement reuse (see STATEMENTS below)
+from statement_cache import StatementCache, normalize_sql, STATEMENT_CACHE_SIZE
+
+# --- Storage Settings ---
+# PRAGMAs applied to every connection (in this order).
+STORAGE_PRAGMAS = {
+    "busy_timeout": 5000,          # Wait up to 5 s for a lock instead of failing with "database is locked"
+    "journal_mode": "WAL",         # Readers don't block the writer and vice versa (writer connection only)
+    "synchronous": "NORMAL",       # Safe with WAL, and far fewer fsyncs than the default FULL
+    "cache_size": -16000,          # Page cache of ~16 MB (negative numbers are KiB)
+    "mmap_size": 64 * 1024 * 1024, # Read the file through a 64 MB memory map
+}
+# These can only be changed by a connection that is allowed to write.
+WRITER_ONLY_PRAGMAS = {"journal_mode"}
+
+# --- Queries ---
+# The column order matches the Task constructor, so rows can be turned into tasks with Task(*row).
+TASK_COLUMNS = "description, note, date, time, email, id, status, recurrence"
+
+# Tasks that are candidates for email reminders.
+# The conditions repeat the WHERE of idx_tasks_reminder, which lets SQLite use that partial index.
+SQL_REMINDER_CANDIDATES = f"""
+    SELECT {TASK_COLUMNS}
+    FROM tasks
+    WHERE date IS NOT NULL AND time IS NOT NULL -- Must have date and time
+          AND email IS NOT NULL AND email != '' -- Must have a non-empty email
+          AND status = 0 -- Must be pending (not done)
+          AND (recurrence IS NOT NULL -- Repeating tasks always (TaskService picks the occurrence)
+               OR NOT EXISTS ( -- Others: must not have been reminded about this due time already
+                   SELECT 1 FROM reminder_deliveries d
+                   WHERE d.task_id = tasks.id AND d.date = tasks.date AND d.time = tasks.time
+               ))
+"""
+
+# The task list shows tasks with a due date and time first (in due order), then the rest by ID.
+# (time is only ever set together with a date.) Both halves can be read in order straight
+# from an index, so SQLite doesn't have to sort. The dated half also says "date IS NOT NULL":
+# undated rows sort first in the (date, time) index, and without it SQLite walks all of them
+# before the first dated task.
+SQL_LIST_DATED = f"SELECT {TASK_COLUMNS} FROM tasks WHERE date IS NOT NULL AND time IS NOT NULL ORDER BY date, time, id"
+SQL_LIST_UNDATED = f"SELECT {TASK_COLUMNS} FROM tasks WHERE time IS NULL ORDER BY id"
+
+# Keyset pagination over the same order: the next page starts right after the last task of
+# the previous one (no OFFSET, so page 1000 is as quick as page 1). Filters are added by
+# get_tasks_page; {filters} is either empty or a few "AND ..." conditions.
+SQL_PAGE_DATED_FIRST = (
+    "SELECT {columns} FROM tasks WHERE date IS NOT NULL AND time IS NOT NULL{filters} "
+    "ORDER BY date, time, id LIMIT ?"
+)
+SQL_PAGE_DATED_AFTER = (
+    "SELECT {columns} FROM tasks WHERE time IS NOT NULL AND (date, time, id) > (?, ?, ?){filters} "
+    "ORDER BY date, time, id LIMIT ?"
+)
+# The undated pages always go through idx_tasks_undated (only the undated tasks, by ID). When
+# most tasks are undated, SQLite's statistics make it prefer walking the table by ID, which is
+# only as quick while that stays true; the index is quick either way.
+SQL_PAGE_UNDATED_AFTER = (
+    "SELECT {columns} FROM tasks INDEXED BY idx_tasks_undated WHERE time IS NULL AND id > ?{filters} "
+    "ORDER BY id LIMIT ?"
+)
+
+SQL_TASK_BY_ID = f"SELECT {TASK_COLUMNS} FROM tasks WHERE id=?"
+
+# Is a description already taken by another task? Case-insensitive, like idx_tasks_description_nocase.
+# ("id IS NOT NULL" matches every task, so passing None as the ID excludes nothing.)
+SQL_DESCRIPTION_EXISTS = "SELECT 1 FROM tasks WHERE description = ? COLLATE NOCASE AND id IS NOT ? LIMIT 1"
+
+# Full-text search: best matches first. bm25() gives lower (better) scores to better matches;
+# the weights make a hit in the description count ten times as much as one in the note.
+# Scoring every match of a common word would take far too long on a big list (it was ~0.3s
+# for a word in 150,000 of 1M tasks), so only the newest SEARCH_CANDIDATES matches are scored.
+# Queries with fewer matches than that are ranked exactly.
+SEARCH_CANDIDATES = 2000
+SQL_SEARCH = f"""
+    SELECT {TASK_COLUMNS} FROM tasks
+    JOIN (
+        SELECT rowid, score FROM (
+            SELECT rowid, bm25(tasks_fts, 10.0, 1.0) AS score FROM tasks_fts
+            WHERE tasks_fts MATCH ? ORDER BY rowid DESC LIMIT {SEARCH_CANDIDATES}
+        )
+        ORDER BY score LIMIT ?
+    ) AS hits ON tasks.id = hits.rowid
+    ORDER BY hits.score
+"""
+# Fallback without FTS5 (much slower, reads every row): description matches first
+SQL_SEARCH_LIKE = f"""
+    SELECT {TASK_COLUMNS} FROM tasks
+    WHERE description LIKE ? ESCAPE '\\' OR note LIKE ? ESCAPE '\\'
+    ORDER BY description LIKE ? ESCAPE '\\' DESC, id
+    LIMIT ?
+"""
+
+# Hot queries with the index EXPLAIN QUERY PLAN has to mention for them (None = the table's own
+# ID order is enough). Queries with an index must SEARCH it: a SCAN of the whole index also
+# "uses" it, but reads every row. Used by DatabaseManager.check_query_plans().
+HOT_QUERIES = {
+    "reminder_candidates": (SQL_REMINDER_CANDIDATES, (), "idx_tasks_reminder"),
+    "list_dated": (SQL_LIST_DATED, (), "idx_tasks_date_time"),
+    "list_undated": (SQL_LIST_UNDATED, (), None),
+    "page_dated_first": (
+        SQL_PAGE_DATED_FIRST.format(columns=TASK_COLUMNS, filters=""), (100,), "idx_tasks_date_time"
+    ),
+    "task_by_id": (SQL_TASK_BY_ID, (1,), "INTEGER PRIMARY KEY"),
+    "page_dated": (
+        SQL_PAGE_DATED_AFTER.format(columns=TASK_COLUMNS, filters=""), ("2030-01-01", "12:00", 1, 100), "idx_tasks_date_time"
+    ),
+    "page_undated": (SQL_PAGE_UNDATED_AFTER.format(columns=TASK_COLUMNS, filters=""), (1, 100), "idx_tasks_undated"),
+    "description_exists": (SQL_DESCRIPTION_EXISTS, ("Task", None), "idx_tasks_description_nocase"),
+}
+
+# --- Statement Registry ---
+# Every statement the task methods run, by name, normalized once (comments and extra spaces
+# removed, see statement_cache.normalize_sql). sqlite3 only reuses a prepared statement for
+# the exact same text, so every method that runs e.g. "task_by_id" shares one prepared copy
+# per connection instead of preparing its own variant. Add new queries here, not inline.
+STATEMENTS = {name: normalize_sql(text) for name, text in {
+    "insert_task": """
+        INSERT INTO tasks (description, note, date, time, email, recurrence)
+        VALUES (?, ?, ?, ?, ?, ?) -- Use placeholders to prevent SQL injection
+    """,
+    "insert_task_with_status": """
+        INSERT INTO tasks (description, note, date, time, email, status, recurrence) VALUES (?, ?, ?, ?, ?, ?, ?)
+    """,
+    "update_task": """
+        UPDATE tasks
+        SET description=?, note=?, date=?, time=?, email=?, recurrence=? -- Columns to update
+        WHERE id=? -- Condition to find the right task
+    """,
+    # A repeating task moves on to its next occurrence
+    "advance_task": "UPDATE tasks SET date=?, time=?, recurrence=? WHERE id=?",
+    "update_status": "UPDATE tasks SET status=1 WHERE id=?", # Status 1 = Done
+    "delete_task": "DELETE FROM tasks WHERE id=?",
+    "clear_tasks": "DELETE FROM tasks",
+    "task_by_id": SQL_TASK_BY_ID,
+    "task_date": "SELECT date FROM tasks WHERE id=?",
+    "description_exists": SQL_DESCRIPTION_EXISTS,
+    "list_dated": SQL_LIST_DATED,
+    "list_undated": SQL_LIST_UNDATED,
+    "search": SQL_SEARCH,
+    "search_like": SQL_SEARCH_LIKE,
+    "reminder_candidates": SQL_REMINDER_CANDIDATES,
+    # Reminder history
+    "mark_reminder_sent": """
+        INSERT OR IGNORE INTO reminder_deliveries (task_id, date, time, sent_at)
+        VALUES (?, ?, ?, datetime('now', 'localtime'))
+    """,
+    "is_reminder_sent": "SELECT 1 FROM reminder_deliveries WHERE task_id=? AND date=? AND time=?",
+    # Reminders already sent for the current and coming occurrences of repeating tasks
+    "sent_occurrences": "SELECT task_id, date, time FROM reminder_deliveries WHERE task_id=? AND date >= ?",
+    "all_sent_occurrences": """
+        SELECT d.task_id, d.date, d.time FROM reminder_deliveries d
+        JOIN tasks t ON t.id = d.task_id
+        WHERE t.recurrence IS NOT NULL AND t.status = 0 AND d.date >= t.date
+    """,
+    # Reminders sent for an old due date/time no longer count once the task is moved
+    "forget_moved_reminders": """
+        DELETE FROM reminder_deliveries
+        WHERE task_id=? AND NOT (date IS ? AND time IS ?)
+    """,
+    "forget_reminders": "DELETE FROM reminder_deliveries WHERE task_id=?",
+    # Reminders of the occurrences a repeating task has moved past
+    "forget_past_reminders": "DELETE FROM reminder_deliveries WHERE task_id=? AND date < ?",
+    "clear_reminders": "DELETE FROM reminder_deliveries",
+}.items()}
+
+@functools.lru_cache(maxsize=None)
+def page_statement(template, filters):
+    """
+    The normalized SQL of a get_tasks_page() query (a SQL_PAGE_* template with its filters).
+    There are only a few filter combinations, so every one is built once.
+    Args:
+        template (str): One of the SQL_PAGE_* templates.
+        filters (str): The "AND ..." conditions ("" for none).
+    Returns:
+        str: The SQL, the same text every time for the same arguments.
+    """
+    return normalize_sql(template.format(columns=TASK_COLUMNS, filters=filters))
+
+def _add_description_nocase_index(connection):
+    """
+    Migration step 2: makes descriptions unique regardless of upper/lower case, like the
+    check in the app always did. Older files may already contain descriptions that only
+    differ in case; we don't delete anyone's tasks, so those files get a plain index
+    (still fast to look up) and keep the old case-sensitive rule until the duplicates are renamed.
+    """
+    try:
+        connection.execute(
+            "CREATE UNIQUE INDEX IF NOT EXISTS idx_tasks_description_nocase ON tasks (description COLLATE NOCASE)"
+        )
+    except sql.IntegrityError:
+        print("Database Warning: Some task descriptions only differ in case, keeping them (index is not unique).")
+        connection.execute(
+            "CREATE INDEX IF NOT EXISTS idx_tasks_description_nocase ON tasks (description COLLATE NOCASE)"
+        )
+
+def _add_search_index(connection):
+    """
+    Migration step 3: a full-text index (FTS5) over the description and note of every task.
+    It stores no copy of the text ("external content"), only the index; triggers keep it in
+    step with the tasks table. Python builds without FTS5 skip this step and search()
+    falls back to a slower LIKE scan; the step is tried again at every start (see
+    DatabaseManager.migrate), so the index appears once the app runs on a build with FTS5.
+    """
+    try:
+        connection.execute(
+            """
+            CREATE VIRTUAL TABLE IF NOT EXISTS tasks_fts USING fts5(
+                description, note,
+                content='tasks', content_rowid='id',
+                prefix='2 3' -- Extra index for short prefixes, search runs while the user types
+            )
+            """
+        )
+    except sql.OperationalError as e:
+        print(f"Database Warning: Full-text search not available ({e}), search will be slower.")
+        return
+    # An external content index has to be told the OLD text to remove it again
+    connection.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS tasks_fts_insert AFTER INSERT ON tasks BEGIN
+            INSERT INTO tasks_fts (rowid, description, note) VALUES (new.id, new.description, new.note);
+        END
+        """
+    )
+    connection.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS tasks_fts_delete AFTER DELETE ON tasks BEGIN
+            INSERT INTO tasks_fts (tasks_fts, rowid, description, note)
+            VALUES ('delete', old.id, old.description, old.note);
+        END
+        """
+    )
+    connection.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS tasks_fts_update AFTER UPDATE OF description, note ON tasks BEGIN
+            INSERT INTO tasks_fts (tasks_fts, rowid, description, note)
+            VALUES ('delete', old.id, old.description, old.note);
+            INSERT INTO tasks_fts (rowid, description, note) VALUES (new.id, new.description, new.note);
+        END
+        """
+    )
+    # Index the tasks that are already there
+    connection.execute("INSERT INTO tasks_fts (tasks_fts) VALUES ('rebuild')")
+
+def fts_query(words):
+    """
+    Turns the words the user typed into an FTS5 query: every word must appear, and the
+    last one may be the start of a longer word (it is probably still being typed).
+    Each word is quoted, so characters like '-', '*' or '"' are searched for instead of
+    being read as FTS5 syntax.
+    Args:
+        words (list[str]): The words.
+    Returns:
+        str: The MATCH expression, e.g. '"buy" "mil"*'.
+    """
+    quoted = ['"' + word.replace('"', '""') + '"' for word in words]
+    return " ".join(quoted) + "*"
+
+# --- Schema Migrations ---
+# Changes to the schema of existing database files. PRAGMA user_version stores how many of
+# these steps a file has been through already, so each step runs exactly once per file.
+# Only ever append new steps at the end; never edit one that has been released.
+SCHEMA_MIGRATIONS = [
+    # 1: Indexes for the reminder scan and the ordered task list
+    [
+        """
+        CREATE INDEX IF NOT EXISTS idx_tasks_reminder ON tasks (date, time)
+        WHERE date IS NOT NULL AND time IS NOT NULL
+              AND email IS NOT NULL AND email != ''
+              AND status = 0
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_tasks_date_time ON tasks (date, time)",
+    ],
+    # 2: Case-insensitive unique descriptions
+    _add_description_nocase_index,
+    # 3: Full-text search over descriptions and notes
+    _add_search_index,
+    # 4: Repeat rules (see recurrence.py). One rule per task instead of a row per occurrence.
+    ["ALTER TABLE tasks ADD COLUMN recurrence TEXT"],
+    # 5: The undated part of the task list, in ID order. Without it, paging through the few
+    # undated tasks of a mostly dated list walks (nearly) the whole table by ID.
+    ["CREATE INDEX IF NOT EXISTS idx_tasks_undated ON tasks (id) WHERE time IS NULL"],
+]
 
 class DatabaseManager:
     """
     Manages the connection and operations for the task database.
     Includes methods to create tables, insert, update, delete, and query tasks.
     """
-    def __init__(self, db_file):
+    def __init__(self, db_file, cache_size=1024):
         """
         Initializes the DatabaseManager.
         Connects to the specified SQLite database file.
+        There is one connection for writing, shared by all threads and used by one thread at
+        a time (writes are serialized with a lock). Reads go through a read-only connection
+        per thread, so a reminder scan never waits for the UI and the UI never waits for a scan.
         Args:
             db_file (str): The path to the SQLite database file.
+            cache_size (int): How many tasks the task cache keeps (0 = no cache).
         """
+        self.db_file = db_file
         # Connect to the SQLite database file.
-        # check_same_thread=False is needed because the reminder thread will access the DB too.
-        self.connection = sql.connect(db_file, check_same_thread=False)
+        # check_same_thread=False is needed because the reminder threads will write too (under the lock).
+        # cached_statements: how many prepared statements sqlite3 keeps (see STATEMENTS).
+        self.connection = sql.connect(db_file, check_same_thread=False, cached_statements=STATEMENT_CACHE_SIZE)
+        self.apply_pragmas(self.connection)
+        # Runs the registered statements on the writer connection (under the write lock)
+        self.statements = StatementCache(self.connection, STATEMENTS)
+        self._write_lock = threading.RLock() # Only one thread may use the writer connection at a time
+        # An in-memory database only exists inside its one connection, so there's nothing to split
+        self._use_readers = db_file != ":memory:" and not db_file.startswith("file:")
+        self._thread_readers = threading.local() # Each thread's own read-only connection (StatementCache)
+        self._all_readers = []                   # Every reader ever opened (closed in close())
+        self._readers_lock = threading.Lock()
+        # The tasks of the pages and search results that were shown last, by ID. get_task_by_id()
+        # answers from it without a query. The write methods below update it AFTER their commit
+        # (so a reader can never see a change in the cache that isn't in the database yet).
+        # Full scans (get_all_tasks, iter_tasks, the reminder scan) don't fill it: they'd just
+        # push out the tasks the user is looking at.
+        self.task_cache = TaskCache(cache_size)
         # Make sure the necessary table exists when the manager is created.
         self.create_tables()
+        # search() uses the full-text index if this SQLite could create it (see _add_search_index)
+        self.has_search_index = self.connection.execute(
+            "SELECT 1 FROM sqlite_master WHERE type='table' AND name='tasks_fts'"
+        ).fetchone() is not None
+
+    def apply_pragmas(self, connection, read_only=False):
+        """
+        Applies STORAGE_PRAGMAS to a connection.
+        Args:
+            connection (sqlite3.Connection): The connection.
+            read_only (bool): True for the read-only connections (skips WRITER_ONLY_PRAGMAS).
+        """
+        for name, value in STORAGE_PRAGMAS.items():
+            if read_only and name in WRITER_ONLY_PRAGMAS:
+                continue
+            # PRAGMA doesn't accept placeholders; the values come from the constant above
+            connection.execute(f"PRAGMA {name} = {value}")
+
+    @contextmanager
+    def _writing(self):
+        """
+        Gives the calling thread the writer connection's StatementCache inside a transaction
+        (committed at the end, rolled back on an error). Other writers wait meanwhile.
+        """
+        with self._write_lock, self.connection:
+            yield self.statements
+
+    @contextmanager
+    def _reading(self):
+        """
+        Gives the calling thread a StatementCache for reading. No transaction is opened;
+        every SELECT sees the latest committed data.
+        """
+        if not self._use_readers:
+            with self._write_lock: # Only the one connection, share it safely
+                yield self.statements
+            return
+        yield self._reader()
+
+    def _reader(self):
+        # Returns this thread's read-only connection (as a StatementCache), opening it on first use
+        reader = getattr(self._thread_readers, "statements", None)
+        if reader is None:
+            uri = Path(self.db_file).absolute().as_uri() + "?mode=ro"
+            # check_same_thread=False only so close() can close it from the UI thread
+            connection = sql.connect(uri, uri=True, check_same_thread=False, isolation_level=None,
+                                     cached_statements=STATEMENT_CACHE_SIZE)
+            self.apply_pragmas(connection, read_only=True)
+            reader = self._thread_readers.statements = StatementCache(connection, STATEMENTS)
+            with self._readers_lock:
+                self._all_readers.append(reader)
+        return reader
 
     def create_tables(self):
         """
         Creates the 'tasks' table in the database if it doesn't already exist.
-        Defines the columns for task details.
+        Defines the columns for task details, then brings older database files up to date (see migrate).
         """
         # Use 'with self.connection' to automatically handle transactions (commit/rollback).
         with self.connection:
@@ -42,8 +403,83 @@ class DatabaseManager:
                 )
                 """
             )
-            # We could add indexes here later if performance becomes an issue.
-            # Example: self.connection.execute("CREATE INDEX IF NOT EXISTS idx_task_datetime ON tasks (date, time);")
+            # Remembers which reminders were already emailed, so they are sent only once.
+            # A reminder is identified by the task and the due date/time it was sent for,
+            # so moving the task to another date/time makes it eligible again.
+            self.connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS reminder_deliveries (
+                    task_id INTEGER NOT NULL,                -- tasks.id
+                    date DATE NOT NULL,                      -- Due date the reminder was for
+                    time TEXT NOT NULL,                      -- Due time the reminder was for
+                    sent_at TEXT NOT NULL,                   -- When the email went out
+                    PRIMARY KEY (task_id, date, time)
+                )
+                """
+            )
+        # Indexes and later schema changes
+        self.migrate()
+
+    def migrate(self):
+        """
+        Applies the SCHEMA_MIGRATIONS steps this database file hasn't had yet.
+        Every step runs in its own transaction together with the user_version update,
+        so running this again (or after a crash) never applies a step twice.
+        Returns:
+            int: The schema version of the database afterwards.
+        """
+        version = self.connection.execute("PRAGMA user_version").fetchone()[0]
+        for number, step in enumerate(SCHEMA_MIGRATIONS[version:], start=version + 1):
+            with self.connection:
+                self.connection.execute("BEGIN") # DDL doesn't start a transaction on its own
+                if callable(step):
+                    step(self.connection) # Steps that need more than plain SQL
+                else:
+                    for statement in step:
+                        self.connection.execute(statement)
+                # PRAGMA doesn't accept placeholders; number is always an int here
+                self.connection.execute(f"PRAGMA user_version = {int(number)}")
+            version = number
+        # Step 3 counts as done even if this SQLite had no FTS5 at the time (the later steps
+        # mustn't wait for it), so check for the search index itself and create it if we can now
+        if version >= 3 and not self.connection.execute(
+            "SELECT 1 FROM sqlite_master WHERE type='table' AND name='tasks_fts'"
+        ).fetchone():
+            with self.connection:
+                self.connection.execute("BEGIN")
+                _add_search_index(self.connection)
+        return version
+
+    def explain_query_plan(self, query, params=()):
+        """
+        Asks SQLite how it would run a query (without running it).
+        Args:
+            query (str): The SQL query.
+            params (tuple): Values for the query's placeholders.
+        Returns:
+            list[str]: One line per step of the plan, e.g. "SEARCH tasks USING INDEX ...".
+        """
+        with self._reading() as statements:
+            cursor = statements.connection.execute("EXPLAIN QUERY PLAN " + query, params)
+            return [row[3] for row in cursor.fetchall()] # Column 3 is the readable description
+
+    def check_query_plans(self):
+        """
+        Self-check that the hot queries (HOT_QUERIES) use their indexes and don't sort in a temp table.
+        Returns:
+            dict: name -> (ok, plan lines), ok is True if the query searches the expected index.
+        """
+        results = {}
+        for name, (query, params, expected_index) in HOT_QUERIES.items():
+            plan = self.explain_query_plan(query, params)
+            plan_text = "\n".join(plan)
+            ok = "TEMP B-TREE" not in plan_text # Sorting in a temp table means the index didn't help
+            if expected_index is not None:
+                ok = ok and expected_index in plan_text
+                # A SCAN step reads the whole table or index, even if it's the right index
+                ok = ok and not any(line.startswith("SCAN") for line in plan)
+            results[name] = (ok, plan)
+        return results
 
     def insert_task(self, task):
         """
@@ -55,23 +491,22 @@ class DatabaseManager:
         """
         # Ensure time is None if date is None before inserting.
         task_time = task.due_time if task.due_date else None
-        with self.connection:
+        with self._writing() as statements:
              try:
-                cursor = self.connection.execute(
-                    """
-                    INSERT INTO tasks (description, note, date, time, email)
-                    VALUES (?, ?, ?, ?, ?) -- Use placeholders to prevent SQL injection
-                    """,
+                cursor = statements.execute(
+                    "insert_task",
                     # Provide the values from the task object in the correct order
-                    (task.desc, task.note, task.due_date, task_time, task.email),
+                    (task.desc, task.note, task.due_date, task_time, task.email, task.recurrence),
                 )
                 # After inserting, get the automatically generated ID and set it on the task object.
                 task.set_id(cursor.lastrowid)
-                return True # Success!
              except sql.IntegrityError:
                  # This happens if the description isn't unique (due to UNIQUE constraint).
                  print(f"Database Error: Task description '{task.desc}' already exists.")
                  return False # Failed.
+        # Saved: a new task is usually opened right away, so cache it (new tasks are pending)
+        self.task_cache.put((task.desc, task.note, task.due_date, task_time, task.email, task.id, 0, task.recurrence))
+        return True # Success!
 
     def delete_task(self, task_id):
         """
@@ -79,15 +514,13 @@ class DatabaseManager:
         Args:
             task_id (int): The ID of the task to delete.
         """
-        with self.connection:
-            self.connection.execute(
-                """
-                DELETE FROM tasks WHERE id=?
-                """,
-                (task_id,), # Pass task_id as a tuple
-            )
+        with self._writing() as statements:
+            statements.execute("delete_task", (task_id,)) # Pass task_id as a tuple
+            # Its reminder history isn't needed any more
+            statements.execute("forget_reminders", (task_id,))
+        self.task_cache.invalidate([task_id])
 
-    def update_task(self, task_id, task_desc, task_note, task_due_date, task_due_time, task_email):
+    def update_task(self, task_id, task_desc, task_note, task_due_date, task_due_time, task_email, task_recurrence=None):
         """
         Updates an existing task in the database based on its ID.
         Args:
@@ -97,25 +530,34 @@ class DatabaseManager:
             task_due_date (str or None): The new due date (YYYY-MM-DD).
             task_due_time (str or None): The new due time (HH:MM).
             task_email (str or None): The new email.
+            task_recurrence (str or None): The new repeat rule (None = doesn't repeat).
         Returns:
             bool: True if update was successful, False otherwise (e.g., duplicate description).
         """
         # Ensure time is None if date is None before updating.
         actual_due_time = task_due_time if task_due_date else None
-        with self.connection:
+        recurrence = task_recurrence if task_due_date else None
+        with self._writing() as statements:
             try:
-                self.connection.execute(
-                    """
-                    UPDATE tasks
-                    SET description=?, note=?, date=?, time=?, email=? -- Columns to update
-                    WHERE id=? -- Condition to find the right task
-                    """,
-                    (task_desc, task_note, task_due_date, actual_due_time, task_email, task_id),
+                statements.execute(
+                    "update_task",
+                    (task_desc, task_note, task_due_date, actual_due_time, task_email, recurrence, task_id),
                 )
-                return True # Success!
+                # If the date or time changed, the reminder for the old due time no longer
+                # counts, so the task can get a reminder for its new due time.
+                # A repeating task keeps the reminders of its coming occurrences (they were
+                # really sent); only those before its current occurrence are dropped.
+                if recurrence:
+                    statements.execute("forget_past_reminders", (task_id, task_due_date))
+                else:
+                    statements.execute("forget_moved_reminders", (task_id, task_due_date, actual_due_time))
             except sql.IntegrityError:
                  print(f"Database Error: Task description '{task_desc}' already exists.")
                  return False # Failed.
+        # Only the edited columns change, the cached status stays as it is
+        self.task_cache.update(task_id, {0: task_desc, 1: task_note, 2: task_due_date, 3: actual_due_time, 4: task_email,
+                                         7: recurrence})
+        return True # Success!
 
     def update_status(self, task_id):
         """
@@ -123,15 +565,121 @@ class DatabaseManager:
         Args:
             task_id (int): The ID of the task to mark as done.
         """
-        with self.connection:
-            self.connection.execute(
-                """
-                UPDATE tasks
-                SET status=? -- Set status to 1 (Done)
-                WHERE id=?
-                """,
-                (1, task_id), # Pass 1 for status, then the task_id
-            )
+        with self._writing() as statements:
+            statements.execute("update_status", (task_id,))
+        self.task_cache.update(task_id, {6: 1})
+
+    def advance_task(self, task):
+        """
+        Moves a repeating task on to another occurrence (instead of marking it as done).
+        Reminders sent for the occurrences before it are forgotten; the ones already sent
+        for it (or later ones) are kept, so they aren't sent twice.
+        Args:
+            task (Task): The occurrence, e.g. from recurrence.next_occurrence() (same ID as the task).
+        """
+        with self._writing() as statements:
+            statements.execute("advance_task", (task.due_date, task.due_time, task.recurrence, task.id))
+            statements.execute("forget_past_reminders", (task.id, task.due_date))
+        self.task_cache.update(task.id, {2: task.due_date, 3: task.due_time, 7: task.recurrence})
+
+    # --- Bulk changes ---
+    # Each of these runs in ONE transaction, so a batch of 100,000 rows costs one commit
+    # instead of 100,000. They don't print anything per row; the caller gets the conflicts back.
+
+    def insert_tasks(self, tasks):
+        """
+        Inserts many tasks in a single transaction. Unlike insert_task(), the status is saved
+        too (so finished tasks can be imported as finished).
+        Tasks whose description already exists (in the database or earlier in the same batch)
+        are skipped, the others are still inserted.
+        Args:
+            tasks (iterable[Task]): The tasks to insert (any iterable, e.g. a generator).
+        Returns:
+            list[Task]: The tasks that were NOT inserted because of a duplicate description.
+                        Every inserted task gets its new ID set, like with insert_task().
+        """
+        conflicts = []
+        with self._writing() as statements:
+            for task in tasks:
+                task_time = task.due_time if task.due_date else None
+                try:
+                    # One statement per row (not executemany) because every row needs its own
+                    # ID back and its own duplicate check. A failed INSERT only undoes itself,
+                    # the transaction carries on with the next row.
+                    # (The statement is prepared once and reused for every row.)
+                    cursor = statements.execute(
+                        "insert_task_with_status",
+                        (task.desc, task.note, task.due_date, task_time, task.email, task.status, task.recurrence),
+                    )
+                except sql.IntegrityError:
+                    conflicts.append(task)
+                    continue
+                task.set_id(cursor.lastrowid)
+        return conflicts
+
+    def update_tasks(self, tasks):
+        """
+        Saves the changed description, note, due date/time and email of many tasks
+        in a single transaction.
+        Args:
+            tasks (iterable[Task]): The changed tasks (with their IDs set).
+        Returns:
+            list[Task]: The tasks that were NOT updated because their new description
+                        belongs to another task.
+        """
+        conflicts = []
+        updated = [] # (id, date, time) of the tasks that were saved, for the reminder history
+        repeating = [] # (id, date) of the saved repeating tasks, for the reminder history
+        saved = []   # The tasks that were saved, for the task cache
+        with self._writing() as statements:
+            for task in tasks:
+                task_time = task.due_time if task.due_date else None
+                try:
+                    statements.execute(
+                        "update_task",
+                        (task.desc, task.note, task.due_date, task_time, task.email, task.recurrence, task.id),
+                    )
+                except sql.IntegrityError:
+                    conflicts.append(task)
+                    continue
+                if task.recurrence and task.due_date:
+                    repeating.append((task.id, task.due_date))
+                else:
+                    updated.append((task.id, task.due_date, task_time))
+                saved.append(task)
+            # Same as update_task(): reminders sent for an old due date/time no longer count
+            # (for repeating tasks: those of occurrences before the current one)
+            statements.executemany("forget_moved_reminders", updated)
+            statements.executemany("forget_past_reminders", repeating)
+        for task in saved:
+            self.task_cache.update(task.id, {0: task.desc, 1: task.note, 2: task.due_date,
+                                             3: task.due_time if task.due_date else None, 4: task.email,
+                                             7: task.recurrence})
+        return conflicts
+
+    def delete_tasks(self, task_ids):
+        """
+        Deletes many tasks (and their reminder history) in a single transaction.
+        Args:
+            task_ids (iterable[int]): The IDs of the tasks to delete.
+        """
+        rows = [(task_id,) for task_id in task_ids]
+        with self._writing() as statements:
+            statements.executemany("delete_task", rows)
+            statements.executemany("forget_reminders", rows)
+        self.task_cache.invalidate(task_id for (task_id,) in rows)
+
+    def mark_done(self, task_ids):
+        """
+        Marks many tasks as 'Done' (status 1) in a single transaction.
+        Args:
+            task_ids (iterable[int]): The IDs of the tasks to mark as done.
+        """
+        task_ids = list(task_ids) # Needed twice (the caller may pass a generator)
+        with self._writing() as statements:
+            statements.executemany("update_status", ((task_id,) for task_id in task_ids))
+        for task_id in task_ids:
+            self.task_cache.update(task_id, {6: 1})
 
     def get_all_tasks(self):
         """
@@ -139,38 +687,194 @@ class DatabaseManager:
         Returns:
             list[Task]: A list of Task objects representing all tasks found.
         """
-        with self.connection:
-            # Select all the columns needed to reconstruct a Task object
-            cursor = self.connection.execute(
-                "SELECT description, note, date, time, email, id, status FROM tasks"
-            )
+        with self._reading() as statements:
+            # Select all the columns needed to reconstruct a Task object, already in list order
+            # (tasks with date and time first, by due time; then the others by ID).
             # Use a list comprehension to create a Task object for each row fetched.
             # The '*' unpacks the row tuple into arguments for the Task constructor.
-            tasks = [Task(*row) for row in cursor.fetchall()]
+            # Iterating the cursor (instead of fetchall) means the rows don't all sit in memory
+            # next to the finished Task objects.
+            tasks = [Task(*row) for row in statements.execute("list_dated")]
+            tasks += [Task(*row) for row in statements.execute("list_undated")]
             return tasks
 
+    def iter_tasks(self):
+        """
+        Goes through all tasks in list order without loading them all at once,
+        e.g. for exporting. The rows are read from the cursor as they are needed.
+        Yields:
+            Task: One task at a time.
+        """
+        with self._reading() as statements:
+            for name in ("list_dated", "list_undated"):
+                # Its own cursor: the caller may run other queries between two tasks
+                for row in statements.iterate(name):
+                    yield Task(*row)
+
+    def get_tasks_page(self, after=None, limit=200, status=None, date_from=None, date_to=None):
+        """
+        Retrieves one page of tasks, in the same order as get_all_tasks()
+        (with date and time first, by due time; then the others by ID).
+        Args:
+            after (tuple, optional): page_cursor() of the last task of the previous page.
+                                     None for the first page.
+            limit (int): Max. number of tasks to return.
+            status (int, optional): Only tasks with this status (0=Pending, 1=Done).
+            date_from (str, optional): Only tasks due on or after this date (YYYY-MM-DD).
+            date_to (str, optional): Only tasks due on or before this date (YYYY-MM-DD).
+        Returns:
+            list[Task]: Up to limit tasks. Fewer than limit means there are no more pages.
+        """
+        # Build the optional filter conditions (only ever from these fixed snippets)
+        filters, filter_params = "", []
+        if status is not None:
+            filters += " AND status = ?"
+            filter_params.append(status)
+        if date_from is not None:
+            filters += " AND date >= ?"
+            filter_params.append(date_from)
+        if date_to is not None:
+            filters += " AND date <= ?"
+            filter_params.append(date_to)
+
+        rows = []
+        generation = self.task_cache.generation # Taken before reading, see TaskCache.put_rows()
+        with self._reading() as statements:
+            after_date, after_time, after_id = after if after else (None, None, None)
+            # Part 1: tasks with date and time (skipped if the last page already got past them)
+            if after is None or after_time is not None:
+                if after is None:
+                    name, query = "page_dated_first", page_statement(SQL_PAGE_DATED_FIRST, filters)
+                    params = [*filter_params, limit]
+                else:
+                    name, query = "page_dated_after", page_statement(SQL_PAGE_DATED_AFTER, filters)
+                    params = [after_date, after_time, after_id, *filter_params, limit]
+                rows = statements.execute(name, params, sql=query).fetchall()
+                after_id = 0 # If this page reaches part 2, it starts at its beginning
+            # Part 2: the rest, by ID (only if part 1 didn't fill the page)
+            if len(rows) < limit:
+                query = page_statement(SQL_PAGE_UNDATED_AFTER, filters)
+                params = [after_id, *filter_params, limit - len(rows)]
+                rows += statements.execute("page_undated_after", params, sql=query).fetchall()
+        # These are the tasks the user is about to see (and maybe open), so cache them
+        self.task_cache.put_rows(rows, generation)
+        return [Task(*row) for row in rows]
+
+    @staticmethod
+    def page_cursor(task):
+        """
+        The position of a task in the list order, for get_tasks_page(after=...).
+        Args:
+            task (Task): The last task of a page.
+        Returns:
+            tuple: (due_date, due_time, id).
+        """
+        return (task.due_date, task.due_time, task.id)
+
+    def search(self, query, limit=50):
+        """
+        Finds tasks whose description or note contains all words of the query, best matches
+        first (see SQL_SEARCH). The last word may be unfinished ("meet" finds "meeting"),
+        so it can be called while the user is typing.
+        Args:
+            query (str): The words to look for (plain text, no special syntax).
+            limit (int): The maximum number of results.
+        Returns:
+            list[Task]: The matching tasks, best match first (empty if the query has no words).
+        """
+        words = query.split()
+        if not words:
+            return []
+        generation = self.task_cache.generation # Taken before reading, see TaskCache.put_rows()
+        with self._reading() as statements:
+            if self.has_search_index:
+                cursor = statements.execute("search", (fts_query(words), limit))
+            else:
+                # Escape LIKE's own wildcards, then look for the whole text anywhere
+                pattern = "%" + " ".join(words).replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+                cursor = statements.execute("search_like", (pattern, pattern, pattern, limit))
+            rows = cursor.fetchall()
+        self.task_cache.put_rows(rows, generation)
+        return [Task(*row) for row in rows]
+
     def get_task_by_id(self, task_id):
         """
-        Retrieves a single task from the database based on its unique ID.
+        Retrieves a single task based on its unique ID.
+        Tasks from the task cache cost no query; the others are read and then cached.
         Args:
             task_id (int): The ID of the task to retrieve.
         Returns:
             Task or None: The Task object if found, otherwise None.
         """
-        with self.connection:
-            cursor = self.connection.execute(
-                # Select all necessary columns
-                "SELECT description, note, date, time, email, id, status FROM tasks WHERE id=?",
+        task_data = self.task_cache.get(task_id)
+        if task_data:
+            return Task(*task_data) # A new object every time, callers may change it
+        generation = self.task_cache.generation
+        with self._reading() as statements:
+            cursor = statements.execute(
+                "task_by_id", # Select all necessary columns
                 (task_id,), # Pass ID as a tuple
             )
             task_data = cursor.fetchone() # Get the first (and only) result row
-            if task_data:
-                # If data was found, create a Task object from it
-                task = Task(*task_data)
-                return task
-            else:
-                # If no task with that ID was found
-                return None
+        if task_data:
+            # If data was found, remember it and create a Task object from it
+            self.task_cache.put_rows([task_data], generation)
+            task = Task(*task_data)
+            return task
+        else:
+            # If no task with that ID was found
+            return None
+
+    def peek_task(self, task_id):
+        """
+        Looks a task up in the task cache only (never touches the database), e.g. to decide
+        on the UI thread whether opening it needs a background query.
+        Args:
+            task_id (int): The ID of the task.
+        Returns:
+            Task or None: The task if it is cached, otherwise None.
+        """
+        # A miss isn't counted here: it's followed by get_task_by_id(), which counts it
+        task_data = self.task_cache.get(task_id, count_miss=False)
+        return Task(*task_data) if task_data else None
+
+    def cache_stats(self):
+        """
+        Returns:
+            dict: The task cache's hits, misses, hit_rate, evictions, size and capacity.
+        """
+        return self.task_cache.stats()
+
+    def statement_stats(self):
+        """
+        How often each registered statement ran and how often it had to be prepared
+        (a statement cache miss), summed over the writer and all reader connections.
+        Returns:
+            dict: statement name -> {"executions", "misses"}.
+        """
+        with self._readers_lock:
+            caches = [self.statements] + list(self._all_readers)
+        totals = {}
+        for cache in caches:
+            for name, counts in cache.stats().items():
+                total = totals.setdefault(name, {"executions": 0, "misses": 0})
+                total["executions"] += counts["executions"]
+                total["misses"] += counts["misses"]
+        return totals
+
+    def description_exists(self, desc, exclude_id=None):
+        """
+        Checks if another task already uses this description (ignoring upper/lower case
+        and surrounding spaces). A single indexed lookup, no matter how many tasks there are.
+        Args:
+            desc (str): The description to look for.
+            exclude_id (int, optional): ID of a task to ignore (the one being edited).
+        Returns:
+            bool: True if another task has this description, False otherwise.
+        """
+        with self._reading() as statements:
+            cursor = statements.execute("description_exists", (desc.strip(), exclude_id))
+            return cursor.fetchone() is not None
 
     def is_task_date_null(self, task_id):
         """
@@ -181,10 +885,8 @@ class DatabaseManager:
         Returns:
             bool: True if the date is NULL, False otherwise.
         """
-        with self.connection:
-            cursor = self.connection.execute(
-                "SELECT date FROM tasks WHERE id=?", (task_id,)
-            )
+        with self._reading() as statements:
+            cursor = statements.execute("task_date", (task_id,))
             result = cursor.fetchone()
             # Check if fetchone returned None (no task) or if the first column (date) is None
             return result is None or result[0] is None
@@ -192,36 +894,93 @@ class DatabaseManager:
     def get_tasks_for_reminder(self):
         """
         Retrieves tasks that are candidates for email reminders.
-        Conditions: Date, Time, and Email must not be NULL or empty, and Status must be 0 (Pending).
+        Conditions: Date, Time, and Email must not be NULL or empty, Status must be 0 (Pending),
+        and no reminder may have been sent yet for the task's current due date/time.
+        Repeating tasks are always returned (as they are stored, i.e. at their current occurrence);
+        which of their occurrences still needs a reminder is up to the caller (see TaskService).
         Returns:
             list[Task]: A list of Task objects eligible for reminders.
         """
-        with self.connection:
-            cursor = self.connection.execute(
-                """
-                SELECT description, note, date, time, email, id, status
-                FROM tasks
-                WHERE date IS NOT NULL AND time IS NOT NULL -- Must have date and time
-                      AND email IS NOT NULL AND email != '' -- Must have a non-empty email
-                      AND status = 0 -- Must be pending (not done)
-                """
-            )
-            # Create Task objects from the results
-            tasks = [Task(*row) for row in cursor.fetchall()]
+        with self._reading() as statements:
+            cursor = statements.execute("reminder_candidates")
+            # Create Task objects from the results, row by row
+            tasks = [Task(*row) for row in cursor]
             return tasks
 
+    def mark_reminder_sent(self, task):
+        """
+        Records that the reminder for a task's current due date/time was emailed,
+        so get_tasks_for_reminder() won't return it again.
+        Args:
+            task (Task): The task the reminder was sent for.
+        """
+        with self._writing() as statements:
+            statements.execute("mark_reminder_sent", (task.id, task.due_date, task.due_time))
+
+    def is_reminder_sent(self, task):
+        """
+        Checks if the reminder for a task's current due date/time was already emailed.
+        Args:
+            task (Task): The task to check.
+        Returns:
+            bool: True if it was sent, False otherwise.
+        """
+        with self._reading() as statements:
+            cursor = statements.execute("is_reminder_sent", (task.id, task.due_date, task.due_time))
+            return cursor.fetchone() is not None
+
+    def get_sent_occurrences(self, task=None):
+        """
+        Finds the occurrences of repeating tasks whose reminder was already emailed, from each
+        task's current occurrence on (earlier ones are forgotten when the task moves on).
+        One query, instead of one is_reminder_sent() per occurrence.
+        Args:
+            task (Task, optional): Only this task (by default: every pending repeating task).
+        Returns:
+            dict: task_id -> set of (date, time) of the occurrences that were reminded about.
+        """
+        with self._reading() as statements:
+            if task is None:
+                cursor = statements.execute("all_sent_occurrences")
+            else:
+                cursor = statements.execute("sent_occurrences", (task.id, task.due_date))
+            sent = {}
+            for task_id, sent_date, sent_time in cursor:
+                sent.setdefault(task_id, set()).add((sent_date, sent_time))
+            return sent
+
     def clear_tasks_table(self):
         """
         Deletes ALL rows from the tasks table. Use with caution!
         Good for resetting the database during development.
         """
-        with self.connection:
-            self.connection.execute("DELETE FROM tasks")
+        with self._writing() as statements:
+            statements.execute("clear_tasks")
+            statements.execute("clear_reminders")
+        self.task_cache.invalidate()
 
     def close(self):
         """
-        Closes the database connection. Should be called when the app exits.
+        Closes the database connections. Should be called when the app exits.
         """
+        with self._readers_lock:
+            for reader in self._all_readers:
+                reader.connection.close()
+            self._all_readers = []
         if self.connection:
-            self.connection.close()
-            print("Database connection closed.") # Confirmation message
\ No newline at end of file
+            with self._write_lock: # Let a running write finish first
+                self.connection.close()
+            print("Database connection closed.") # Confirmation message
+
+
+# --- Index Self-Check ---
+# Run "python database_manager.py [task_database.db]" to check the hot queries' plans.
+if __name__ == "__main__":
+    import sys
+    db_manager = DatabaseManager(sys.argv[1] if len(sys.argv) > 1 else ":memory:")
+    all_ok = True
+    for name, (ok, plan) in db_manager.check_query_plans().items():
+        all_ok = all_ok and ok
+        print(f"{'OK  ' if ok else 'FAIL'} {name}: {' | '.join(plan)}")
+    db_manager.close()
+    sys.exit(0 if all_ok else 1)
@@ -2,10 +2,27 @@
 # This file makes the 'frames' directory act as a Python package.
 # It allows us to easily import the frame classes using 'from frames import ...'
 
-# Import the frame classes to make them available directly when importing 'frames'
-from frames.tasks import Tasks
-from frames.add_edit import AddEdit
-from frames.info import Info
+import importlib # To import a frame's module when it's first asked for
 
-# You could define an __all__ variable here to control what '*' imports, but it's not strictly necessary for this project.
-# __all__ = ["Tasks", "AddEdit", "Info"]
\ No newline at end of file
+# Where each frame class lives. The modules aren't imported up front: a frame's module is
+# only loaded when the class is first used (through __getattr__ below), so starting the app
+# doesn't load e.g. tkcalendar for the Add/Edit screen before the window is shown.
+_FRAME_MODULES = {
+    "Tasks": "frames.tasks",
+    "AddEdit": "frames.add_edit",
+    "Info": "frames.info",
+}
+
+__all__ = list(_FRAME_MODULES)
+
+def __getattr__(name):
+    """
+    Called by Python for 'frames.<name>' (and 'from frames import <name>') when the name
+    isn't defined yet: imports the module of that frame class and returns the class.
+    """
+    module_name = _FRAME_MODULES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module 'frames' has no attribute '{name}'")
+    frame_class = getattr(importlib.import_module(module_name), name)
+    globals()[name] = frame_class # Found directly next time, without calling __getattr__
+    return frame_class
@@ -6,21 +6,21 @@ from tkinter import ttk
 from tkinter import messagebox
 from tkcalendar import Calendar # Using tkcalendar for the date picker
 from datetime import date, datetime # Need date/datetime for calendar and formatting
-import re # Using regex for basic email validation
-from task import Task # Need the Task class
+from task_service import TaskError # Raised when the task service refuses to save
+from recurrence import PRESETS # The repeat choices offered in the dropdown
 from tkinter import font # For setting custom fonts
 
 class AddEdit(ttk.Frame):
     """
     The Frame class for the Add/Edit screen. Contains input fields
-    for task details (description, note, date, time, email).
+    for task details (description, note, date, time, email, repeat).
     """
     def __init__(self, parent, controller, show_tasks_frame):
         """
         Sets up the Add/Edit frame.
         Args:
             parent: The parent widget (usually the main container).
-            controller: The main App class instance (to access shared data/methods like db_manager).
+            controller: The main App class instance (to access shared data and the task service).
             show_tasks_frame: A function to call to switch back to the main Tasks frame.
         """
         super().__init__(parent)
@@ -45,6 +45,7 @@ class AddEdit(ttk.Frame):
         # These variables link the input fields to Python variables.
         self.task_desc = tk.StringVar()     # For task description entry
         self.task_email = tk.StringVar()    # For email entry
+        self.task_recurrence = tk.StringVar() # For the repeat dropdown ("" = doesn't repeat)
         self.is_date_checked = tk.IntVar()  # Tracks if 'Set date' checkbox is checked (0 or 1)
         self.is_time_checked = tk.IntVar()  # Tracks if 'Set time' checkbox is checked (0 or 1)
         self.hour_var = tk.StringVar(value="00")   # Variable for the hour spinbox
@@ -153,6 +154,18 @@ class AddEdit(ttk.Frame):
         )
         self.task_email_input.grid(row=3, column=1, sticky="ew", padx=10, pady=5)
 
+        # --- Repeat Section ---
+        # Pick a preset (Daily, Weekdays, ...) or type a rule like "FREQ=MONTHLY;BYDAY=-1FR"
+        # (last Friday of every month). Needs a due date, which is the first occurrence.
+        ttk.Label(
+            main_container, text="Repeat:", style="LightText_first.TLabel", font=label_font
+        ).grid(row=4, column=0, sticky="w", padx=10, pady=10)
+        self.task_recurrence_input = ttk.Combobox(
+            main_container, textvariable=self.task_recurrence, values=[""] + list(PRESETS),
+            width=38, font=entry_font
+        )
+        self.task_recurrence_input.grid(row=4, column=1, sticky="ew", padx=10, pady=5)
+
         # --- Buttons ---
         # Container for Cancel and Save buttons
         button_container = ttk.Frame(self, padding=10, style="container.TFrame")
@@ -282,14 +295,13 @@ class AddEdit(ttk.Frame):
 
     def validate_inputs(self):
         """
-        Performs final validation checks before saving the task.
-        Checks description (required, unique), email format (basic),
-        and ensures time isn't set without a date.
+        Checks the input widgets before saving the task: description entered,
+        time not set without a date, valid hour/minute values.
+        (The task service checks the rest, like email format and unique descriptions, when saving.)
         Returns:
             bool: True if all checks pass, False otherwise (shows messagebox).
         """
         description = self.task_desc.get().strip()
-        email_str = self.task_email.get().strip()
 
         # 1. Check if description is empty
         if not description:
@@ -313,24 +325,6 @@ class AddEdit(ttk.Frame):
                   messagebox.showerror("Input Error", "Hour and minute must be numeric.")
                   return False
 
-
-        # 3. Check email format (simple check for '@' and '.')
-        if email_str and not re.fullmatch(r"[^@]+@[^@]+\.[^@]+", email_str):
-             messagebox.showerror("Input Error", "Invalid email format.")
-             return False
-
-        # 4. Check if description is unique (using controller method)
-        is_editing = self.controller.add_or_edit.get() == "Edit Task"
-        original_desc = self.controller.selected_task_desc.get() if is_editing else None
-        # Pass current task ID if editing, so it doesn't compare against itself
-        current_task_id = self.controller.selected_task_id.get() if is_editing else None
-
-        # Only check uniqueness if the description has actually changed or it's a new task
-        if description != original_desc:
-             if not self.controller.is_desc_unique(description, current_task_id):
-                 messagebox.showerror("Input Error", f"Task description '{description}' already exists.")
-                 return False
-
         # All checks passed!
         return True
 
@@ -380,34 +374,32 @@ class AddEdit(ttk.Frame):
 
         # Get email (or None if empty)
         email = self.task_email.get().strip() if self.task_email.get().strip() else None
+        # Get the repeat rule (or None if the task doesn't repeat)
+        recurrence = self.task_recurrence.get().strip() or None
 
         # Check if we are editing an existing task or adding a new one
         is_editing = self.controller.add_or_edit.get() == "Edit Task"
-        success = False # Flag to track if DB operation worked
-
-        if is_editing:
-            # Get the ID of the task being edited
-            task_id = self.controller.selected_task_id.get()
-            # Call the database manager's update method
-            success = self.controller.db_manager.update_task(
-                task_id, desc, note, due_date_str_for_db, due_time, email
-            )
-        else: # Adding a new task
-            # Create a new Task object with the details
-            new_task = Task(desc, note, due_date_str_for_db, due_time, email)
-            # Call the database manager's insert method
-            success = self.controller.db_manager.insert_task(new_task)
-
-        # If the database operation was successful...
-        if success:
-            # ...refresh the task list in the main frame...
-            task_list = self.controller.db_manager.get_all_tasks()
-            self.controller.fill_listbox(task_list)
-            # ...switch back to the main tasks frame...
-            self.show_tasks_frame()
-            # ...and clear the input fields in this frame.
-            self.clear_frame()
-        # else: An error message was likely shown by validate_inputs or db_manager
+        task_service = self.controller.task_service
+
+        try:
+            # The service validates the task, saves it and puts it at its place in the
+            # task list (which also updates its reminder)
+            if is_editing:
+                task_service.update_task(
+                    self.controller.selected_task_id.get(), desc, note, due_date_str_for_db, due_time, email,
+                    recurrence
+                )
+            else:
+                task_service.add_task(desc, note, due_date_str_for_db, due_time, email, recurrence)
+        except TaskError as e:
+            # E.g. the description is already taken or the email is invalid
+            messagebox.showerror("Input Error", str(e))
+            return
+
+        # Saved! Switch back to the main tasks frame...
+        self.show_tasks_frame()
+        # ...and clear the input fields in this frame.
+        self.clear_frame()
 
 
     def clear_frame(self):
@@ -418,6 +410,7 @@ class AddEdit(ttk.Frame):
         self.task_desc.set("") # Clear description entry
         self.task_note_input.delete(1.0, "end") # Clear text area
         self.task_email.set("") # Clear email entry
+        self.task_recurrence.set("") # Doesn't repeat
         self.is_date_checked.set(0) # Uncheck 'Set date'
         self.is_time_checked.set(0) # Uncheck 'Set time'
         self.hour_var.set("00") # Reset hour spinbox
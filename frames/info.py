@@ -107,6 +107,17 @@ class Info(ttk.Frame):
         self.task_email_label.grid(row=row_num, column=1, sticky="new", padx=10, pady=5)
         row_num += 1
 
+        # Repeat Rule Label and Value
+        ttk.Label(main_container, text="Repeats:", style="LightText_first.TLabel", font=label_font).grid(row=row_num, column=0, sticky="nw", padx=10, pady=5)
+        self.task_repeat_label = ttk.Label(
+            main_container,
+            textvariable=controller.selected_task_repeat_str, # Linked variable (e.g. "Every week", "N/A" if it doesn't repeat)
+            style="LightText_second.TLabel", font=value_font,
+            wraplength=450
+        )
+        self.task_repeat_label.grid(row=row_num, column=1, sticky="new", padx=10, pady=5)
+        row_num += 1
+
         # Separator line
         ttk.Separator(main_container, orient="horizontal").grid(row=row_num, column=0, columnspan=2, sticky="ew", pady=5)
         row_num += 1
@@ -4,6 +4,213 @@
 import tkinter as tk
 from tkinter import ttk
 from tkinter import font # For setting custom fonts
+from recurrence import describe_rule # "Every week" etc. (cached per rule, so cheap per row)
+
+SEARCH_DELAY_MS = 250     # Wait this long after the last keystroke before searching
+SEARCH_RESULT_LIMIT = 200 # Max. number of search results shown
+
+class VirtualListbox(ttk.Frame):
+    """
+    A Listbox with a scrollbar that can show a very long list of items quickly.
+    The whole (sorted) list stays in memory, but only the rows that fit on screen
+    are ever inserted into the Tk Listbox; scrolling just swaps those few rows.
+    Keeps the scroll position and the selected item when the list is replaced.
+    """
+    def __init__(self, parent, format_item, item_colour=None, item_key=None, visible_rows=15, on_near_end=None,
+                 **listbox_options):
+        """
+        Sets up the list.
+        Args:
+            parent: The parent widget.
+            format_item: Function that returns the display text for an item.
+            item_colour: Optional function that returns the text colour for an item.
+            item_key: Optional function that returns a unique key for an item (used to keep the
+                      selection when the list changes). Defaults to the item itself.
+            visible_rows (int): How many rows are visible (the Listbox height).
+            on_near_end: Optional function called when the user scrolls to within a screen of the
+                         end of the list (to load more items, which then calls items_changed()).
+            **listbox_options: Passed on to tk.Listbox (font, colours...).
+        """
+        super().__init__(parent)
+
+        self.format_item = format_item
+        self.item_colour = item_colour
+        self.item_key = item_key or (lambda item: item)
+        self.visible_rows = visible_rows
+        self.on_near_end = on_near_end
+        self._near_end_pending = False # An on_near_end call is already scheduled
+
+        self.items = []            # The full list of items (only a window of it is shown)
+        self.offset = 0            # Index (in self.items) of the first visible row
+        self._selected_key = None  # Key of the selected item, survives scrolling and updates
+
+        # Vertical scrollbar, driven by us instead of by the Listbox
+        self.scrollbar = tk.Scrollbar(self, orient="vertical", command=self._on_scrollbar)
+
+        # The actual Listbox, which never holds more than visible_rows rows
+        self.listbox = tk.Listbox(self, height=visible_rows, **listbox_options)
+        self.listbox.grid(row=0, column=0, sticky="nsew")
+        self.scrollbar.grid(row=0, column=1, sticky="ns") # Place scrollbar to the right, fill vertically
+
+        # Scrolling with the mouse wheel (Windows/macOS send <MouseWheel>, X11 sends buttons 4/5)
+        self.listbox.bind("<MouseWheel>", lambda event: self._scroll_by(-1 if event.delta > 0 else 1))
+        self.listbox.bind("<Button-4>", lambda event: self._scroll_by(-1))
+        self.listbox.bind("<Button-5>", lambda event: self._scroll_by(1))
+        # Arrow keys move the selection and scroll when it reaches the edge
+        self.listbox.bind("<Up>", lambda event: self._move_selection(-1))
+        self.listbox.bind("<Down>", lambda event: self._move_selection(1))
+        # Remember which item was clicked
+        self.listbox.bind("<<ListboxSelect>>", self._on_select)
+
+    def set_items(self, items):
+        """
+        Replaces the list of items (already sorted) and redraws the visible rows.
+        The scroll position and the selection are kept if possible.
+        Args:
+            items (list): The items to show.
+        """
+        self.items = items
+        self._render()
+
+    def items_changed(self, old_index=None, new_index=None):
+        """
+        Tells the list that one item of self.items was changed in place (the list object
+        is shared with whoever owns it). Only the visible rows are redrawn, and the scroll
+        position is moved along so the same items stay on screen.
+        Args:
+            old_index (int, optional): Where the item was before (None if it was inserted).
+            new_index (int, optional): Where the item is now (None if it was removed).
+        """
+        if old_index is not None and old_index < self.offset:
+            self.offset -= 1 # An item above the visible rows went away
+        if new_index is not None and new_index < self.offset:
+            self.offset += 1 # An item appeared above the visible rows
+        self._render()
+
+    def selected_item(self):
+        """
+        Returns:
+            The selected item, or None if nothing is selected.
+        """
+        selection = self.listbox.curselection()
+        if selection:
+            return self.item_at(selection[0])
+        return None
+
+    def item_at(self, visible_index):
+        """
+        Maps a row of the Listbox to its item.
+        Args:
+            visible_index (int): The row number inside the Listbox (0 = top visible row).
+        Returns:
+            The item shown in that row, or None.
+        """
+        index = self.offset + visible_index
+        return self.items[index] if 0 <= index < len(self.items) else None
+
+    def scroll_to(self, index):
+        """
+        Scrolls so that the item at index is the first visible row (as far as possible).
+        Args:
+            index (int): Index into the full list.
+        """
+        self.offset = index
+        self._render()
+
+    def _render(self):
+        # Puts the currently visible slice of the items into the Listbox
+        max_offset = max(0, len(self.items) - self.visible_rows)
+        self.offset = min(max(0, self.offset), max_offset)
+        visible = self.items[self.offset:self.offset + self.visible_rows]
+
+        self.listbox.delete(0, tk.END) # At most visible_rows rows to delete
+        for row, item in enumerate(visible):
+            self.listbox.insert(tk.END, self.format_item(item))
+            if self.item_colour:
+                self.listbox.itemconfig(row, {'fg': self.item_colour(item)})
+            if self._selected_key is not None and self.item_key(item) == self._selected_key:
+                self.listbox.selection_set(row) # Selected item is on screen, highlight it again
+
+        # Tell the scrollbar which part of the whole list is visible
+        total = len(self.items)
+        if total:
+            self.scrollbar.set(self.offset / total, (self.offset + len(visible)) / total)
+        else:
+            self.scrollbar.set(0, 1)
+
+        # Close to the end: ask for more items, once the current event is handled
+        if self.on_near_end and not self._near_end_pending and self.offset + 2 * self.visible_rows >= total:
+            self._near_end_pending = True
+            self.after_idle(self._near_end)
+
+    def _near_end(self):
+        self._near_end_pending = False
+        self.on_near_end()
+
+    def _on_scrollbar(self, action, amount, unit=None):
+        # Called by the scrollbar: ("moveto", fraction) or ("scroll", steps, "units"/"pages")
+        if action == "moveto":
+            self.offset = int(float(amount) * len(self.items))
+            self._render()
+        elif action == "scroll":
+            steps = int(amount)
+            self._scroll_by(steps * self.visible_rows if unit == "pages" else steps)
+
+    def _scroll_by(self, rows):
+        self.offset += rows
+        self._render()
+        return "break" # We did the scrolling, the Listbox doesn't need to
+
+    def _move_selection(self, step):
+        # Moves the selection one row up/down, scrolling the list when it leaves the visible rows
+        if not self.items:
+            return "break"
+        selection = self.listbox.curselection()
+        index = self.offset + selection[0] + step if selection else self.offset
+        index = min(max(index, 0), len(self.items) - 1)
+        # Scroll just enough to keep the newly selected item visible
+        if index < self.offset:
+            self.offset = index
+        elif index >= self.offset + self.visible_rows:
+            self.offset = index - self.visible_rows + 1
+        self._selected_key = self.item_key(self.items[index])
+        self._render()
+        return "break"
+
+    def _on_select(self, event=None):
+        item = self.selected_item()
+        if item is not None:
+            self._selected_key = self.item_key(item)
+
+
+def format_task(task):
+    """
+    The text shown for a task in the list: description, optional date/time, how it repeats
+    and a [Done] marker. A repeating task shows its next occurrence only.
+    Args:
+        task (Task): The task to show.
+    Returns:
+        str: The display text.
+    """
+    display_text = f"{task.desc}"
+    if task.due_date:
+        display_text += f" ({task.due_date}"
+        if task.due_time:
+            display_text += f" {task.due_time}"
+        display_text += ")"
+    if task.recurrence:
+        display_text += f" [{describe_rule(task.recurrence)}]"
+    # Add a marker if the task is done
+    if task.status == 1:
+         display_text += " [Done]"
+    return display_text
+
+
+def task_colour(task):
+    """
+    Text colour for a task in the list: done tasks are greyed out.
+    """
+    return 'grey' if task.status == 1 else "#EEEEEE"
 
 class Tasks(ttk.Frame):
     """
@@ -17,7 +224,8 @@ class Tasks(ttk.Frame):
             parent: The parent widget.
             controller: The main App class instance.
             show_add_frame: Function to switch to the Add/Edit frame (for adding).
-            show_info_frame: Function to switch to the Info frame (when a task is double-clicked).
+            show_info_frame: Function to switch to the Info frame (the controller calls it itself once a
+                             double-clicked task is loaded, see App.show_task_info).
         """
         super().__init__(parent)
 
@@ -36,38 +244,53 @@ class Tasks(ttk.Frame):
         )
         task_manager_label.grid(row=0, column=0, sticky="w", padx=20, pady=20) # Align top-left
 
+        # Search box: the list shows the matching tasks while something is typed in it
+        search_container = ttk.Frame(self, style="container.TFrame")
+        search_container.grid(row=1, column=0, sticky="ew", padx=60)
+        search_container.columnconfigure(1, weight=1) # Entry takes the remaining width
+        ttk.Label(search_container, text="Search:", style="LightText_first.TLabel").grid(
+            row=0, column=0, sticky="w", padx=(0, 10)
+        )
+        self.search_text = tk.StringVar()
+        self.search_input = ttk.Entry(
+            search_container, textvariable=self.search_text, font=font.Font(family="Rockwell", size=14)
+        )
+        self.search_input.grid(row=0, column=1, sticky="ew")
+        self.search_input.bind("<Escape>", lambda event: self.search_text.set("")) # Esc clears the search
+        # Shown while the list (or a search) is being read from the database, see show_loading()
+        self.loading_label = ttk.Label(search_container, text="Loading...", style="LightText_first.TLabel")
+        self._loading_after_id = None
+        self._search_after_id = None # Pending (debounced) search, see schedule_search()
+        self._showing_results = False # True while the list shows search results
+        # Search a moment after the user stops typing, not on every keystroke
+        self.search_text.trace_add("write", lambda *args: self.schedule_search())
+
         # Frame to hold the listbox and its scrollbar
         tasks_frame = ttk.Frame(self, height="100") # Height seems arbitrary here, listbox height more important
-        tasks_frame.grid(row=1, column=0, sticky="nsew", padx=60, pady=10) # Padding around listbox area
+        tasks_frame.grid(row=2, column=0, sticky="nsew", padx=60, pady=10) # Padding around listbox area
 
-        # Vertical scrollbar for the listbox
-        scrollbar = tk.Scrollbar(
-            tasks_frame,
-            orient="vertical",
-        )
-
-        # The Listbox widget to display tasks
-        self.tasks_listbox = tk.Listbox(
+        # The list of tasks (with its own scrollbar). Only the visible rows are ever
+        # put into the Listbox, so it stays fast with any number of tasks.
+        self.tasks_listbox = VirtualListbox(
             tasks_frame,
+            format_item=format_task,  # Text for each task
+            item_colour=task_colour,  # Grey for done tasks
+            item_key=lambda task: task.id, # Keeps the selection when the list changes
+            visible_rows=15,          # Height in number of rows
+            on_near_end=self.load_more_tasks, # Load the next page while scrolling
             width="50", # Width in characters
-            yscrollcommand=scrollbar.set, # Link scrollbar to listbox y-view
             font=listbox_font,
             background="#212A3E", # Dark background
             foreground="#fff",    # Light text
             activestyle="none",    # Don't change appearance of selected item (we handle double-click)
-            height=15,             # Height in number of rows
             borderwidth=0,         # Remove border
             highlightthickness=0   # Remove focus highlight border
         )
         self.tasks_listbox.grid(row=0, column=0, sticky="nsew") # Fill the tasks_frame area
 
-        # Configure the scrollbar to control the listbox's y-view
-        scrollbar.config(command=self.tasks_listbox.yview)
-        scrollbar.grid(row=0, column=1, sticky="ns") # Place scrollbar to the right, fill vertically
-
         # Frame to hold the Add and Exit buttons
         buttons_container = ttk.Frame(self, style="container.TFrame")
-        buttons_container.grid(row=2, column=0, sticky="ew") # Below listbox, expand horizontally
+        buttons_container.grid(row=3, column=0, sticky="ew") # Below listbox, expand horizontally
 
         # Configure button container columns to have equal weight (helps spacing)
         buttons_container.columnconfigure((0, 1), weight=1)
@@ -93,10 +316,10 @@ class Tasks(ttk.Frame):
         self.exit_button.grid(row=0, column=1, sticky="ew", padx=20, pady=20) # Expand E-W
 
         # Bind the Double-Click event (<Double-1>) on the listbox items
-        self.tasks_listbox.bind(
+        self.tasks_listbox.listbox.bind(
             "<Double-1>",
-            # Lambda calls controller's method to load task data, then shows Info frame
-            lambda event: [controller.on_double_click(event), show_info_frame()],
+            # The controller loads the task data in the background, then shows the Info frame
+            lambda event: controller.on_double_click(event),
         )
 
     def change_label_to_add(self):
@@ -104,4 +327,77 @@ class Tasks(ttk.Frame):
         Helper method called before showing the Add/Edit frame for adding.
         It tells the controller to set the title label in that frame to "Add Task".
         """
-        self.controller.add_or_edit.set("Add Task")
\ No newline at end of file
+        self.controller.add_or_edit.set("Add Task")
+
+    def load_more_tasks(self):
+        """
+        Called when the list is scrolled close to its end: loads the next page of tasks
+        (search results are complete already, so nothing is loaded while searching).
+        """
+        if not self._showing_results:
+            self.controller.load_tasks()
+
+    def is_searching(self):
+        """
+        Returns:
+            bool: True if the list shows search results (or is about to).
+        """
+        return (self._showing_results or self._search_after_id is not None
+                or self.controller.background.is_pending("search"))
+
+    def schedule_search(self):
+        """
+        (Re)starts the search timer. Every keystroke pushes the search back by SEARCH_DELAY_MS,
+        so typing a word runs one search instead of one per letter.
+        """
+        if self._search_after_id is not None:
+            self.after_cancel(self._search_after_id)
+        self._search_after_id = self.after(SEARCH_DELAY_MS, self.run_search)
+
+    def run_search(self):
+        """
+        Shows the tasks matching the search box, best match first. With an empty
+        search box, the normal task list comes back.
+        """
+        self._search_after_id = None
+        query = self.search_text.get().strip()
+        if query:
+            # Searched in the background; a newer search replaces this one if the user keeps typing
+            self.controller.background.submit(
+                self.controller.task_service.search, query, SEARCH_RESULT_LIMIT,
+                key="search", on_done=self.show_search_results,
+            )
+        else:
+            self.controller.background.cancel("search") # Its results would replace the list again
+            self._showing_results = False
+            # The list widget shares the model's list again
+            self.tasks_listbox.set_items(self.controller.task_service.task_model.tasks)
+            self.tasks_listbox.scroll_to(0)
+
+    def show_search_results(self, results):
+        """
+        Shows the results of run_search's query in the list.
+        Args:
+            results (list[Task]): The matching tasks, best match first.
+        """
+        self._showing_results = True
+        self.tasks_listbox.set_items(results)
+        self.tasks_listbox.scroll_to(0)
+
+    def show_loading(self, busy, delay_ms=200):
+        """
+        Shows or hides the "Loading..." label next to the search box. It only appears if
+        loading takes longer than delay_ms, so quick reads don't make it flicker.
+        Args:
+            busy (bool): True while something is being loaded.
+            delay_ms (int): How long to wait before showing the label.
+        """
+        if self._loading_after_id is not None:
+            self.after_cancel(self._loading_after_id)
+            self._loading_after_id = None
+        if busy:
+            self._loading_after_id = self.after(
+                delay_ms, lambda: self.loading_label.grid(row=0, column=2, sticky="e", padx=(10, 0))
+            )
+        else:
+            self.loading_label.grid_remove()
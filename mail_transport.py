@@ -0,0 +1,171 @@
+# mail_transport.py
+# Keeps an SMTP session open across reminder emails, so sending many reminders
+# doesn't pay for a new connection, TLS handshake and login every time.
+
+import smtplib   # For sending emails (Simple Mail Transfer Protocol)
+import threading # The session is shared, and closed by a timer when idle
+import time      # To know how long the session has been idle
+
+class SMTPTransport:
+    """
+    One authenticated SMTP session that is reused for every message.
+    The session is opened on the first send, reconnected if the server drops it,
+    and closed again after it has been idle for idle_timeout seconds.
+    Only one idle timer runs at a time: sends just note the time, and when the timer fires
+    while the session is still in use, it waits again for the rest of the idle time.
+    """
+    def __init__(self, host, port, username=None, password=None, use_tls=True, timeout=30, idle_timeout=60):
+        """
+        Args:
+            host (str): The SMTP server.
+            port (int): The SMTP server port.
+            username (str, optional): Login name. If None, no login is done (e.g. a local test server).
+            password (str, optional): Login password.
+            use_tls (bool): Whether to upgrade the connection with STARTTLS.
+            timeout (float): Socket timeout in seconds for connecting and sending.
+            idle_timeout (float): Seconds without a send after which the session is closed.
+        """
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.use_tls = use_tls
+        self.timeout = timeout
+        self.idle_timeout = idle_timeout
+        self._server = None         # The open smtplib.SMTP session (or None)
+        self._last_used = 0.0       # time.monotonic() of the last send
+        self._idle_timer = None     # The one threading.Timer that closes the idle session
+        self._lock = threading.RLock() # smtplib sessions aren't safe to share between threads
+
+    def send(self, msg):
+        """
+        Sends one message over the shared session, connecting first if needed.
+        If the server dropped the session since the last send, reconnects once and retries.
+        Args:
+            msg (EmailMessage): The message to send.
+        Raises:
+            smtplib.SMTPException or OSError: If the message couldn't be sent.
+        """
+        with self._lock:
+            if self._server is not None and time.monotonic() - self._last_used >= self.idle_timeout:
+                # Idle for too long (the timer hasn't got to it yet): the server has
+                # probably dropped it, so start over instead of waiting for an error
+                self.close()
+            try:
+                self._ensure_connected().send_message(msg)
+            except smtplib.SMTPServerDisconnected:
+                # Servers close sessions they consider idle; a fresh one usually works.
+                self._discard()
+                self._ensure_connected().send_message(msg)
+            self._touch()
+
+    def send_batch(self, messages):
+        """
+        Sends several messages over the same session.
+        A failure of one message doesn't stop the others, but if the server can't be
+        reached (or the login fails) the remaining messages aren't tried.
+        Args:
+            messages (list[EmailMessage]): The messages to send.
+        Returns:
+            list: One entry per message, None if it was sent, otherwise the exception.
+        """
+        results = []
+        with self._lock:
+            for index, msg in enumerate(messages):
+                try:
+                    self.send(msg)
+                    results.append(None)
+                except (smtplib.SMTPConnectError, smtplib.SMTPAuthenticationError) as e:
+                    # Every other message would fail the same way
+                    results.extend([e] * (len(messages) - index))
+                    break
+                except (smtplib.SMTPException, OSError) as e:
+                    results.append(e)
+                    if self._server is None:
+                        # Connecting failed (timeout, refused...), don't retry for every message
+                        results.extend([e] * (len(messages) - index - 1))
+                        break
+        return results
+
+    def close(self):
+        """
+        Closes the session (if open). The next send opens a new one.
+        """
+        with self._lock:
+            self._cancel_idle_timer()
+            if self._server is not None:
+                try:
+                    self._server.quit()
+                except (smtplib.SMTPException, OSError):
+                    pass # Already gone, nothing to do
+                self._server = None
+
+    def close_if_idle(self):
+        """
+        Closes the session if it hasn't been used for idle_timeout seconds.
+        Called by the idle timer, but safe to call any time.
+        """
+        with self._lock:
+            if self._server is not None and time.monotonic() - self._last_used >= self.idle_timeout:
+                self.close()
+
+    def _on_idle_timer(self):
+        # The idle timer fired: close the session, or wait for the rest of the idle time
+        # if it was used meanwhile.
+        with self._lock:
+            self._idle_timer = None
+            if self._server is None:
+                return
+            remaining = self._last_used + self.idle_timeout - time.monotonic()
+            if remaining <= 0:
+                self.close()
+            else:
+                self._start_idle_timer(remaining)
+
+    @property
+    def is_connected(self):
+        """
+        bool: True while a session is open.
+        """
+        return self._server is not None
+
+    def _ensure_connected(self):
+        # Opens and logs in a new session if there isn't one yet.
+        if self._server is None:
+            server = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+            try:
+                if self.use_tls:
+                    server.starttls() # Secure the connection using TLS
+                if self.username:
+                    server.login(self.username, self.password)
+            except BaseException:
+                server.close()
+                raise
+            self._server = server
+        return self._server
+
+    def _discard(self):
+        # Drops a broken session without talking to the server.
+        if self._server is not None:
+            try:
+                self._server.close()
+            except OSError:
+                pass
+            self._server = None
+
+    def _touch(self):
+        # Remembers when the session was last used and starts the idle timer if none is running.
+        # (Restarting it on every send would start a new thread per email.)
+        self._last_used = time.monotonic()
+        if self._idle_timer is None:
+            self._start_idle_timer(self.idle_timeout)
+
+    def _start_idle_timer(self, delay):
+        self._idle_timer = threading.Timer(delay, self._on_idle_timer)
+        self._idle_timer.daemon = True # Don't keep the app alive just for this
+        self._idle_timer.start()
+
+    def _cancel_idle_timer(self):
+        if self._idle_timer is not None:
+            self._idle_timer.cancel()
+            self._idle_timer = None
@@ -0,0 +1,206 @@
+# metrics.py
+# In-process counters and histograms (mainly for the reminder pipeline), plus an optional
+# local HTTP endpoint that serves them in the Prometheus text format, e.g. for
+#   curl http://127.0.0.1:9464/metrics
+# or a Prometheus server scraping the app. Only the standard library is used.
+
+import bisect    # To find a value's histogram bucket
+import threading # Metrics are updated from several threads
+# (http.server is imported by start_http_server: it pulls in the email modules, which the
+#  app doesn't load at startup)
+
+class Counter:
+    """
+    A number that only goes up, optionally split by one label (e.g. the error type).
+    """
+    def __init__(self, name, help_text, label=None):
+        """
+        Args:
+            name (str): Metric name, e.g. "reminders_sent_total".
+            help_text (str): One-line description for the endpoint.
+            label (str, optional): Name of the label that splits the count (e.g. "error").
+        """
+        self.name = name
+        self.help_text = help_text
+        self.label = label
+        self._values = {} # label value (None without a label) -> count
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, label_value=None):
+        """
+        Adds to the counter.
+        Args:
+            amount (float): How much to add.
+            label_value (str, optional): The label's value (only for counters with a label).
+        """
+        with self._lock:
+            self._values[label_value] = self._values.get(label_value, 0) + amount
+
+    def value(self, label_value=None):
+        """
+        Returns:
+            float: The current count (for the given label value).
+        """
+        with self._lock:
+            return self._values.get(label_value, 0)
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            values = sorted(self._values.items(), key=lambda item: str(item[0]))
+        if not values and self.label is None:
+            values = [(None, 0)]
+        for label_value, count in values:
+            labels = "" if self.label is None else f'{{{self.label}="{_escape(label_value)}"}}'
+            lines.append(f"{self.name}{labels} {count:g}")
+        return lines
+
+
+class Histogram:
+    """
+    Counts observed values (durations, sizes...) into fixed buckets, plus their sum and count,
+    so averages and rough percentiles can be worked out without keeping every value.
+    """
+    def __init__(self, name, help_text, buckets):
+        """
+        Args:
+            name (str): Metric name, e.g. "reminder_send_seconds".
+            help_text (str): One-line description for the endpoint.
+            buckets (list[float]): Upper bounds of the buckets, in increasing order.
+        """
+        self.name = name
+        self.help_text = help_text
+        self.buckets = list(buckets)
+        self._counts = [0] * (len(self.buckets) + 1) # The last one is for values above every bound
+        self._sum = 0.0
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        """
+        Records one value.
+        Args:
+            value (float): The observed value.
+        """
+        index = bisect.bisect_left(self.buckets, value) # First bucket with bound >= value
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+            self._count += 1
+
+    def snapshot(self):
+        """
+        Returns:
+            dict: {"count": ..., "sum": ..., "buckets": [(upper bound, cumulative count), ...]}
+        """
+        with self._lock:
+            counts, total, count = list(self._counts), self._sum, self._count
+        cumulative, running = [], 0
+        for bound, bucket_count in zip(self.buckets + [float("inf")], counts):
+            running += bucket_count
+            cumulative.append((bound, running))
+        return {"count": count, "sum": total, "buckets": cumulative}
+
+    def render(self):
+        snapshot = self.snapshot()
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        for bound, count in snapshot["buckets"]:
+            le = "+Inf" if bound == float("inf") else f"{bound:g}"
+            lines.append(f'{self.name}_bucket{{le="{le}"}} {count}')
+        lines.append(f"{self.name}_sum {snapshot['sum']:g}")
+        lines.append(f"{self.name}_count {snapshot['count']}")
+        return lines
+
+
+class MetricsRegistry:
+    """
+    All metrics of the app, by name. Asking twice for the same name returns the same metric,
+    so modules can simply declare the metrics they update.
+    """
+    def __init__(self):
+        self._metrics = {} # name -> Counter or Histogram, in the order they were declared
+        self._lock = threading.Lock()
+
+    def counter(self, name, help_text, label=None):
+        """
+        Returns:
+            Counter: The counter with this name (created on first use).
+        """
+        return self._get_or_create(name, lambda: Counter(name, help_text, label))
+
+    def histogram(self, name, help_text, buckets):
+        """
+        Returns:
+            Histogram: The histogram with this name (created on first use).
+        """
+        return self._get_or_create(name, lambda: Histogram(name, help_text, buckets))
+
+    def get(self, name):
+        """
+        Returns:
+            Counter or Histogram or None: The metric with this name, if it was declared.
+        """
+        with self._lock:
+            return self._metrics.get(name)
+
+    def render_prometheus(self):
+        """
+        Returns:
+            str: Every metric in the Prometheus text exposition format.
+        """
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    def _get_or_create(self, name, create):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = create()
+            return metric
+
+
+# The registry the app's modules declare their metrics in
+REGISTRY = MetricsRegistry()
+
+
+def start_http_server(port, host="127.0.0.1", registry=REGISTRY):
+    """
+    Serves the metrics at http://host:port/metrics from a background thread.
+    Only listens on this machine by default.
+    Args:
+        port (int): The port (0 picks a free one, see server.server_address).
+        host (str): The address to listen on.
+        registry (MetricsRegistry): The metrics to serve.
+    Returns:
+        ThreadingHTTPServer: The running server (call shutdown() to stop it).
+    """
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] not in ("/", "/metrics"):
+                self.send_error(404)
+                return
+            body = registry.render_prometheus().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass # Don't print a line for every scrape
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+    return server
+
+
+def _escape(label_value):
+    # Label values are quoted; backslashes, quotes and newlines must be escaped
+    return str(label_value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
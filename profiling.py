@@ -0,0 +1,213 @@
+# profiling.py
+# Opt-in profiling for finding out where the time goes when the UI stutters.
+# Switched on with "python app.py --profile" (or --profile=cprofile), or with the
+# TASK_MANAGER_PROFILE environment variable ("spans" or "cprofile").
+# - Spans: the app's entry points (filling the list, opening a task, a reminder tick...)
+#   are timed on every call; the durations go into a ring buffer (the newest N calls).
+# - cProfile (optional): profiles the Tk thread for a limited time after startup.
+# On exit everything is written to a folder: a JSON summary of the spans, a folded-stacks
+# file (for flamegraph.pl, speedscope, inferno...) and the cProfile stats (pstats format).
+# When profiling is off nothing is wrapped, and span() returns a shared do-nothing object.
+
+import collections # deque as the ring buffer
+import contextlib  # nullcontext for disabled spans
+import functools   # wraps, for instrument()
+import json        # The span summary file
+import os          # Output folder
+import threading   # Spans come from several threads
+import time        # perf_counter for the durations
+
+_NULL_SPAN = contextlib.nullcontext() # What span() returns when profiling is off
+
+_enabled = False
+_events = collections.deque(maxlen=10000) # (name, thread name, start, duration) of the newest spans
+_folded = collections.Counter()          # "thread;outer span;inner span" -> self time in microseconds
+_folded_lock = threading.Lock()
+_stacks = threading.local()              # Each thread's open spans
+_profiler = None                         # cProfile.Profile while it runs (only in the thread that started it)
+_profiler_stats = None                   # pstats.Stats after it stopped
+_output_dir = "profiles"
+
+
+class _Span:
+    """
+    Times one call of a named piece of code (used as a context manager).
+    """
+    __slots__ = ("name", "start", "child_time")
+
+    def __init__(self, name):
+        self.name = name
+        self.child_time = 0.0 # Time spent in spans opened inside this one
+
+    def __enter__(self):
+        stack = getattr(_stacks, "spans", None)
+        if stack is None:
+            stack = _stacks.spans = []
+        stack.append(self)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        duration = time.perf_counter() - self.start
+        stack = _stacks.spans
+        stack.pop()
+        thread_name = threading.current_thread().name
+        _events.append((self.name, thread_name, self.start, duration)) # deque.append is thread-safe
+        if stack:
+            stack[-1].child_time += duration
+        path = ";".join([thread_name] + [span.name for span in stack] + [self.name])
+        with _folded_lock:
+            _folded[path] += int((duration - self.child_time) * 1e6)
+        return False
+
+
+def enable(mode="spans", buffer_size=10000, output_dir="profiles"):
+    """
+    Switches profiling on. Call it before the code to be measured starts (and before instrument()).
+    Args:
+        mode (str): "spans" (timing spans only) or "cprofile" (spans plus cProfile in this thread).
+        buffer_size (int): How many of the newest span calls are kept.
+        output_dir (str): Where dump() writes the files.
+    """
+    global _enabled, _events, _output_dir
+    _enabled = True
+    _events = collections.deque(maxlen=buffer_size)
+    _output_dir = output_dir
+    if mode == "cprofile":
+        start_cprofile()
+
+
+def is_enabled():
+    """
+    Returns:
+        bool: True if profiling was switched on.
+    """
+    return _enabled
+
+
+def span(name):
+    """
+    Times a block of code:  with profiling.span("reminder.tick"): ...
+    Args:
+        name (str): What is being timed.
+    Returns:
+        A context manager (a shared do-nothing one when profiling is off).
+    """
+    if not _enabled:
+        return _NULL_SPAN
+    return _Span(name)
+
+
+def instrument(cls, method_names, prefix=None):
+    """
+    Wraps methods of a class in spans named "<prefix>.<method>". Only call this when profiling
+    is enabled: the methods of an un-instrumented class stay exactly as they are (no overhead).
+    Args:
+        cls: The class.
+        method_names (list[str]): The methods to time.
+        prefix (str, optional): Span name prefix (default: the class name).
+    """
+    prefix = prefix or cls.__name__
+    for method_name in method_names:
+        method = getattr(cls, method_name)
+        setattr(cls, method_name, _timed(method, f"{prefix}.{method_name}"))
+
+
+def _timed(method, name):
+    @functools.wraps(method)
+    def wrapper(*args, **kwargs):
+        with _Span(name):
+            return method(*args, **kwargs)
+    return wrapper
+
+
+def start_cprofile():
+    """
+    Starts cProfile in the calling thread (cProfile only sees the thread it runs in).
+    """
+    global _profiler
+    if _profiler is None:
+        import cProfile # Only loaded when asked for
+        _profiler = cProfile.Profile()
+        _profiler.enable()
+
+
+def stop_cprofile():
+    """
+    Stops cProfile and keeps its statistics for dump(). Call it from the thread that started it.
+    """
+    global _profiler, _profiler_stats
+    if _profiler is not None:
+        import pstats
+        _profiler.disable()
+        _profiler_stats = pstats.Stats(_profiler)
+        _profiler = None
+
+
+def summary():
+    """
+    Sums up the spans in the ring buffer, per span name.
+    Returns:
+        dict: name -> {"calls", "total_ms", "mean_ms", "p50_ms", "p95_ms", "max_ms"}, slowest total first.
+    """
+    durations = collections.defaultdict(list)
+    for name, _, _, duration in list(_events):
+        durations[name].append(duration * 1000)
+    result = {}
+    for name, values in sorted(durations.items(), key=lambda item: -sum(item[1])):
+        values.sort()
+        result[name] = {
+            "calls": len(values),
+            "total_ms": round(sum(values), 3),
+            "mean_ms": round(sum(values) / len(values), 3),
+            "p50_ms": round(values[len(values) // 2], 3),
+            "p95_ms": round(values[min(len(values) - 1, int(len(values) * 0.95))], 3),
+            "max_ms": round(values[-1], 3),
+        }
+    return result
+
+
+def dump(output_dir=None):
+    """
+    Writes the profiling results (called by the app when it closes):
+    - spans-<time>.json: the summary per span plus the calls in the ring buffer,
+    - spans-<time>.folded: folded stacks with self time in microseconds (flamegraph input),
+    - cprofile-<time>.pstats: the cProfile statistics, if cProfile ran
+      (view with "python -m pstats FILE", snakeviz, or turn into a flame graph with flameprof).
+    Args:
+        output_dir (str, optional): Folder for the files (default: the one given to enable()).
+    Returns:
+        list[str]: The files written.
+    """
+    if not _enabled:
+        return []
+    stop_cprofile() # If it's still running (only works from the thread that started it)
+    output_dir = output_dir or _output_dir
+    os.makedirs(output_dir, exist_ok=True)
+    stamp = time.strftime("%Y%m%d-%H%M%S")
+    paths = []
+
+    events = list(_events)
+    started = events[0][2] if events else 0.0
+    path = os.path.join(output_dir, f"spans-{stamp}.json")
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump({
+            "summary": summary(),
+            "calls": [{"name": name, "thread": thread_name, "start_ms": round((start - started) * 1000, 3),
+                       "duration_ms": round(duration * 1000, 3)} for name, thread_name, start, duration in events],
+        }, file, indent=1)
+    paths.append(path)
+
+    path = os.path.join(output_dir, f"spans-{stamp}.folded")
+    with _folded_lock:
+        folded = sorted(_folded.items())
+    with open(path, "w", encoding="utf-8") as file:
+        for stack, microseconds in folded:
+            file.write(f"{stack} {microseconds}\n")
+    paths.append(path)
+
+    if _profiler_stats is not None:
+        path = os.path.join(output_dir, f"cprofile-{stamp}.pstats")
+        _profiler_stats.dump_stats(path)
+        paths.append(path)
+    return paths
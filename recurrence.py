@@ -0,0 +1,423 @@
+# recurrence.py
+# Repeating tasks. A task's repeat rule is stored once, in the "recurrence" column of its row,
+# as a small subset of the iCalendar RRULE format (RFC 5545), e.g. "FREQ=WEEKLY;BYDAY=MO,TH".
+# The row itself only holds the task's current occurrence (its date and time). The ones after
+# it are worked out by an iterator when they're needed (the next reminder, or when the task is
+# marked done and moves on to its next occurrence), so a weekly task stays a single row instead
+# of hundreds of copies.
+#
+# Supported rule parts:
+#   FREQ=DAILY|WEEKLY|MONTHLY|YEARLY (required)
+#   INTERVAL=n      every n days/weeks/months/years (default 1)
+#   COUNT=n         n occurrences in total, counted from the task's current one
+#   UNTIL=date      no occurrences after this date (YYYYMMDD or YYYY-MM-DD)
+#   BYDAY=MO,TU...  weekdays; in monthly/yearly rules with an optional position (1MO = first
+#                   Monday of the month, -1FR = last Friday)
+#   BYMONTHDAY=n    days of the month (monthly/yearly rules; -1 = the last day)
+#   BYMONTH=n       months of the year (yearly rules)
+# The names of PRESETS ("weekly", "weekdays"...) can be used instead of a rule.
+
+import calendar # Days per month
+import datetime # Occurrence dates
+import functools # lru_cache for describe_rule (the task list calls it for every repeating row)
+
+WEEKDAYS = ("MO", "TU", "WE", "TH", "FR", "SA", "SU") # Index = date.weekday()
+WEEKDAY_NAMES = ("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun")
+FREQUENCIES = ("DAILY", "WEEKLY", "MONTHLY", "YEARLY")
+UNITS = {"DAILY": "day", "WEEKLY": "week", "MONTHLY": "month", "YEARLY": "year"}
+
+# Names the user can pick (or type) instead of writing a rule
+PRESETS = {
+    "Daily": "FREQ=DAILY",
+    "Weekdays": "FREQ=WEEKLY;BYDAY=MO,TU,WE,TH,FR",
+    "Weekly": "FREQ=WEEKLY",
+    "Monthly": "FREQ=MONTHLY",
+    "Yearly": "FREQ=YEARLY",
+}
+
+# A rule that matches no day at all (e.g. every 30th of February) would make the iterator
+# look forever; it gives up after this many days/weeks/months/years without an occurrence.
+MAX_EMPTY_PERIODS = 1000
+
+
+class RecurrenceRule:
+    """
+    A parsed repeat rule. Use parse() to read one, str() to turn it back into rule text.
+    """
+    def __init__(self, freq, interval=1, count=None, until=None, by_day=(), by_month_day=(), by_month=()):
+        """
+        Args:
+            freq (str): One of FREQUENCIES.
+            interval (int): Every how many days/weeks/months/years.
+            count (int, optional): How many occurrences there are in total.
+            until (date, optional): The last possible occurrence date.
+            by_day (tuple): (position or None, weekday index 0-6) pairs.
+            by_month_day (tuple[int]): Days of the month (negative = counted from the end).
+            by_month (tuple[int]): Months (1-12).
+        """
+        self.freq = freq
+        self.interval = interval
+        self.count = count
+        self.until = until
+        self.by_day = tuple(by_day)
+        self.by_month_day = tuple(by_month_day)
+        self.by_month = tuple(by_month)
+
+    @classmethod
+    def parse(cls, text):
+        """
+        Reads rule text like "FREQ=MONTHLY;BYDAY=-1FR" (an "RRULE:" in front is allowed).
+        Args:
+            text (str): The rule.
+        Returns:
+            RecurrenceRule: The rule.
+        Raises:
+            ValueError: If the rule can't be read or uses something unsupported (the message says what).
+        """
+        text = text.strip()
+        if text.upper().startswith("RRULE:"):
+            text = text[6:]
+        parts = {}
+        for part in text.split(";"):
+            if not part.strip():
+                continue
+            name, sep, value = part.partition("=")
+            name = name.strip().upper()
+            if not sep or not value.strip():
+                raise ValueError(f"Invalid repeat rule part '{part}', expected NAME=VALUE.")
+            if name in parts:
+                raise ValueError(f"Repeat rule has {name} twice.")
+            parts[name] = value.strip().upper()
+
+        freq = parts.pop("FREQ", None)
+        if freq not in FREQUENCIES:
+            raise ValueError("Repeat rule needs FREQ=DAILY, WEEKLY, MONTHLY or YEARLY.")
+        interval = _parse_int(parts.pop("INTERVAL", "1"), "INTERVAL", 1, 1000)
+        count = parts.pop("COUNT", None)
+        count = None if count is None else _parse_int(count, "COUNT", 1, 100000)
+        until = parts.pop("UNTIL", None)
+        if until is not None:
+            until = _parse_until(until)
+        if count is not None and until is not None:
+            raise ValueError("Repeat rule can't have both COUNT and UNTIL.")
+
+        by_day = []
+        for item in _split(parts.pop("BYDAY", "")):
+            position, weekday = item[:-2], item[-2:]
+            if weekday not in WEEKDAYS:
+                raise ValueError(f"Invalid BYDAY value '{item}'.")
+            if position:
+                if freq not in ("MONTHLY", "YEARLY"):
+                    raise ValueError("BYDAY positions (like 1MO) only work in MONTHLY and YEARLY rules.")
+                position = _parse_int(position, "BYDAY position", -5, 5)
+                if position == 0:
+                    raise ValueError(f"Invalid BYDAY value '{item}'.")
+            by_day.append((position or None, WEEKDAYS.index(weekday)))
+        by_month_day = [_parse_int(item, "BYMONTHDAY", -31, 31) for item in _split(parts.pop("BYMONTHDAY", ""))]
+        if 0 in by_month_day:
+            raise ValueError("BYMONTHDAY can't be 0.")
+        if by_month_day and freq not in ("MONTHLY", "YEARLY"):
+            raise ValueError("BYMONTHDAY only works in MONTHLY and YEARLY rules.")
+        by_month = [_parse_int(item, "BYMONTH", 1, 12) for item in _split(parts.pop("BYMONTH", ""))]
+        if by_month and freq != "YEARLY":
+            raise ValueError("BYMONTH only works in YEARLY rules.")
+        if parts:
+            raise ValueError(f"Repeat rule part {', '.join(sorted(parts))} isn't supported.")
+        return cls(freq, interval, count, until, sorted(set(by_day), key=_by_day_order),
+                   sorted(set(by_month_day)), sorted(set(by_month)))
+
+    def __str__(self):
+        parts = [f"FREQ={self.freq}"]
+        if self.interval != 1:
+            parts.append(f"INTERVAL={self.interval}")
+        if self.by_month:
+            parts.append("BYMONTH=" + ",".join(str(month) for month in self.by_month))
+        if self.by_month_day:
+            parts.append("BYMONTHDAY=" + ",".join(str(day) for day in self.by_month_day))
+        if self.by_day:
+            parts.append("BYDAY=" + ",".join(f"{position or ''}{WEEKDAYS[weekday]}" for position, weekday in self.by_day))
+        if self.count is not None:
+            parts.append(f"COUNT={self.count}")
+        if self.until is not None:
+            parts.append(f"UNTIL={self.until.strftime('%Y%m%d')}")
+        return ";".join(parts)
+
+    def anchored(self, start):
+        """
+        Fills in what the rule leaves to the start date, like a calendar does: a weekly rule
+        without BYDAY repeats on the start's weekday, a monthly one on the start's day of the
+        month, a yearly one on the start's month and day. Stored rules are always anchored,
+        so they mean the same thing when the task moves on to a later occurrence.
+        Args:
+            start (date): The first occurrence.
+        Returns:
+            RecurrenceRule: The rule with those parts filled in.
+        """
+        rule = self._copy()
+        if rule.freq == "WEEKLY" and not rule.by_day:
+            rule.by_day = ((None, start.weekday()),)
+        elif rule.freq == "MONTHLY" and not rule.by_day and not rule.by_month_day:
+            rule.by_month_day = (start.day,)
+        elif rule.freq == "YEARLY":
+            if not rule.by_month:
+                rule.by_month = (start.month,)
+            if not rule.by_day and not rule.by_month_day:
+                rule.by_month_day = (start.day,)
+        return rule
+
+    def dates(self, start):
+        """
+        The occurrence dates on or after start, one at a time, in order. Nothing is worked
+        out before it is asked for, so taking the first few of an endless rule is cheap.
+        Args:
+            start (date): The start of the series (COUNT counts from here; INTERVAL is counted
+                          in days/weeks/months/years from here).
+        Yields:
+            date: The next occurrence.
+        """
+        produced = 0
+        empty_periods = 0
+        period = 0
+        while True:
+            try:
+                days = self._period_dates(start, period)
+            except (ValueError, OverflowError):
+                return # Past the year 9999
+            period += 1
+            found = False
+            for day in days:
+                if day < start:
+                    continue
+                if self.until is not None and day > self.until:
+                    return
+                if self.count is not None and produced >= self.count:
+                    return
+                produced += 1
+                found = True
+                yield day
+            empty_periods = 0 if found else empty_periods + 1
+            if empty_periods > MAX_EMPTY_PERIODS:
+                return
+
+    def describe(self):
+        """
+        Returns:
+            str: The rule in words, e.g. "Every 2 weeks on Mon, Fri".
+        """
+        unit = UNITS[self.freq]
+        text = f"Every {unit}" if self.interval == 1 else f"Every {self.interval} {unit}s"
+        if self.freq == "YEARLY" and self.by_month:
+            text += " in " + ", ".join(calendar.month_abbr[month] for month in self.by_month)
+        days = []
+        if self.by_month_day:
+            days += ["last day" if day == -1 else f"day {day}" for day in self.by_month_day]
+        for position, weekday in self.by_day:
+            if position is None:
+                days.append(WEEKDAY_NAMES[weekday])
+            else:
+                days.append(("last " if position == -1 else f"{_ordinal(position)} ") + WEEKDAY_NAMES[weekday])
+        if days:
+            text += " on " + ", ".join(days)
+        if self.count is not None:
+            text += f", {self.count} time{'s' if self.count != 1 else ''}"
+        if self.until is not None:
+            text += f", until {self.until.isoformat()}"
+        return text
+
+    def _copy(self):
+        return RecurrenceRule(self.freq, self.interval, self.count, self.until,
+                              self.by_day, self.by_month_day, self.by_month)
+
+    def _period_dates(self, start, period):
+        # The candidate dates of one day/week/month/year of the series, sorted
+        if self.freq == "DAILY":
+            day = start + datetime.timedelta(days=period * self.interval)
+            weekdays = {weekday for _, weekday in self.by_day}
+            return [day] if not weekdays or day.weekday() in weekdays else []
+        if self.freq == "WEEKLY":
+            week = start - datetime.timedelta(days=start.weekday()) + datetime.timedelta(weeks=period * self.interval)
+            return [week + datetime.timedelta(days=weekday) for _, weekday in self.by_day]
+        if self.freq == "MONTHLY":
+            month_index = start.year * 12 + start.month - 1 + period * self.interval
+            return self._month_dates(month_index // 12, month_index % 12 + 1)
+        year = start.year + period * self.interval
+        return [day for month in self.by_month for day in self._month_dates(year, month)]
+
+    def _month_dates(self, year, month):
+        # The days of one month that match BYMONTHDAY and/or BYDAY (both given = both must match)
+        days_in_month = calendar.monthrange(year, month)[1]
+        month_days = None
+        if self.by_month_day:
+            month_days = set()
+            for day in self.by_month_day:
+                day = day if day > 0 else days_in_month + 1 + day
+                if 1 <= day <= days_in_month:
+                    month_days.add(day)
+        weekday_days = None
+        if self.by_day:
+            weekday_days = set()
+            first_weekday = calendar.weekday(year, month, 1)
+            for position, weekday in self.by_day:
+                matching = list(range((weekday - first_weekday) % 7 + 1, days_in_month + 1, 7))
+                if position is None:
+                    weekday_days.update(matching)
+                elif -len(matching) <= position <= len(matching):
+                    weekday_days.add(matching[position - 1 if position > 0 else position])
+        if month_days is None:
+            days = weekday_days or set()
+        elif weekday_days is None:
+            days = month_days
+        else:
+            days = month_days & weekday_days
+        return [datetime.date(year, month, day) for day in sorted(days)]
+
+
+def parse_recurrence(text, due_date):
+    """
+    Checks a repeat rule typed by the user and turns it into the text that is stored.
+    Args:
+        text (str or None): A preset name (any case), rule text, or empty for "doesn't repeat".
+        due_date (str or None): The task's due date (YYYY-MM-DD); repeating tasks need one.
+    Returns:
+        str or None: The stored rule (anchored at due_date, see RecurrenceRule.anchored),
+                     or None if the task doesn't repeat.
+    Raises:
+        ValueError: If the rule isn't valid (the message can be shown to the user).
+    """
+    if not text or not text.strip():
+        return None
+    text = text.strip()
+    for name, preset in PRESETS.items():
+        if text.lower() == name.lower():
+            text = preset
+            break
+    rule = RecurrenceRule.parse(text)
+    if not due_date:
+        raise ValueError("A repeating task needs a due date.")
+    start = datetime.date.fromisoformat(due_date)
+    rule = rule.anchored(start)
+    if next(rule.dates(start), None) is None:
+        raise ValueError("The repeat rule has no dates on or after the due date.")
+    return str(rule)
+
+
+def first_occurrence(recurrence, due_date):
+    """
+    The first date on or after due_date that the rule repeats on (a weekly rule for Mondays
+    saved with a Wednesday due date starts on the next Monday).
+    Args:
+        recurrence (str): A stored rule (from parse_recurrence).
+        due_date (str): YYYY-MM-DD.
+    Returns:
+        tuple: (date string of the first occurrence, rule counted from there).
+    """
+    rule = RecurrenceRule.parse(recurrence)
+    start = datetime.date.fromisoformat(due_date)
+    first = next(rule.dates(start), start)
+    return first.isoformat(), str(rule)
+
+
+def occurrences(task):
+    """
+    The occurrences of a repeating task, starting with its current one: copies of the task
+    with the date of each occurrence (same ID, time, email...). Lazy and possibly endless,
+    so take only as many as needed (e.g. with itertools.islice).
+    Args:
+        task (Task): A task with a due date and a recurrence rule.
+    Yields:
+        Task: One occurrence at a time. Its recurrence rule is counted from that occurrence,
+              so every copy is itself a valid repeating task.
+    """
+    from task import Task # (Imported here: task.py doesn't need this module)
+    rule = RecurrenceRule.parse(task.recurrence)
+    start = datetime.date.fromisoformat(task.due_date)
+    for index, day in enumerate(rule.dates(start)):
+        remaining = rule._copy()
+        if remaining.count is not None:
+            remaining.count -= index
+        yield Task(task.desc, task.note, day.isoformat(), task.due_time, task.email, task.id, task.status,
+                   str(remaining))
+
+
+def next_occurrence(task, after):
+    """
+    The first occurrence of a repeating task that is due strictly after a moment.
+    Tasks without a time count as due at the start of their day.
+    Args:
+        task (Task): The repeating task.
+        after (datetime): The moment.
+    Returns:
+        Task or None: The occurrence (see occurrences()), or None if the series is over.
+    """
+    if not task.recurrence or not task.due_date:
+        return None
+    for occurrence in occurrences(task):
+        if _moment(occurrence) > after:
+            return occurrence
+    return None # The rule ran out (COUNT/UNTIL) before that moment
+
+
+def following_occurrence(task, now):
+    """
+    The occurrence a repeating task moves on to when it is marked done: the first one after
+    both its current occurrence and now (occurrences that were missed meanwhile are skipped).
+    Args:
+        task (Task): The repeating task, at its current occurrence.
+        now (datetime): The current time.
+    Returns:
+        Task or None: The occurrence (see occurrences()), or None if the series is over.
+    """
+    if not task.recurrence or not task.due_date:
+        return None
+    for occurrence in occurrences(task):
+        if occurrence.due_date > task.due_date and _moment(occurrence) > now: # (ISO dates compare as text)
+            return occurrence
+    return None
+
+
+@functools.lru_cache(maxsize=256)
+def describe_rule(recurrence):
+    """
+    Args:
+        recurrence (str or None): A stored rule.
+    Returns:
+        str: The rule in words ("" if there's no rule or it can't be read).
+    """
+    if not recurrence:
+        return ""
+    try:
+        return RecurrenceRule.parse(recurrence).describe()
+    except ValueError:
+        return recurrence
+
+
+def _moment(task):
+    # When an occurrence is due; without a time, at the start of its day
+    return task.due_datetime or datetime.datetime.fromisoformat(task.due_date)
+
+def _split(value):
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+def _parse_int(value, name, lowest, highest):
+    try:
+        number = int(value)
+    except ValueError:
+        raise ValueError(f"{name} must be a whole number, not '{value}'.") from None
+    if not lowest <= number <= highest:
+        raise ValueError(f"{name} must be between {lowest} and {highest}.")
+    return number
+
+def _parse_until(value):
+    try:
+        if len(value) >= 8 and value[:8].isdigit():
+            return datetime.date(int(value[:4]), int(value[4:6]), int(value[6:8])) # 20261231 (or 20261231T235959Z)
+        return datetime.date.fromisoformat(value[:10])
+    except ValueError:
+        raise ValueError(f"Invalid UNTIL date '{value}', expected YYYYMMDD or YYYY-MM-DD.") from None
+
+def _by_day_order(item):
+    position, weekday = item
+    return (position or 0, weekday)
+
+def _ordinal(number):
+    return {1: "1st", 2: "2nd", 3: "3rd"}.get(number, f"{number}th") if number > 0 else f"{_ordinal(-number)} last"
@@ -0,0 +1,208 @@
+# reminder_dispatcher.py
+# Sends reminder emails from a small pool of worker threads, so one slow mail
+# server doesn't hold up every other reminder. The reminder thread only finds
+# the due tasks and puts them in a bounded queue; the workers do the sending.
+
+import logging   # Level-controlled messages instead of prints
+import queue     # Bounded, thread-safe queue between the reminder thread and the workers
+import smtplib   # For telling temporary SMTP errors from permanent ones
+import threading # Worker threads and per-domain limits
+import time      # For the stop() deadline and the send times
+from metrics import REGISTRY # Counters and histograms of the reminder pipeline
+
+log = logging.getLogger(__name__)
+
+# Shared with the asyncio engine (async_reminders.py)
+REMINDERS_TOTAL = REGISTRY.counter(
+    "reminders_total", "Reminders by what happened to them (submitted, sent, failed, retried, dropped).",
+    label="outcome",
+)
+SEND_ERRORS_TOTAL = REGISTRY.counter(
+    "reminder_send_errors_total", "Failed send attempts (including retried ones) by error type.", label="error",
+)
+SEND_SECONDS = REGISTRY.histogram(
+    "reminder_send_seconds", "Time of one send attempt (building the email and talking to the SMTP server).",
+    [0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30],
+)
+
+class ReminderDispatcher:
+    """
+    A bounded queue of reminder tasks plus a pool of sender threads.
+    - Each worker has its own mail transport (SMTP sessions can't be shared between threads).
+    - At most per_domain_limit emails to the same recipient domain are sent at the same time.
+    - Temporary SMTP errors are retried with exponential backoff.
+    - When the queue is full, submit() either waits for room or drops the task (and counts it).
+    """
+    def __init__(self, send, transport_factory, on_sent=None, on_failed=None, workers=4, queue_size=1000,
+                 per_domain_limit=2, max_retries=3, backoff_seconds=2.0, block_when_full=True):
+        """
+        Args:
+            send: Function send(task, transport) that sends the reminder for a task, raises on failure.
+            transport_factory: Function that creates a new mail transport for a worker.
+            on_sent: Optional function on_sent(task), called by a worker after a successful send.
+            on_failed: Optional function on_failed(task, error), called when a task is given up on.
+            workers (int): Number of sender threads.
+            queue_size (int): How many tasks may wait in the queue.
+            per_domain_limit (int): Max. emails sent to one recipient domain at the same time.
+            max_retries (int): How often a temporary failure is retried.
+            backoff_seconds (float): Wait before the first retry, doubled for every further retry.
+            block_when_full (bool): True = submit() waits for room, False = the task is dropped.
+        """
+        self.send = send
+        self.transport_factory = transport_factory
+        self.on_sent = on_sent
+        self.on_failed = on_failed
+        self.worker_count = workers
+        self.per_domain_limit = per_domain_limit
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+        self.block_when_full = block_when_full
+
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._stop_event = threading.Event()
+        self._workers = []
+        self._domain_limits = {} # domain -> BoundedSemaphore
+        self._domain_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        # Counters (read them with stats())
+        self._stats = {"submitted": 0, "sent": 0, "failed": 0, "retried": 0, "dropped": 0}
+
+    def start(self):
+        """
+        Starts the worker threads.
+        """
+        for number in range(self.worker_count):
+            worker = threading.Thread(target=self._worker_loop, name=f"reminder-sender-{number}", daemon=True)
+            worker.start()
+            self._workers.append(worker)
+
+    def submit(self, task):
+        """
+        Queues a task for sending. Called by the reminder thread.
+        Args:
+            task (Task): The task to send a reminder for.
+        Returns:
+            bool: True if the task was queued, False if it was dropped (queue full or stopping).
+        """
+        while not self._stop_event.is_set():
+            try:
+                if self.block_when_full:
+                    # Wait in short steps, so stop() isn't held up by a full queue
+                    self._queue.put(task, timeout=0.5)
+                else:
+                    self._queue.put_nowait(task)
+                self._count("submitted")
+                return True
+            except queue.Full:
+                if not self.block_when_full:
+                    break
+        self._count("dropped")
+        return False
+
+    def stop(self, timeout=None):
+        """
+        Stops the workers and closes their mail transports. Tasks still in the queue are not sent.
+        Args:
+            timeout (float, optional): How long to wait (in total) for the workers to finish.
+        """
+        self._stop_event.set()
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for worker in self._workers:
+            worker.join(None if deadline is None else max(0, deadline - time.monotonic()))
+        self._workers = []
+
+    def stats(self):
+        """
+        Returns:
+            dict: Copy of the counters (submitted, sent, failed, retried, dropped) plus the queue length.
+        """
+        with self._stats_lock:
+            stats = dict(self._stats)
+        stats["queued"] = self._queue.qsize()
+        return stats
+
+    def _worker_loop(self):
+        # Runs in every worker thread until stop() is called
+        transport = self.transport_factory()
+        try:
+            while not self._stop_event.is_set():
+                try:
+                    task = self._queue.get(timeout=0.5)
+                except queue.Empty:
+                    continue
+                try:
+                    self._deliver(task, transport)
+                finally:
+                    self._queue.task_done()
+        finally:
+            transport.close()
+
+    def _deliver(self, task, transport):
+        # Sends one reminder, respecting the domain limit and retrying temporary errors.
+        # The domain slot is only held while sending, not while waiting to retry, so one
+        # struggling send doesn't hold up the other reminders to the same domain.
+        domain_limit = self._domain_limit(task.email)
+        attempt = 0
+        while True:
+            with domain_limit:
+                started = time.perf_counter()
+                try:
+                    self.send(task, transport)
+                    error = None
+                except Exception as e:
+                    error = e
+                SEND_SECONDS.observe(time.perf_counter() - started)
+            if error is None:
+                self._count("sent")
+                if self.on_sent:
+                    self.on_sent(task)
+                return
+            SEND_ERRORS_TOTAL.inc(label_value=type(error).__name__)
+            if attempt < self.max_retries and is_transient_error(error) and not self._stop_event.is_set():
+                self._count("retried")
+                log.debug("reminder send failed, retrying task_id=%s attempt=%d error=%r", task.id, attempt + 1, error)
+                # 1x, 2x, 4x... the base delay; wakes up early if the app is closing
+                self._stop_event.wait(self.backoff_seconds * (2 ** attempt))
+                attempt += 1
+                continue
+            self._count("failed")
+            if self.on_failed:
+                self.on_failed(task, error)
+            return
+
+    def _domain_limit(self, email):
+        # Returns the semaphore that limits parallel sends to this email's domain
+        domain = email.rsplit("@", 1)[-1].lower() if email else ""
+        with self._domain_lock:
+            limit = self._domain_limits.get(domain)
+            if limit is None:
+                limit = threading.BoundedSemaphore(self.per_domain_limit)
+                self._domain_limits[domain] = limit
+            return limit
+
+    def _count(self, name):
+        with self._stats_lock:
+            self._stats[name] += 1
+        REMINDERS_TOTAL.inc(label_value=name)
+
+
+def is_transient_error(error):
+    """
+    Decides if sending might work when tried again a bit later.
+    Dropped connections, timeouts and 4xx SMTP replies are temporary;
+    5xx replies (bad login, unknown recipient...) are not.
+    Args:
+        error (Exception): The error raised while sending.
+    Returns:
+        bool: True if a retry makes sense.
+    """
+    if isinstance(error, (smtplib.SMTPServerDisconnected, smtplib.SMTPConnectError)):
+        return True
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        # One entry per refused recipient: {address: (code, message)}
+        return all(400 <= code < 500 for code, _ in error.recipients.values())
+    if isinstance(error, smtplib.SMTPResponseException):
+        return 400 <= error.smtp_code < 500
+    if isinstance(error, smtplib.SMTPException):
+        return False
+    return isinstance(error, OSError) # Timeouts, refused/reset connections
@@ -0,0 +1,37 @@
+# reminder_email.py
+# Builds the reminder email for a task. Kept apart from the windows (app.py) so the
+# reminder engines, scripts and benchmarks can render emails without Tk.
+
+from email.message import EmailMessage # For constructing email messages easily
+
+def build_reminder_email(task, sender_address):
+    """
+    Constructs the reminder email for a specific task.
+    Args:
+        task (Task): The task object for which to send a reminder.
+        sender_address (str): The From address.
+    Returns:
+        EmailMessage: The message, ready to be sent.
+    """
+    # Create the email message object
+    msg = EmailMessage()
+    msg['Subject'] = f"Task Reminder: {task.desc}" # Email subject
+    msg['From'] = sender_address                 # Sender address
+    msg['To'] = task.email                       # Recipient address (from task)
+
+    # Format the due date and time nicely for the email body
+    due_datetime_obj = task.due_datetime
+    due_time_str = due_datetime_obj.strftime('%I:%M %p') if due_datetime_obj else "N/A" # e.g., 02:30 PM
+    due_date_str = due_datetime_obj.strftime('%A, %B %d, %Y') if due_datetime_obj else "N/A" # e.g., Tuesday, May 06, 2025
+
+    # Construct the email body
+    body = f"Hi,\n\nThis is a reminder for your upcoming task:\n\n"
+    body += f"  Task:       {task.desc}\n"
+    if task.note: # Only include note if it exists
+         body += f"  Note:       {task.note}\n"
+    body += f"  Due:        {due_date_str} at {due_time_str}\n\n"
+    body += f"Task Manager App\n" # Signature
+
+    # Set the email content
+    msg.set_content(body)
+    return msg
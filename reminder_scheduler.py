@@ -0,0 +1,212 @@
+# reminder_scheduler.py
+# Keeps track of when the next email reminder has to go out, so the reminder
+# thread can sleep until exactly that moment instead of polling the database.
+
+import heapq # Min-heap for the upcoming reminder start times
+import itertools # For a tie-breaking counter on heap entries
+import threading # The UI thread and the reminder thread share the scheduler
+import time      # To time the scans
+from datetime import datetime, timedelta
+from metrics import REGISTRY # Counters and histograms of the reminder pipeline
+from recurrence import next_occurrence # The following occurrence of a repeating task
+
+SCAN_SECONDS = REGISTRY.histogram(
+    "reminder_scan_seconds", "Time to find the due reminders (one pop_due call).",
+    [0.00001, 0.0001, 0.001, 0.01, 0.1, 1],
+)
+DUE_PER_SCAN = REGISTRY.histogram(
+    "reminder_due_per_scan", "Number of reminders found due by one scan.",
+    [0, 1, 5, 10, 50, 100, 500, 1000, 5000],
+)
+
+class ReminderScheduler:
+    """
+    Holds a min-heap of upcoming reminder start times (due time minus the reminder window).
+    The heap is built from the database once at startup; after that the app tells the
+    scheduler about added, edited, deleted and finished tasks so it never has to rescan.
+    Entries that were replaced or removed are not dug out of the heap, they are just
+    skipped when they reach the top ("lazy deletion").
+    A repeating task has one entry, for its next occurrence; when that one is popped,
+    the occurrence after it is pushed (so the series is never expanded ahead of time).
+    """
+    def __init__(self, window_minutes, max_sleep_seconds=3600):
+        """
+        Args:
+            window_minutes (int): How many minutes before the due time the reminder should be sent.
+            max_sleep_seconds (float): Upper limit for a single sleep, so a changed system clock
+                                       is noticed eventually even if nothing else wakes us up.
+        """
+        self.window = timedelta(minutes=window_minutes)
+        self.max_sleep_seconds = max_sleep_seconds
+        self._heap = []                   # Entries: (reminder_start, sequence, task_id)
+        self._live = {}                   # task_id -> (sequence, task) of the entry that counts
+        self._sequence = itertools.count() # Increases for every new entry, marks old ones as stale
+        self._condition = threading.Condition() # Guards the heap and wakes the sleeping thread
+        self._woken = False               # Set when something changed while the thread was asleep
+
+    def rebuild(self, tasks):
+        """
+        Replaces the whole heap with the given tasks. Only meant for startup.
+        Args:
+            tasks (list[Task]): Reminder candidates, e.g. from DatabaseManager.get_tasks_for_reminder().
+        """
+        now = datetime.now()
+        with self._condition:
+            self._heap = []
+            self._live = {}
+            for task in tasks:
+                start = self._reminder_start(task, now)
+                if start is not None:
+                    sequence = next(self._sequence)
+                    self._heap.append((start, sequence, task.id))
+                    self._live[task.id] = (sequence, task)
+            heapq.heapify(self._heap) # O(n) instead of n pushes
+            self._wake_locked()
+
+    def schedule(self, task):
+        """
+        Adds a task to the heap, or replaces its existing entry (after an edit).
+        Tasks that can't get a reminder any more (no email, done, already overdue) are removed.
+        Args:
+            task (Task): The task as it is now stored in the database, or for a repeating task
+                         the occurrence that should get the next reminder.
+        """
+        start = self._reminder_start(task, datetime.now())
+        with self._condition:
+            if start is None:
+                self._live.pop(task.id, None) # Old entry (if any) becomes stale
+            else:
+                sequence = next(self._sequence)
+                heapq.heappush(self._heap, (start, sequence, task.id))
+                self._live[task.id] = (sequence, task)
+            self._wake_locked()
+
+    def remove(self, task_id):
+        """
+        Forgets a task (deleted or marked as done). Its heap entry is skipped later on.
+        Args:
+            task_id (int): The ID of the task.
+        """
+        with self._condition:
+            if self._live.pop(task_id, None) is not None:
+                self._wake_locked()
+
+    def pop_due(self, now):
+        """
+        Takes every task whose reminder window has started out of the heap.
+        Tasks that became overdue while we weren't looking are dropped, like the old
+        polling loop did (it only sent inside the window). For a repeating task, its
+        next occurrence is scheduled in its place.
+        Args:
+            now (datetime): The current local time.
+        Returns:
+            list[Task]: The tasks that should get their reminder now.
+        """
+        started = time.perf_counter()
+        due_tasks = []
+        with self._condition:
+            while self._heap and self._heap[0][0] <= now:
+                start, sequence, task_id = heapq.heappop(self._heap)
+                live = self._live.get(task_id)
+                if live is None or live[0] != sequence:
+                    continue # Stale entry (task was edited, deleted or marked done)
+                del self._live[task_id]
+                task = live[1]
+                if now < task.due_datetime:
+                    due_tasks.append(task)
+                if task.recurrence:
+                    self._push_next_locked(task, now)
+        SCAN_SECONDS.observe(time.perf_counter() - started)
+        DUE_PER_SCAN.observe(len(due_tasks))
+        return due_tasks
+
+    def next_deadline(self):
+        """
+        Returns:
+            datetime or None: When the next reminder window starts, or None if nothing is scheduled.
+        """
+        with self._condition:
+            self._drop_stale_locked()
+            return self._heap[0][0] if self._heap else None
+
+    def wait(self, stop_event):
+        """
+        Blocks the calling (reminder) thread until the next reminder is due, the heap
+        changes, or the app is closing. Call wake() after setting stop_event.
+        Args:
+            stop_event (threading.Event): Set by the app when it shuts down.
+        """
+        with self._condition:
+            if self._woken or stop_event.is_set():
+                self._woken = False
+                return
+            self._drop_stale_locked()
+            timeout = self.max_sleep_seconds
+            if self._heap:
+                seconds_left = (self._heap[0][0] - datetime.now()).total_seconds()
+                timeout = max(0, min(timeout, seconds_left))
+            self._condition.wait(timeout)
+            self._woken = False
+
+    def wake(self):
+        """
+        Wakes the reminder thread up early (e.g. when the app is closing).
+        """
+        with self._condition:
+            self._wake_locked()
+
+    def __len__(self):
+        """
+        Number of tasks that are currently waiting for a reminder.
+        """
+        with self._condition:
+            return len(self._live)
+
+    def _wake_locked(self):
+        # Caller must hold self._condition
+        self._woken = True
+        self._condition.notify_all()
+
+    def _drop_stale_locked(self):
+        # Pops stale entries off the top so the next deadline is a real one.
+        # Caller must hold self._condition
+        while self._heap:
+            start, sequence, task_id = self._heap[0]
+            live = self._live.get(task_id)
+            if live is not None and live[0] == sequence:
+                return
+            heapq.heappop(self._heap)
+
+    def _push_next_locked(self, task, now):
+        # Caller must hold self._condition. Schedules the first occurrence of a repeating
+        # task after this one (skipping any whose window has already passed).
+        following = next_occurrence(task, max(task.due_datetime, now))
+        if following is None:
+            return # The series is over
+        start = self._reminder_start(following, now)
+        if start is not None:
+            sequence = next(self._sequence)
+            heapq.heappush(self._heap, (start, sequence, following.id))
+            self._live[following.id] = (sequence, following)
+
+    def _reminder_start(self, task, now):
+        """
+        Works out when the reminder window of a task starts.
+        Uses the same conditions as DatabaseManager.get_tasks_for_reminder().
+        Returns:
+            datetime or None: The window start, or None if the task shouldn't get a reminder.
+        """
+        if task.id is None or task.status != 0 or not task.email:
+            return None
+        due_dt = task.due_datetime
+        if due_dt is None or due_dt <= now:
+            return None # No date/time, or already overdue
+        return due_dt - self.window
+
+    def window_start(self, task):
+        """
+        Returns:
+            datetime or None: When the task's reminder window starts (None without a due date/time).
+        """
+        due_dt = task.due_datetime
+        return None if due_dt is None else due_dt - self.window
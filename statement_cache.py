@@ -0,0 +1,135 @@
+# statement_cache.py
+# Helpers for reusing prepared SQL statements. sqlite3 keeps the statements it has prepared
+# in a small least-recently-used cache per connection, keyed by the exact SQL text. A query
+# only skips SQLite's parser and planner if its text is byte-for-byte the same as last time,
+# so DatabaseManager sends every query as one fixed, normalized text (see normalize_sql and
+# database_manager.STATEMENTS) through a StatementCache, which also counts the cache misses.
+
+from collections import OrderedDict # Mirrors sqlite3's least-recently-used statement cache
+from metrics import REGISTRY # Miss counter for the metrics endpoint
+
+# Prepared statements kept per connection (sqlite3's default is 128).
+# Every connection is opened with cached_statements=STATEMENT_CACHE_SIZE.
+STATEMENT_CACHE_SIZE = 256
+
+STATEMENT_MISSES_TOTAL = REGISTRY.counter(
+    "db_statement_cache_misses_total", "SQL statements that had to be prepared (not in the statement cache)",
+    label="statement",
+)
+
+def normalize_sql(text):
+    """
+    Removes "--" comments and turns every run of whitespace into a single space (text inside
+    quotes is left alone), so the same query always has the same text.
+    Args:
+        text (str): SQL, e.g. a triple-quoted string with comments.
+    Returns:
+        str: The normalized SQL.
+    """
+    parts = []
+    quote = None      # The quote character we're inside of, if any
+    space = False     # Whitespace seen since the last kept character
+    i = 0
+    while i < len(text):
+        char = text[i]
+        if quote:
+            parts.append(char)
+            if char == quote:
+                quote = None # ('' inside a string closes and reopens it, which works out the same)
+        elif char == "-" and text.startswith("--", i):
+            # Comment: skip to the end of the line (which counts as whitespace)
+            end = text.find("\n", i)
+            i = len(text) if end == -1 else end
+            space = True
+            continue
+        elif char.isspace():
+            space = True
+        else:
+            if space and parts:
+                parts.append(" ")
+            space = False
+            parts.append(char)
+            if char in "'\"":
+                quote = char
+        i += 1
+    return "".join(parts)
+
+
+class StatementCache:
+    """
+    Runs the registered statements on one connection, through one reused cursor, and keeps
+    track of which SQL texts sqlite3 has prepared (a copy of its LRU cache, same size), so
+    every execution that had to prepare its statement is counted as a miss.
+    Only used by one thread at a time, like the connection itself.
+    """
+    def __init__(self, connection, statements, capacity=STATEMENT_CACHE_SIZE):
+        """
+        Args:
+            connection (sqlite3.Connection): Opened with cached_statements=capacity.
+            statements (dict): The statement registry, name -> normalized SQL.
+            capacity (int): Size of the connection's statement cache.
+        """
+        self.connection = connection
+        self.statements = statements
+        self.capacity = capacity
+        self._cursor = connection.cursor() # Reused by execute() and executemany()
+        self._prepared = OrderedDict()     # SQL text -> None, least recently used first
+        self.executions = {}               # statement name -> times run
+        self.misses = {}                   # statement name -> times prepared
+
+    def execute(self, name, params=(), sql=None):
+        """
+        Runs a statement on the reused cursor. Read the results (or lastrowid) before the next
+        call: the next statement replaces them.
+        Args:
+            name (str): The statement's name in the registry.
+            params (tuple or list): Values for the placeholders.
+            sql (str, optional): The SQL, for statements built at runtime (e.g. with filters).
+        Returns:
+            sqlite3.Cursor: The reused cursor.
+        """
+        sql = sql or self.statements[name]
+        self._count(name, sql)
+        return self._cursor.execute(sql, params)
+
+    def executemany(self, name, rows):
+        """
+        Runs a statement once per row of parameters (prepared only once).
+        Returns:
+            sqlite3.Cursor: The reused cursor.
+        """
+        sql = self.statements[name]
+        self._count(name, sql)
+        return self._cursor.executemany(sql, rows)
+
+    def iterate(self, name, params=(), sql=None):
+        """
+        Like execute(), but on a new cursor, for results that are read while other statements
+        run on this connection (e.g. iter_tasks(), which yields rows to the caller).
+        Returns:
+            sqlite3.Cursor: A new cursor.
+        """
+        sql = sql or self.statements[name]
+        self._count(name, sql)
+        return self.connection.execute(sql, params)
+
+    def stats(self):
+        """
+        Returns:
+            dict: statement name -> {"executions", "misses"}.
+        """
+        # (A copy first: the thread that owns this connection may be adding names meanwhile)
+        return {name: {"executions": count, "misses": self.misses.get(name, 0)}
+                for name, count in list(self.executions.items())}
+
+    def _count(self, name, sql):
+        self.executions[name] = self.executions.get(name, 0) + 1
+        if sql in self._prepared:
+            self._prepared.move_to_end(sql)
+            return
+        # Not prepared yet (or pushed out of the cache since): sqlite3 prepares and caches it now
+        self._prepared[sql] = None
+        if len(self._prepared) > self.capacity:
+            self._prepared.popitem(last=False)
+        self.misses[name] = self.misses.get(name, 0) + 1
+        STATEMENT_MISSES_TOTAL.inc(label_value=name)
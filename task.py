@@ -3,12 +3,18 @@
 
 import datetime # Need this for handling date and time stuff
 
+_NOT_PARSED = object() # Marks a due_datetime that hasn't been worked out yet (None is a valid result)
+
 class Task:
     """
     Represents a single task with its details.
     Each task object will hold info like description, note, due date/time, etc.
+    Uses __slots__ instead of a per-object __dict__: the app can hold a lot of tasks
+    at once (the whole list, reminder candidates), and slots make each one much smaller.
     """
-    def __init__(self, desc, note, due_date=None, due_time=None, email=None, id=None, status=0):
+    __slots__ = ("id", "desc", "note", "due_date", "due_time", "email", "status", "recurrence", "_due_datetime")
+
+    def __init__(self, desc, note, due_date=None, due_time=None, email=None, id=None, status=0, recurrence=None):
         """
         Constructor for the Task class. Initializes a new task object.
         Args:
@@ -19,6 +25,8 @@ class Task:
             email (str, optional): User's email for reminders. Defaults to None.
             id (int, optional): The task's ID from the database. Defaults to None.
             status (int, optional): 0 for Pending, 1 for Done. Defaults to 0.
+            recurrence (str, optional): Repeat rule (see recurrence.py), None for a one-off task.
+                                        The due date is then the date of the current occurrence.
         """
         self.id = id          # Task ID (usually from database)
         self.desc = desc      # Task description (the main name)
@@ -28,6 +36,8 @@ class Task:
         self.due_time = due_time if due_date else None
         self.email = email    # Email for sending reminders
         self.status = status  # 0 = Pending, 1 = Done
+        self.recurrence = recurrence if due_date else None # Repeat rule, needs a date like the time
+        self._due_datetime = _NOT_PARSED # Cache for the due_datetime property
 
     def __str__(self):
         """
@@ -36,7 +46,7 @@ class Task:
         """
         return self.desc
 
-    def update_details(self, desc, note, due_date=None, due_time=None, email=None):
+    def update_details(self, desc, note, due_date=None, due_time=None, email=None, recurrence=None):
         """
         Method to update the details of an existing task object.
         """
@@ -46,6 +56,8 @@ class Task:
         # Again, ensure time is None if date is None
         self.due_time = due_time if due_date else None
         self.email = email
+        self.recurrence = recurrence if due_date else None
+        self._due_datetime = _NOT_PARSED # Date/time may have changed, parse again next time
 
     def set_id(self, id):
         """
@@ -64,21 +76,35 @@ class Task:
         """
         A helper property to combine date and time strings into a proper datetime object.
         Returns a datetime object if both date and time exist and are valid, otherwise None.
-        Useful for time comparisons (like for reminders).
+        Useful for time comparisons (like for reminders) and for sorting the task list.
+        The result is worked out once and cached until update_details() changes the date/time.
         """
-        # Only proceed if both date and time strings are present
-        if self.due_date and self.due_time:
-            try:
-                # We store date as 'YYYY-MM-DD' and time as 'HH:MM'
-                # Parse the date string
-                date_part = datetime.datetime.strptime(self.due_date, '%Y-%m-%d').date()
-                # Parse the time string
-                time_part = datetime.datetime.strptime(self.due_time, '%H:%M').time()
-                # Combine them into a single datetime object
-                return datetime.datetime.combine(date_part, time_part)
-            except (ValueError, TypeError):
-                # If parsing fails (bad format, etc.), return None
-                # print(f"DEBUG: Error parsing datetime for date='{self.due_date}', time='{self.due_time}': {e}") # Optional debug
-                return None
-        # Return None if there's no date or no time
-        return None
\ No newline at end of file
+        if self._due_datetime is _NOT_PARSED:
+            self._due_datetime = parse_due_datetime(self.due_date, self.due_time)
+        return self._due_datetime
+
+
+def parse_due_datetime(due_date, due_time):
+    """
+    Combines a 'YYYY-MM-DD' date string and an 'HH:MM' time string into a datetime.
+    Args:
+        due_date (str or None): The due date.
+        due_time (str or None): The due time.
+    Returns:
+        datetime.datetime or None: The combined datetime, or None if either part is missing or invalid.
+    """
+    # Only proceed if both date and time strings are present
+    if not (due_date and due_time):
+        return None
+    try:
+        if len(due_date) == 10 and len(due_time) == 5:
+            # The way the app stores them ('YYYY-MM-DD' and 'HH:MM'): the fast ISO parser
+            return datetime.datetime.fromisoformat(f"{due_date}T{due_time}")
+        # Anything else (e.g. '2025-5-6' from an old import) goes through the slower, more lenient strptime
+        date_part = datetime.datetime.strptime(due_date, '%Y-%m-%d').date()
+        time_part = datetime.datetime.strptime(due_time, '%H:%M').time()
+        # Combine them into a single datetime object
+        return datetime.datetime.combine(date_part, time_part)
+    except (ValueError, TypeError):
+        # If parsing fails (bad format, etc.), return None
+        return None
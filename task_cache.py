@@ -0,0 +1,141 @@
+# task_cache.py
+# A small least-recently-used cache of task rows, used by DatabaseManager so that looking up
+# a task that was just listed (e.g. double-clicking it) doesn't have to ask SQLite again.
+
+import threading # The UI thread, the background loader and the reminder threads share it
+from collections import OrderedDict # Keeps the entries in least- to most-recently-used order
+
+class TaskCache:
+    """
+    Maps task IDs to their database rows (in TASK_COLUMNS order), at most `capacity` of them.
+    Rows (tuples) are stored instead of Task objects, because Task objects are changed in
+    place by the task list; every lookup builds a fresh Task from the row.
+
+    Readers may race with writers: a list query can read a row just before a write changes
+    it and try to cache it just after. To never cache such stale rows, every write bumps a
+    generation number; put_rows() only stores rows read in the current generation.
+    """
+    def __init__(self, capacity=1024):
+        """
+        Args:
+            capacity (int): Max. number of tasks kept (0 turns the cache off).
+        """
+        self.capacity = capacity
+        self._rows = OrderedDict() # task_id -> row, least recently used first
+        self._lock = threading.Lock()
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def generation(self):
+        """
+        int: Take this before a read query and pass it to put_rows() afterwards.
+        """
+        return self._generation
+
+    def get(self, task_id, count_miss=True):
+        """
+        Args:
+            task_id (int): The task's ID.
+            count_miss (bool): False if the caller will ask again through the database
+                               (so that one lookup isn't counted as two misses).
+        Returns:
+            tuple or None: The cached row of the task (None if it isn't cached). Counts a hit or a miss.
+        """
+        with self._lock:
+            row = self._rows.get(task_id)
+            if row is None:
+                if count_miss:
+                    self.misses += 1
+                return None
+            self._rows.move_to_end(task_id) # Most recently used now
+            self.hits += 1
+            return row
+
+    def put_rows(self, rows, generation):
+        """
+        Caches rows that a read query returned.
+        Args:
+            rows (iterable[tuple]): Rows in TASK_COLUMNS order (the ID is row[5]).
+            generation (int): The generation taken before the query ran. If a write happened
+                              since, the rows may be out of date and nothing is stored.
+        """
+        if not self.capacity:
+            return
+        with self._lock:
+            if generation != self._generation:
+                return
+            for row in rows:
+                self._store_locked(row)
+
+    def put(self, row):
+        """
+        Caches a row that was just written (write-through).
+        Args:
+            row (tuple): The row in TASK_COLUMNS order.
+        """
+        if not self.capacity:
+            return
+        with self._lock:
+            self._generation += 1
+            self._store_locked(row)
+
+    def update(self, task_id, changes):
+        """
+        Changes some columns of a cached row (if the task is cached at all).
+        Args:
+            task_id (int): The task's ID.
+            changes (dict): Column index -> new value, e.g. {6: 1} for status 'Done'.
+        """
+        with self._lock:
+            self._generation += 1
+            row = self._rows.get(task_id)
+            if row is not None:
+                row = list(row)
+                for index, value in changes.items():
+                    row[index] = value
+                self._rows[task_id] = tuple(row)
+
+    def invalidate(self, task_ids=None):
+        """
+        Forgets some tasks, or all of them.
+        Args:
+            task_ids (iterable[int], optional): The tasks to forget (None = everything).
+        """
+        with self._lock:
+            self._generation += 1
+            if task_ids is None:
+                self._rows.clear()
+            else:
+                for task_id in task_ids:
+                    self._rows.pop(task_id, None)
+
+    def stats(self):
+        """
+        Returns:
+            dict: hits, misses, hit_rate, evictions, size and capacity.
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "size": len(self._rows),
+                "capacity": self.capacity,
+            }
+
+    def __len__(self):
+        return len(self._rows)
+
+    def _store_locked(self, row):
+        # Caller must hold self._lock
+        task_id = row[5]
+        self._rows[task_id] = row
+        self._rows.move_to_end(task_id)
+        if len(self._rows) > self.capacity:
+            self._rows.popitem(last=False) # Drop the least recently used task
+            self.evictions += 1
@@ -0,0 +1,197 @@
+# task_io.py
+# Import and export of tasks as CSV or JSON Lines (one JSON object per line).
+# Everything is streamed: files are read and written one row at a time and
+# the database is read through its cursor, so even huge files need little memory.
+
+import csv  # For reading/writing CSV files
+import json # For reading/writing JSON Lines files
+import os   # To look at the file extension
+from task import Task # Need the Task class
+from task_validation import validate_task_fields # Same checks as the Add/Edit screen
+from recurrence import parse_recurrence, first_occurrence # Repeat rules are stored normalized
+
+# The columns of an exported file, in this order. On import, "id" is ignored (tasks get new IDs)
+# and every column except "description" is optional.
+TASK_FIELDS = ("id", "description", "note", "date", "time", "email", "status", "recurrence")
+
+# File extension -> format name
+FORMATS = {".csv": "csv", ".jsonl": "jsonl", ".ndjson": "jsonl"}
+
+DEFAULT_CHUNK_SIZE = 1000 # Tasks saved per transaction while importing
+
+
+class ImportResult:
+    """
+    What happened during an import.
+    """
+    def __init__(self):
+        self.imported = 0    # Tasks saved to the database
+        self.duplicates = [] # (line number, description) of tasks whose description already existed
+        self.invalid = []    # (line number, error message) of rows that failed validation
+
+    def __str__(self):
+        return f"{self.imported} imported, {len(self.duplicates)} duplicates, {len(self.invalid)} invalid"
+
+
+def detect_format(path, file_format=None):
+    """
+    Works out the file format from the extension (unless it is given).
+    Args:
+        path (str): The file path.
+        file_format (str, optional): "csv" or "jsonl", overrides the extension.
+    Returns:
+        str: "csv" or "jsonl".
+    Raises:
+        ValueError: If the format is unknown.
+    """
+    if file_format is None:
+        file_format = FORMATS.get(os.path.splitext(path)[1].lower())
+    if file_format not in ("csv", "jsonl"):
+        raise ValueError(f"Unknown file format for '{path}', use .csv or .jsonl (or give the format).")
+    return file_format
+
+
+def read_records(file, file_format):
+    """
+    Reads the rows of an open file one at a time.
+    Args:
+        file: The open text file.
+        file_format (str): "csv" or "jsonl".
+    Yields:
+        tuple: (line number, dict of the row) - or (line number, error message) if a
+               JSON line couldn't be read at all.
+    """
+    if file_format == "csv":
+        reader = csv.DictReader(file)
+        for record in reader:
+            yield reader.line_num, record
+    else:
+        for line_number, line in enumerate(file, start=1):
+            if not line.strip():
+                continue # Allow empty lines (e.g. at the end of the file)
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as e:
+                yield line_number, f"Invalid JSON: {e.msg}"
+                continue
+            if not isinstance(record, dict):
+                yield line_number, "Expected a JSON object."
+                continue
+            yield line_number, record
+
+
+def record_to_task(record):
+    """
+    Turns one imported row into a new Task, validated like the Add/Edit screen does.
+    Empty strings count as missing values.
+    Args:
+        record (dict): The row (keys from TASK_FIELDS, extra keys are ignored).
+    Returns:
+        Task: The new task (without an ID).
+    Raises:
+        ValueError: If the row isn't valid (the message says why).
+    """
+    def field(name):
+        value = record.get(name)
+        if value is None:
+            return None
+        value = str(value).strip()
+        return value or None
+
+    desc = field("description")
+    due_date = field("date")
+    due_time = field("time")
+    email = field("email")
+    recurrence = field("recurrence")
+    error = validate_task_fields(desc, due_date, due_time, email, recurrence)
+    if error:
+        raise ValueError(error)
+    status = field("status") or "0"
+    if status not in ("0", "1"):
+        raise ValueError(f"Invalid status '{status}', expected 0 (Pending) or 1 (Done).")
+    if recurrence:
+        # Same as TaskService.add_task(): the task starts at the rule's first date
+        due_date, recurrence = first_occurrence(parse_recurrence(recurrence, due_date), due_date)
+    return Task(desc, field("note") or "", due_date, due_time, email, status=int(status), recurrence=recurrence)
+
+
+def import_tasks(db_manager, path, file_format=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Imports the tasks from a CSV or JSON Lines file.
+    The tasks are saved chunk_size at a time, each chunk in one transaction. Invalid rows
+    and duplicate descriptions are skipped (and reported), the rest is still imported.
+    Args:
+        db_manager (DatabaseManager): The database to import into.
+        path (str): The file to read.
+        file_format (str, optional): "csv" or "jsonl"; by default taken from the file extension.
+        chunk_size (int): How many tasks are committed together.
+    Returns:
+        ImportResult: The counts and the problems found.
+    """
+    file_format = detect_format(path, file_format)
+    result = ImportResult()
+    chunk = [] # (line number, task) waiting to be saved
+
+    def save_chunk():
+        line_by_task = {id(task): line_number for line_number, task in chunk}
+        conflicts = db_manager.insert_tasks(task for _, task in chunk)
+        for task in conflicts:
+            result.duplicates.append((line_by_task[id(task)], task.desc))
+        result.imported += len(chunk) - len(conflicts)
+        chunk.clear()
+
+    # newline="" is what the csv module wants; it doesn't matter for JSON Lines
+    with open(path, newline="", encoding="utf-8") as file:
+        for line_number, record in read_records(file, file_format):
+            if isinstance(record, str):
+                result.invalid.append((line_number, record)) # Couldn't be read at all
+                continue
+            try:
+                chunk.append((line_number, record_to_task(record)))
+            except ValueError as e:
+                result.invalid.append((line_number, str(e)))
+                continue
+            if len(chunk) >= chunk_size:
+                save_chunk()
+    if chunk:
+        save_chunk()
+    return result
+
+
+def task_to_record(task):
+    """
+    Args:
+        task (Task): The task.
+    Returns:
+        dict: The task's fields, keyed like TASK_FIELDS.
+    """
+    return {
+        "id": task.id, "description": task.desc, "note": task.note, "date": task.due_date,
+        "time": task.due_time, "email": task.email, "status": task.status,
+        "recurrence": task.recurrence,
+    }
+
+
+def export_tasks(db_manager, path, file_format=None):
+    """
+    Writes all tasks (in list order) to a CSV or JSON Lines file.
+    Args:
+        db_manager (DatabaseManager): The database to export from.
+        path (str): The file to write (overwritten if it exists).
+        file_format (str, optional): "csv" or "jsonl"; by default taken from the file extension.
+    Returns:
+        int: How many tasks were written.
+    """
+    file_format = detect_format(path, file_format)
+    count = 0
+    with open(path, "w", newline="", encoding="utf-8") as file:
+        if file_format == "csv":
+            writer = csv.DictWriter(file, fieldnames=TASK_FIELDS)
+            writer.writeheader()
+            write = writer.writerow # None is written as an empty cell
+        else:
+            write = lambda record: file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        for task in db_manager.iter_tasks():
+            write(task_to_record(task))
+            count += 1
+    return count
@@ -0,0 +1,244 @@
+# task_model.py
+# The in-memory, sorted list of tasks the main window shows.
+# Tasks are loaded from the database a page at a time, as the user scrolls.
+# Changes (add/edit/delete/done) are applied to it one task at a time,
+# and whoever is interested (the list widget, the reminder scheduler) gets notified.
+
+from bisect import bisect_left # Binary search for a task's place in the sorted list
+
+def task_sort_key(task):
+    """
+    The order of the task list:
+    - Tasks with due date/time come first, sorted chronologically.
+    - Tasks without due date/time come after, sorted by ID.
+    The ID at the end makes every key unique, so a task's position can be found by binary search
+    (and ties are broken the same way the database lists them).
+    Args:
+        task (Task): The task.
+    Returns:
+        tuple: The sort key.
+    """
+    dt = task.due_datetime # Get the combined datetime object (or None)
+    return (0, dt, task.id) if dt else (1, task.id) # (0 means has date, 1 means no date)
+
+
+class TaskListModel:
+    """
+    Keeps the tasks sorted by task_sort_key and notifies listeners about every change.
+    Listeners are called as listener(event, task, old_index, new_index), where event is
+    "reset", "extend" (another page was loaded), "insert", "update" or "remove", and the
+    indexes are positions in the list before and after the change. An index is None where
+    it doesn't apply, or when the task is beyond the loaded pages (it shows up once its page
+    is loaded). For "reset" and "extend" the task is None.
+    """
+    def __init__(self, page_loader=None, page_size=200):
+        """
+        Args:
+            page_loader: Optional function page_loader(after, limit) that returns the next tasks in
+                         list order, like DatabaseManager.get_tasks_page. Needed for reload()/load_more().
+            page_size (int): How many tasks load_more() asks for at a time.
+        """
+        self.page_loader = page_loader
+        self.page_size = page_size
+        self.has_more = False # True while there may be tasks in the database that aren't loaded yet
+        self._cursor = None   # (due_date, due_time, id) of the last task loaded from the database
+        self._loaded_until = None # task_sort_key of that task
+        self.tasks = []       # The sorted tasks (listeners may read it, but shouldn't change it)
+        self._keys = []       # task_sort_key of each task in self.tasks, same order
+        self._by_id = {}      # task_id -> Task
+        self._key_by_id = {}  # task_id -> the sort key the task was inserted with
+        self._listeners = []
+        self.change_count = 0 # Goes up with every insert/update/mark_done/remove (see add_page)
+
+    def subscribe(self, listener):
+        """
+        Registers a function to be called after every change.
+        Args:
+            listener: Function listener(event, task, old_index, new_index).
+        """
+        self._listeners.append(listener)
+
+    def reset(self, tasks):
+        """
+        Replaces all tasks (a full load, e.g. at startup).
+        Args:
+            tasks (list[Task]): The tasks, in any order.
+        """
+        # Sort in place, so anyone holding on to self.tasks sees the new list
+        self.tasks[:] = sorted(tasks, key=task_sort_key)
+        self._keys = [task_sort_key(task) for task in self.tasks]
+        self._by_id = {task.id: task for task in self.tasks}
+        self._key_by_id = {task.id: key for task, key in zip(self.tasks, self._keys)}
+        self.has_more = False # Everything there is was given to us
+        self._notify("reset", None, None, None)
+
+    def reload(self):
+        """
+        Throws away the loaded tasks and loads the first page again.
+        """
+        self.add_page(None, self.page_loader(None, self.page_size), replace=True)
+
+    def load_more(self):
+        """
+        Loads the next page (if there is one) and appends it to the list.
+        Returns:
+            int: How many tasks were added.
+        """
+        if not self.has_more:
+            return 0
+        after = self._cursor
+        return self.add_page(after, self.page_loader(after, self.page_size))
+
+    @property
+    def cursor(self):
+        """
+        Where the next page starts: pass it to the page loader as 'after'
+        (None if nothing is loaded yet).
+        """
+        return self._cursor
+
+    def add_page(self, after, page, replace=False, change_count=None):
+        """
+        Adds a page of tasks that was loaded somewhere else (e.g. on a background thread).
+        Args:
+            after: The cursor the page was loaded with (self.cursor at the time, None for the first page).
+            page (list[Task]): The tasks from the page loader, in list order.
+            replace (bool): True if it's the first page of a reload: the loaded tasks are thrown away.
+            change_count (int, optional): self.change_count when the page was requested. If tasks were
+                                          changed since, the page may be missing them, so it isn't used.
+        Returns:
+            int or None: How many tasks were added, or None if the page is stale (the list was
+                         changed, reloaded or extended since it was requested; ask for it again).
+        """
+        if change_count is not None and change_count != self.change_count:
+            return None
+        if replace:
+            self.tasks.clear()
+            self._keys = []
+            self._by_id = {}
+            self._key_by_id = {}
+            self._cursor = None
+            self._loaded_until = None
+            added = self._append_page(page)
+            self._notify("reset", None, None, None)
+            return added
+        if not self.has_more or after != self._cursor:
+            return None
+        start = len(self.tasks)
+        added = self._append_page(page)
+        if added:
+            self._notify("extend", None, None, start)
+        return added
+
+    def insert(self, task):
+        """
+        Adds a new task at its sorted position.
+        Args:
+            task (Task): The task (with its database ID set).
+        """
+        new_index = self._insert(task)
+        self.change_count += 1
+        self._notify("insert", task, None, new_index) # new_index is None if it's beyond the loaded pages
+
+    def update(self, task):
+        """
+        Replaces a task with a changed version and moves it to its new sorted position.
+        Args:
+            task (Task): The changed task (same ID as the one in the list).
+        """
+        old_index = self._remove(task.id) if task.id in self._by_id else None
+        new_index = self._insert(task)
+        self.change_count += 1
+        self._notify("update", task, old_index, new_index)
+
+    def mark_done(self, task_id):
+        """
+        Marks a task as done. Its position doesn't change (the sort key ignores the status).
+        Args:
+            task_id (int): The ID of the task.
+        """
+        self.change_count += 1 # (Even if it isn't loaded: its page may be on its way)
+        task = self._by_id.get(task_id)
+        if task is None:
+            return
+        task.update_status()
+        index = self.index_of(task_id)
+        self._notify("update", task, index, index)
+
+    def remove(self, task_id):
+        """
+        Removes a task from the list.
+        Args:
+            task_id (int): The ID of the task.
+        """
+        self.change_count += 1 # (Even if it isn't loaded: its page may be on its way)
+        task = self._by_id.get(task_id)
+        if task is None:
+            return
+        old_index = self._remove(task_id)
+        self._notify("remove", task, old_index, None)
+
+    def get(self, task_id):
+        """
+        Returns:
+            Task or None: The task with this ID, if it is in the list.
+        """
+        return self._by_id.get(task_id)
+
+    def index_of(self, task_id):
+        """
+        Finds a task's position in the sorted list with a binary search.
+        Returns:
+            int or None: The index, or None if the task isn't in the list.
+        """
+        key = self._key_by_id.get(task_id)
+        if key is None:
+            return None
+        # Uses the stored key, so this works even if the task object was changed meanwhile
+        return bisect_left(self._keys, key)
+
+    def __len__(self):
+        return len(self.tasks)
+
+    def _append_page(self, page):
+        # Appends the page after the last loaded task (pages come sorted)
+        self.has_more = len(page) == self.page_size
+        added = 0
+        for task in page:
+            if task.id in self._by_id:
+                continue # Already added locally (never show a task twice)
+            key = task_sort_key(task)
+            self._keys.append(key)
+            self.tasks.append(task)
+            self._by_id[task.id] = task
+            self._key_by_id[task.id] = key
+            added += 1
+        if page:
+            last = page[-1]
+            self._cursor = (last.due_date, last.due_time, last.id)
+            self._loaded_until = task_sort_key(last)
+        return added
+
+    def _insert(self, task):
+        # Returns the task's new index, or None if it belongs to a page that isn't loaded yet
+        key = task_sort_key(task)
+        if self.has_more and self._loaded_until is not None and key > self._loaded_until:
+            return None # It will come with its page (the database already has it)
+        index = bisect_left(self._keys, key)
+        self._keys.insert(index, key)
+        self.tasks.insert(index, task)
+        self._by_id[task.id] = task
+        self._key_by_id[task.id] = key
+        return index
+
+    def _remove(self, task_id):
+        index = self.index_of(task_id)
+        del self._keys[index]
+        del self.tasks[index]
+        del self._by_id[task_id]
+        del self._key_by_id[task_id]
+        return index
+
+    def _notify(self, event, task, old_index, new_index):
+        for listener in self._listeners:
+            listener(event, task, old_index, new_index)
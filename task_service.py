@@ -0,0 +1,341 @@
+# task_service.py
+# Everything the app does with tasks, without any windows: saving, validating,
+# the sorted task list and the reminder schedule. The Tk app (app.py) only turns
+# clicks into calls to this class, so the same logic can run in scripts,
+# benchmarks or tests on a machine without a display.
+
+import logging # Level-controlled messages instead of prints
+from datetime import datetime # For the reminder loop
+from task import Task # Need the Task class
+from task_model import TaskListModel # Sorted in-memory task list with change notifications
+from reminder_scheduler import ReminderScheduler # Min-heap of upcoming reminders
+from task_validation import validate_task_fields # Same checks as the import tool
+from recurrence import parse_recurrence, first_occurrence, next_occurrence, following_occurrence # Repeating tasks
+from metrics import REGISTRY # Counters and histograms of the reminder pipeline
+import profiling # Timing spans (only when profiling is switched on)
+
+log = logging.getLogger(__name__)
+
+REMINDER_LATENESS_SECONDS = REGISTRY.histogram(
+    "reminder_lateness_seconds", "Time from the start of a reminder's window until it was sent.",
+    [0.1, 0.5, 1, 5, 10, 30, 60, 120, 300],
+)
+
+class TaskError(ValueError):
+    """
+    A task couldn't be saved because of the user's input (empty or duplicate description,
+    bad email...). The message is meant to be shown to the user as it is.
+    """
+
+
+class TaskService:
+    """
+    The task logic of the app:
+    - adding, editing, finishing and deleting tasks (validated, saved, and applied to the list);
+      finishing a repeating task moves it on to its next occurrence,
+    - the sorted task list (task_model), loaded from the database a page at a time,
+    - the reminder schedule, kept in step with every change.
+    """
+    def __init__(self, db_manager, reminder_window_minutes, max_sleep_seconds=3600, page_size=200):
+        """
+        Args:
+            db_manager (DatabaseManager): Where the tasks are stored.
+            reminder_window_minutes (int): How many minutes before the due time reminders go out.
+            max_sleep_seconds (float): Longest sleep of the reminder loop (see ReminderScheduler).
+            page_size (int): How many tasks the list loads at a time.
+        """
+        self.db_manager = db_manager
+        # The sorted list of tasks. It's loaded a page at a time as the user scrolls, and changes
+        # are applied to it one task at a time instead of reloading everything from the database.
+        self.task_model = TaskListModel(
+            page_loader=lambda after, limit: self.db_manager.get_tasks_page(after, limit),
+            page_size=page_size,
+        )
+        # Knows when the next reminder is due. Filled from the database once (in load_reminders)
+        # and kept up to date through the task model's change events.
+        self.reminder_scheduler = ReminderScheduler(reminder_window_minutes, max_sleep_seconds)
+        self.task_model.subscribe(self._on_task_model_changed)
+
+    # --- Task List ---
+
+    def reload(self):
+        """
+        (Re)loads the first page of the task list from the database.
+        """
+        self.task_model.reload()
+
+    def load_more(self):
+        """
+        Loads the next page of the task list.
+        Returns:
+            int: How many tasks were added.
+        """
+        return self.task_model.load_more()
+
+    def fetch_page(self, after):
+        """
+        Reads one page of the task list from the database without touching the list itself,
+        so it can run on a background thread. Give the result to task_model.add_page().
+        Args:
+            after: Where the page starts (task_model.cursor, or None for the first page).
+        Returns:
+            list[Task]: The tasks of the page, in list order.
+        """
+        return self.db_manager.get_tasks_page(after, self.task_model.page_size)
+
+    def get_task(self, task_id):
+        """
+        Returns:
+            Task or None: The task as it is stored in the database.
+        """
+        return self.db_manager.get_task_by_id(task_id)
+
+    def get_cached_task(self, task_id):
+        """
+        Like get_task(), but only answers from the database's task cache (no disk access,
+        so it's safe to call on the UI thread).
+        Returns:
+            Task or None: The task, or None if it isn't cached (then use get_task()).
+        """
+        return self.db_manager.peek_task(task_id)
+
+    def search(self, query, limit=50):
+        """
+        Finds tasks by the words in their description or note, best match first.
+        Returns:
+            list[Task]: The matching tasks.
+        """
+        return self.db_manager.search(query, limit)
+
+    # --- Changes ---
+
+    def validate(self, desc, due_date=None, due_time=None, email=None, task_id=None, recurrence=None):
+        """
+        Checks a task's fields, including that no other task has the same description.
+        Args:
+            desc (str): The description.
+            due_date (str, optional): YYYY-MM-DD.
+            due_time (str, optional): HH:MM.
+            email (str, optional): The reminder email.
+            task_id (int, optional): The ID of the task being edited (it may keep its own description).
+            recurrence (str, optional): The repeat rule (a preset name like "Weekly", or rule text).
+        Returns:
+            str or None: What is wrong, or None if the task can be saved.
+        """
+        error = validate_task_fields(desc, due_date, due_time, email, recurrence)
+        if error:
+            return error
+        if not self.is_desc_unique(desc, task_id):
+            return f"Task description '{desc}' already exists."
+        return None
+
+    def is_desc_unique(self, new_desc, current_task_id=None):
+        """
+        Checks if a given task description is unique among all tasks (ignoring upper/lower case).
+        Args:
+            new_desc (str): The description string to check for uniqueness.
+            current_task_id (int, optional): The ID of the task being edited, to exclude it
+                                             from the uniqueness check against itself.
+        Returns:
+            bool: True if the description is unique (or belongs to current_task_id), False otherwise.
+        """
+        # One indexed lookup; uses the same rule as the database's unique index
+        return not self.db_manager.description_exists(new_desc, current_task_id)
+
+    def add_task(self, desc, note, due_date=None, due_time=None, email=None, recurrence=None):
+        """
+        Validates and saves a new task and puts it into the task list.
+        A repeating task is saved once, at its first occurrence on or after due_date.
+        Returns:
+            Task: The saved task (with its new ID).
+        Raises:
+            TaskError: If the task isn't valid or its description is taken.
+        """
+        self._check(desc, due_date, due_time, email, recurrence=recurrence)
+        due_date, recurrence = self._start_series(due_date, recurrence)
+        task = Task(desc, note, due_date, due_time, email, recurrence=recurrence)
+        # insert_task also sets the new ID; it fails if another save took the description meanwhile
+        if not self.db_manager.insert_task(task):
+            raise TaskError(f"Task description '{desc}' already exists.")
+        self.task_model.insert(task) # Also schedules its reminder (see _on_task_model_changed)
+        return task
+
+    def update_task(self, task_id, desc, note, due_date=None, due_time=None, email=None, recurrence=None):
+        """
+        Validates and saves the changed details of a task and moves it to its new place in the list.
+        Returns:
+            Task: The saved task.
+        Raises:
+            TaskError: If the task isn't valid or its new description belongs to another task.
+        """
+        self._check(desc, due_date, due_time, email, task_id, recurrence)
+        due_date, recurrence = self._start_series(due_date, recurrence)
+        if not self.db_manager.update_task(task_id, desc, note, due_date, due_time, email, recurrence):
+            raise TaskError(f"Task description '{desc}' already exists.")
+        # Only pending tasks can be edited, so the saved task is still pending
+        task = Task(desc, note, due_date, due_time, email, task_id, recurrence=recurrence)
+        self.task_model.update(task) # Also reschedules its reminder
+        return task
+
+    def mark_done(self, task_id):
+        """
+        Marks a task as 'Done'. Done tasks don't get reminders.
+        A repeating task stays pending and moves on to its next occurrence instead
+        (until its rule runs out, then it is done like any other task).
+        Args:
+            task_id (int): The ID of the task.
+        Returns:
+            Task or None: The repeating task at its next occurrence, or None if the task is done now.
+        """
+        task = self.task_model.get(task_id) or self.db_manager.get_task_by_id(task_id)
+        if task is not None and task.recurrence and task.status == 0:
+            following = following_occurrence(task, datetime.now())
+            if following is not None:
+                self.db_manager.advance_task(following)
+                self.task_model.update(following) # New place in the list, and schedules its reminder
+                return following
+        self.db_manager.update_status(task_id)
+        self.reminder_scheduler.remove(task_id)
+        self.task_model.mark_done(task_id) # Shows the "[Done]" marker in the list
+        return None
+
+    def delete_task(self, task_id):
+        """
+        Deletes a task, its pending reminder and its row in the list.
+        Args:
+            task_id (int): The ID of the task.
+        """
+        self.db_manager.delete_task(task_id)
+        self.reminder_scheduler.remove(task_id)
+        self.task_model.remove(task_id)
+
+    # --- Reminders ---
+
+    def load_reminders(self):
+        """
+        Fills the reminder schedule from the database (the only full scan, at startup).
+        Repeating tasks are scheduled for their next occurrence that still needs a reminder.
+        Returns:
+            int: How many reminders are scheduled.
+        """
+        now = datetime.now()
+        tasks = []
+        sent = None # Sent occurrences of all repeating tasks, read once when the first one comes up
+        for task in self.db_manager.get_tasks_for_reminder():
+            if task.recurrence:
+                if sent is None:
+                    sent = self.db_manager.get_sent_occurrences()
+                task = self._reminder_occurrence(task, now, sent.get(task.id, ()))
+                if task is None:
+                    continue # The series is over
+            tasks.append(task)
+        self.reminder_scheduler.rebuild(tasks)
+        return len(self.reminder_scheduler)
+
+    def run_reminders(self, stop_event, on_due):
+        """
+        The reminder loop, meant to run in its own thread: loads the schedule, then sleeps until
+        the next reminder window starts (or the tasks change) and hands over the due tasks.
+        Runs until stop_event is set (call stop_reminders() after setting it).
+        Args:
+            stop_event (threading.Event): Set when the app is closing.
+            on_due: Function on_due(tasks, now) that sends (or queues) the reminders for the tasks.
+        """
+        log.info("reminder thread started")
+        try:
+            log.info("reminders scheduled count=%d", self.load_reminders())
+        except Exception:
+            log.exception("loading reminders failed")
+
+        # Loop until the app signals to stop
+        while not stop_event.is_set():
+            try:
+                with profiling.span("reminder.tick"):
+                    now = datetime.now()
+                    # Every task whose reminder window (due time - the window) has started
+                    due_tasks = self.reminder_scheduler.pop_due(now)
+                    if due_tasks:
+                        on_due(due_tasks, now)
+            except Exception:
+                # Catch any unexpected errors during the reminder check loop (logged with the traceback)
+                log.exception("error in reminder loop")
+
+            # Sleep until the next reminder is due. The scheduler wakes us up early when
+            # the tasks change or when the app is closing.
+            self.reminder_scheduler.wait(stop_event)
+
+        log.info("reminder thread stopped")
+
+    def stop_reminders(self):
+        """
+        Wakes the reminder loop up, so it notices the stop event right away.
+        """
+        self.reminder_scheduler.wake()
+
+    def reminder_sent(self, task):
+        """
+        Remembers that a task's reminder went out, so it isn't sent again (e.g. after a restart).
+        Called right after sending, so it also records how late the reminder was.
+        Args:
+            task (Task): The task the reminder was for.
+        """
+        self.db_manager.mark_reminder_sent(task)
+        window_start = self.reminder_scheduler.window_start(task)
+        if window_start is not None:
+            REMINDER_LATENESS_SECONDS.observe(max(0.0, (datetime.now() - window_start).total_seconds()))
+
+    def close(self):
+        """
+        Closes the database.
+        """
+        self.db_manager.close()
+
+    def _check(self, desc, due_date, due_time, email, task_id=None, recurrence=None):
+        # Raises TaskError with the first problem found
+        error = self.validate(desc, due_date, due_time, email, task_id, recurrence)
+        if error:
+            raise TaskError(error)
+
+    def _start_series(self, due_date, recurrence):
+        # The stored rule and the date of its first occurrence on or after due_date
+        # (a rule for Mondays saved with a Wednesday date starts on the next Monday).
+        # Only called after _check, so the rule is known to be valid.
+        if not recurrence:
+            return due_date, None
+        return first_occurrence(parse_recurrence(recurrence, due_date), due_date)
+
+    def _reminder_occurrence(self, task, now, sent=None):
+        """
+        The occurrence of a repeating task that gets the next reminder: the first one that isn't
+        due yet and whose reminder wasn't sent already (e.g. before a restart).
+        Only occurrences up to that one are worked out, never the whole series.
+        Args:
+            task (Task): The repeating task, at its current occurrence.
+            now (datetime): The current local time.
+            sent (set, optional): (date, time) of its occurrences that were reminded about
+                                  (see DatabaseManager.get_sent_occurrences; read if not given).
+        Returns:
+            Task or None: The occurrence, or None if the series is over.
+        """
+        if sent is None:
+            sent = self.db_manager.get_sent_occurrences(task).get(task.id, ())
+        occurrence = task if task.due_datetime and task.due_datetime > now else next_occurrence(task, now)
+        while occurrence is not None and (occurrence.due_date, occurrence.due_time) in sent:
+            occurrence = next_occurrence(occurrence, occurrence.due_datetime)
+        return occurrence
+
+    def _on_task_model_changed(self, event, task, old_index, new_index):
+        # Keeps the reminder schedule in step with saved tasks.
+        # (Deleted and finished tasks are removed directly, they may not be in the loaded pages.)
+        if event in ("insert", "update"):
+            if task.status != 0:
+                self.reminder_scheduler.remove(task.id) # Done: no reminder
+            elif task.recurrence:
+                occurrence = self._reminder_occurrence(task, datetime.now())
+                if occurrence is None:
+                    self.reminder_scheduler.remove(task.id)
+                else:
+                    self.reminder_scheduler.schedule(occurrence)
+            elif not self.db_manager.is_reminder_sent(task):
+                # New or changed due time (unless the reminder for it already went out)
+                self.reminder_scheduler.schedule(task)
@@ -0,0 +1,69 @@
+# task_validation.py
+# The checks a task has to pass before it is saved, shared by the Add/Edit screen
+# and the import tool, so a task that can't be typed in can't be imported either.
+
+import re # Using regex for basic email validation
+from datetime import datetime # For checking the date/time formats
+from recurrence import parse_recurrence # For checking repeat rules
+
+# Simple check for "something@something.something"
+EMAIL_PATTERN = re.compile(r"[^@]+@[^@]+\.[^@]+")
+
+def is_valid_email(email):
+    """
+    Args:
+        email (str): The email address to check.
+    Returns:
+        bool: True if it looks like an email address.
+    """
+    return EMAIL_PATTERN.fullmatch(email) is not None
+
+def validate_task_fields(desc, due_date=None, due_time=None, email=None, recurrence=None):
+    """
+    Checks the fields of a task (not the description's uniqueness, that needs the database).
+    Args:
+        desc (str): The description (required).
+        due_date (str, optional): The due date, must be YYYY-MM-DD.
+        due_time (str, optional): The due time, must be HH:MM (00:00 - 23:59). Needs a date.
+        email (str, optional): The reminder email.
+        recurrence (str, optional): The repeat rule (a preset name or rule text). Needs a date.
+    Returns:
+        str or None: What is wrong (like the messages on the Add/Edit screen), or None if all is fine.
+    """
+    # 1. Description is required
+    if not desc or not desc.strip():
+        return "Task description cannot be empty."
+
+    # 2. Time only makes sense together with a date
+    if due_time and not due_date:
+        return "Cannot set time without setting a date."
+    if due_date:
+        try:
+            # strptime also takes "2025-5-6", but dates are sorted and compared as text
+            # (task list order, page cursors), so only the zero-padded form is allowed
+            if len(due_date) != 10:
+                raise ValueError
+            datetime.strptime(due_date, "%Y-%m-%d")
+        except ValueError:
+            return f"Invalid date '{due_date}', expected YYYY-MM-DD."
+    if due_time:
+        try:
+            # The Add/Edit screen always saves two-digit hours and minutes
+            if len(due_time) != 5:
+                raise ValueError
+            datetime.strptime(due_time, "%H:%M")
+        except ValueError:
+            return f"Invalid time '{due_time}', expected HH:MM."
+
+    # 3. Email format (simple check for '@' and '.')
+    if email and not is_valid_email(email):
+        return "Invalid email format."
+
+    # 4. Repeat rule (the date is known to be valid by now)
+    if recurrence:
+        try:
+            parse_recurrence(recurrence, due_date)
+        except ValueError as e:
+            return str(e)
+
+    return None
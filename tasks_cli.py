@@ -0,0 +1,63 @@
+# tasks_cli.py
+# Command-line tool for getting tasks in and out of the database without the app window.
+#
+# Examples (run from the project folder, like app.py):
+#   python tasks_cli.py export backup.jsonl
+#   python tasks_cli.py import tasks.csv --chunk-size 5000
+#   python tasks_cli.py import data.txt --format jsonl --db other_database.db
+
+import argparse # For the command-line options
+import sys      # For the exit code
+from database_manager import DatabaseManager # Import the DB handling class
+from task_io import DEFAULT_CHUNK_SIZE, export_tasks, import_tasks
+
+def main(argv=None):
+    """
+    Runs the tool.
+    Args:
+        argv (list[str], optional): The arguments (default: the real command line).
+    Returns:
+        int: Exit code, 0 if everything worked, 1 if some rows were skipped, 2 on errors.
+    """
+    parser = argparse.ArgumentParser(description="Import or export Task Manager tasks as CSV or JSON Lines.")
+    parser.add_argument("--db", default="task_database.db", help="database file (default: task_database.db)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    import_parser = commands.add_parser("import", help="add the tasks from a file")
+    import_parser.add_argument("file")
+    import_parser.add_argument("--format", choices=("csv", "jsonl"), help="default: from the file extension")
+    import_parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE,
+                               help=f"tasks saved per transaction (default: {DEFAULT_CHUNK_SIZE})")
+    import_parser.add_argument("--show-skipped", action="store_true", help="list every skipped row")
+
+    export_parser = commands.add_parser("export", help="write all tasks to a file")
+    export_parser.add_argument("file")
+    export_parser.add_argument("--format", choices=("csv", "jsonl"), help="default: from the file extension")
+
+    args = parser.parse_args(argv)
+    if args.command == "import" and args.chunk_size < 1:
+        parser.error("--chunk-size must be at least 1")
+
+    db_manager = DatabaseManager(args.db)
+    try:
+        if args.command == "export":
+            count = export_tasks(db_manager, args.file, args.format)
+            print(f"Exported {count} tasks to {args.file}")
+            return 0
+
+        result = import_tasks(db_manager, args.file, args.format, args.chunk_size)
+        print(f"{args.file}: {result}")
+        if args.show_skipped:
+            for line_number, desc in result.duplicates:
+                print(f"  line {line_number}: Task description '{desc}' already exists.")
+            for line_number, error in result.invalid:
+                print(f"  line {line_number}: {error}")
+        return 1 if result.duplicates or result.invalid else 0
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+    finally:
+        db_manager.close()
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,8 @@
+# tests/conftest.py
+# Lets the tests import the app's modules (they live in the project folder, not in a package).
+# Run from the project folder with: python -m pytest
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,113 @@
+# tests/smtp_stand_in.py
+# A tiny SMTP server on 127.0.0.1 for the email tests (like the one in
+# benchmarks/stress_async_reminders.py), so no real mail goes out.
+
+import asyncio
+import threading
+
+
+class LocalSMTPServer:
+    """
+    Accepts everything (no TLS, no login) and keeps track of:
+    - received: recipient -> number of messages accepted for it,
+    - opened / connections / peak_connections: SMTP sessions opened in total, open now, most at once,
+    - peak_per_domain: recipient domain -> most messages of that domain in progress at once.
+    The first message to every recipient in fail_first gets a temporary "451" reply.
+    Runs its own event loop in a background thread; call close() when done.
+    """
+    def __init__(self, reply_delay=0.0, fail_first=()):
+        self.reply_delay = reply_delay
+        self.fail_first = set(fail_first)
+        self.received = {}
+        self.rejected = {}      # recipient -> number of 451 replies it got
+        self.opened = 0
+        self.connections = 0
+        self.peak_connections = 0
+        self.peak_per_domain = {}
+        self._in_progress = {}  # domain -> messages between MAIL and the reply to DATA
+        self._loop = asyncio.new_event_loop()
+        self._ready = threading.Event()
+        self._server = None
+        self.port = None
+        self._thread = threading.Thread(target=self._run, name="smtp-stand-in", daemon=True)
+        self._thread.start()
+        self._ready.wait()
+
+    def close(self):
+        self._loop.call_soon_threadsafe(self._server.close)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+
+    def _run(self):
+        asyncio.set_event_loop(self._loop)
+        self._server = self._loop.run_until_complete(asyncio.start_server(self._session, "127.0.0.1", 0))
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._ready.set()
+        self._loop.run_forever()
+
+    def _begin(self, domains):
+        for domain in domains:
+            self._in_progress[domain] = self._in_progress.get(domain, 0) + 1
+            self.peak_per_domain[domain] = max(self.peak_per_domain.get(domain, 0), self._in_progress[domain])
+
+    def _end(self, domains):
+        for domain in domains:
+            self._in_progress[domain] -= 1
+
+    async def _session(self, reader, writer):
+        self.opened += 1
+        self.connections += 1
+        self.peak_connections = max(self.peak_connections, self.connections)
+
+        async def reply(line):
+            if self.reply_delay:
+                await asyncio.sleep(self.reply_delay) # Network round trip + server work
+            writer.write(line.encode() + b"\r\n")
+            await writer.drain()
+
+        recipients = []
+        try:
+            await reply("220 stand-in ESMTP")
+            while True:
+                line = await reader.readline()
+                if not line:
+                    return
+                command = line.decode().strip()
+                verb = command[:4].upper()
+                if verb in ("EHLO", "HELO"):
+                    await reply("250-stand-in\r\n250 8BITMIME")
+                elif verb == "MAIL":
+                    await reply("250 OK")
+                elif verb == "RCPT":
+                    recipient = command.split(":", 1)[1].strip("<> ")
+                    recipients.append(recipient)
+                    self._begin([recipient.rsplit("@", 1)[-1]])
+                    await reply("250 OK")
+                elif verb == "DATA":
+                    await reply("354 End data with <CR><LF>.<CR><LF>")
+                    while (await reader.readline()) not in (b".\r\n", b""):
+                        pass
+                    failing = [r for r in recipients if r in self.fail_first and not self.rejected.get(r)]
+                    if failing:
+                        for recipient in failing:
+                            self.rejected[recipient] = self.rejected.get(recipient, 0) + 1
+                        await reply("451 Try again later")
+                    else:
+                        for recipient in recipients:
+                            self.received[recipient] = self.received.get(recipient, 0) + 1
+                        await reply("250 Queued")
+                    self._end(r.rsplit("@", 1)[-1] for r in recipients)
+                    recipients = []
+                elif verb == "RSET":
+                    self._end(r.rsplit("@", 1)[-1] for r in recipients)
+                    recipients = []
+                    await reply("250 OK")
+                elif verb == "QUIT":
+                    await reply("221 Bye")
+                    return
+                else:
+                    await reply("502 Not implemented")
+        finally:
+            self._end(r.rsplit("@", 1)[-1] for r in recipients)
+            self.connections -= 1
+            writer.close()
@@ -0,0 +1,54 @@
+# tests/test_async_mail_transport.py
+# AsyncSMTPTransport against local servers.
+
+import asyncio
+from email.message import EmailMessage
+
+import pytest
+from async_mail_transport import AsyncSMTPTransport
+from reminder_dispatcher import is_transient_error
+
+
+def message():
+    msg = EmailMessage()
+    msg["Subject"] = "Task Reminder: Task"
+    msg["From"] = "reminders@example.com"
+    msg["To"] = "someone@example.com"
+    msg.set_content("Reminder for Task\n")
+    return msg
+
+
+def test_silent_server_is_a_transient_timeout():
+    async def main():
+        # Accepts the connection but never says anything
+        server = await asyncio.start_server(lambda reader, writer: None, "127.0.0.1", 0)
+        transport = AsyncSMTPTransport("127.0.0.1", server.sockets[0].getsockname()[1], use_tls=False, timeout=0.1)
+        try:
+            with pytest.raises(TimeoutError) as caught: # The builtin one, on every Python version
+                await transport.send(message())
+        finally:
+            server.close()
+        return caught.value
+
+    error = asyncio.run(main())
+    assert isinstance(error, OSError)
+    assert is_transient_error(error)
+
+
+def test_idle_session_is_closed_by_a_kept_task():
+    from smtp_stand_in import LocalSMTPServer
+    server = LocalSMTPServer()
+
+    async def main():
+        transport = AsyncSMTPTransport("127.0.0.1", server.port, use_tls=False, idle_timeout=0.05)
+        await transport.send(message())
+        await asyncio.sleep(0.25) # The idle timer has fired and the close has finished
+        return transport
+
+    try:
+        transport = asyncio.run(main())
+    finally:
+        server.close()
+    assert not transport.is_connected
+    assert not transport._idle_closes # Forgotten once it's done
+    assert server.received == {"someone@example.com": 1}
@@ -0,0 +1,86 @@
+# tests/test_async_reminders.py
+# The asyncio reminder engine against a local stand-in SMTP server: every due reminder
+# arrives exactly once, the per-domain limit holds and temporary 4xx replies are retried.
+
+import threading
+import time
+from datetime import datetime, timedelta
+from email.message import EmailMessage
+
+import pytest
+from async_mail_transport import AsyncSMTPTransport
+from async_reminders import AsyncReminderEngine
+from database_manager import DatabaseManager
+from smtp_stand_in import LocalSMTPServer
+from task import Task
+from task_service import TaskService
+
+REMINDERS = 120
+DOMAINS = ["example.com", "example.org", "mail.test"]
+PER_DOMAIN_LIMIT = 2
+
+
+def recipient(n):
+    return f"user{n}@{DOMAINS[n % len(DOMAINS)]}"
+
+
+@pytest.fixture
+def server():
+    # Every 10th recipient gets "451 Try again later" for its first message
+    server = LocalSMTPServer(reply_delay=0.002, fail_first=[recipient(n) for n in range(0, REMINDERS, 10)])
+    yield server
+    server.close()
+
+
+def build_message(task):
+    msg = EmailMessage()
+    msg["Subject"] = f"Task Reminder: {task.desc}"
+    msg["From"] = "reminders@example.com"
+    msg["To"] = task.email
+    msg.set_content(f"Reminder for {task.desc}\n")
+    return msg
+
+
+def test_every_reminder_is_delivered_once(tmp_path, server):
+    db_manager = DatabaseManager(str(tmp_path / "tasks.db"))
+    due = datetime.now() + timedelta(minutes=3) # Inside the 5 minute reminder window
+    db_manager.insert_tasks([Task(f"Reminder {n}", None, due.strftime("%Y-%m-%d"), due.strftime("%H:%M"), recipient(n))
+                             for n in range(REMINDERS)])
+    service = TaskService(db_manager, reminder_window_minutes=5)
+    failed = []
+
+    async def send(task, transport):
+        await transport.send(build_message(task))
+
+    engine = AsyncReminderEngine(
+        service, send=send,
+        transport_factory=lambda: AsyncSMTPTransport("127.0.0.1", server.port, use_tls=False),
+        on_sent=service.reminder_sent, on_failed=lambda task, e: failed.append(e),
+        connections=8, per_domain_limit=PER_DOMAIN_LIMIT, backoff_seconds=0.05,
+    )
+    stop_event = threading.Event()
+    thread = threading.Thread(target=engine.run, args=(stop_event, lambda tasks, now: [engine.submit(t) for t in tasks]))
+    thread.start()
+    try:
+        deadline = time.monotonic() + 20
+        while time.monotonic() < deadline:
+            stats = engine.stats()
+            if stats["sent"] + stats["failed"] >= REMINDERS:
+                break
+            time.sleep(0.02)
+    finally:
+        stop_event.set()
+        service.stop_reminders()
+        thread.join(10)
+
+    try:
+        assert failed == []
+        assert server.received == {recipient(n): 1 for n in range(REMINDERS)}
+        assert max(server.peak_per_domain.values()) == PER_DOMAIN_LIMIT # Reached, never exceeded
+        assert set(server.peak_per_domain) == set(DOMAINS)
+        assert server.rejected == {recipient(n): 1 for n in range(0, REMINDERS, 10)}
+        assert engine.stats()["retried"] == len(server.rejected)
+        ledger = db_manager.connection.execute("SELECT COUNT(*) FROM reminder_deliveries").fetchone()[0]
+        assert ledger == REMINDERS
+    finally:
+        db_manager.close()
@@ -0,0 +1,81 @@
+# tests/test_concurrency.py
+# DatabaseManager shared by several threads, like the app does: the UI thread writes while
+# reminder threads scan and record sent reminders, and readers page through the list.
+# There must be no "database is locked" errors and every write must be in the file afterwards.
+
+import threading
+
+import pytest
+from database_manager import DatabaseManager
+from task import Task
+
+TASKS = 300
+READERS = 4
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / "tasks.db")
+
+
+def test_readers_and_writers_at_the_same_time(db_path):
+    db_manager = DatabaseManager(db_path)
+    errors = []
+    writers_done = threading.Event()
+
+    def guarded(func):
+        def run():
+            try:
+                func()
+            except Exception as e: # Any error fails the test, "database is locked" in particular
+                errors.append(e)
+        return run
+
+    def ui_writer():
+        for number in range(TASKS):
+            task = Task(f"Task {number}", None, "2030-01-01", f"{number % 24:02d}:00", "someone@example.com")
+            assert db_manager.insert_task(task)
+            assert db_manager.update_task(task.id, task.desc, "edited", "2030-01-02", task.due_time, task.email)
+            if number % 3 == 0:
+                db_manager.update_status(task.id)
+
+    def reminder_writer():
+        # Records reminders for whatever the scan finds, until the UI side is done
+        while not writers_done.is_set():
+            for task in db_manager.get_tasks_for_reminder()[:10]:
+                db_manager.mark_reminder_sent(task)
+
+    def reader():
+        while not writers_done.is_set():
+            page = db_manager.get_tasks_page(None, 50)
+            assert all(task.id is not None for task in page)
+            db_manager.search("Task")
+            if page:
+                db_manager.get_task_by_id(page[-1].id)
+
+    threads = [threading.Thread(target=guarded(reader)) for _ in range(READERS)]
+    threads.append(threading.Thread(target=guarded(reminder_writer)))
+    for thread in threads:
+        thread.start()
+    guarded(ui_writer)()
+    writers_done.set()
+    for thread in threads:
+        thread.join(30)
+    # The last reminders, now that nothing else is writing
+    for task in db_manager.get_tasks_for_reminder():
+        db_manager.mark_reminder_sent(task)
+    db_manager.close()
+
+    assert errors == []
+    # Nothing was lost: read everything back through a new connection
+    db_manager = DatabaseManager(db_path)
+    try:
+        tasks = db_manager.get_all_tasks()
+        assert len(tasks) == TASKS
+        assert all(task.note == "edited" and task.due_date == "2030-01-02" for task in tasks)
+        assert sum(task.status for task in tasks) == len(range(0, TASKS, 3))
+        assert db_manager.get_tasks_for_reminder() == [] # Every pending task got its reminder
+        sent = db_manager.connection.execute("SELECT COUNT(*) FROM reminder_deliveries WHERE date='2030-01-02'")
+        assert sent.fetchone()[0] >= TASKS - len(range(0, TASKS, 3))
+    finally:
+        db_manager.close()
@@ -0,0 +1,75 @@
+# tests/test_mail_transport.py
+# SMTPTransport against a local stand-in server: one session for many messages,
+# and one idle timer (not one thread per email) that closes it when it's no longer used.
+
+import threading
+import time
+from email.message import EmailMessage
+
+import pytest
+from mail_transport import SMTPTransport
+from smtp_stand_in import LocalSMTPServer
+
+
+@pytest.fixture
+def server():
+    server = LocalSMTPServer()
+    yield server
+    server.close()
+
+
+def message(n):
+    msg = EmailMessage()
+    msg["Subject"] = f"Task Reminder: Task {n}"
+    msg["From"] = "reminders@example.com"
+    msg["To"] = f"user{n}@example.com"
+    msg.set_content(f"Reminder for Task {n}\n")
+    return msg
+
+
+def test_messages_share_one_session(server):
+    transport = SMTPTransport("127.0.0.1", server.port, use_tls=False)
+    for n in range(20):
+        transport.send(message(n))
+    transport.close()
+    assert server.received == {f"user{n}@example.com": 1 for n in range(20)}
+    assert server.opened == 1
+
+
+def test_one_idle_timer_for_many_messages(server, monkeypatch):
+    started = []
+
+    class CountingTimer(threading.Timer):
+        def start(self):
+            started.append(self)
+            super().start()
+
+    monkeypatch.setattr(threading, "Timer", CountingTimer)
+    transport = SMTPTransport("127.0.0.1", server.port, use_tls=False, idle_timeout=30)
+    for n in range(50):
+        transport.send(message(n))
+    transport.close()
+    assert len(started) == 1 # Not one thread per email
+
+
+def test_idle_session_is_closed_by_the_timer(server):
+    transport = SMTPTransport("127.0.0.1", server.port, use_tls=False, idle_timeout=0.2)
+    transport.send(message(1))
+    time.sleep(0.1)
+    transport.send(message(2)) # Used again: the timer has to wait for the rest of the idle time
+    time.sleep(0.15)
+    assert transport.is_connected
+    time.sleep(0.3)
+    assert not transport.is_connected
+    assert server.opened == 1
+
+
+def test_stale_session_is_replaced_on_the_next_send(server):
+    transport = SMTPTransport("127.0.0.1", server.port, use_tls=False, idle_timeout=0.1)
+    transport.send(message(1))
+    transport._cancel_idle_timer() # As if the timer hadn't got to it yet
+    time.sleep(0.15)
+    transport.send(message(2))
+    transport.close()
+    assert server.opened == 2
+    assert server.received == {"user1@example.com": 1, "user2@example.com": 1}
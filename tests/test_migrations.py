@@ -0,0 +1,29 @@
+# tests/test_migrations.py
+# Schema migrations of existing database files.
+
+import sqlite3
+
+from database_manager import DatabaseManager, SCHEMA_MIGRATIONS
+from task import Task
+
+
+def test_search_index_is_added_later_if_it_was_skipped(tmp_path):
+    path = str(tmp_path / "tasks.db")
+    db_manager = DatabaseManager(path)
+    db_manager.insert_task(Task("Buy milk", "at the corner shop"))
+    db_manager.close()
+    # Like a file migrated by a Python build without FTS5: step 3 done, but no search index
+    connection = sqlite3.connect(path)
+    with connection:
+        for trigger in ("tasks_fts_insert", "tasks_fts_delete", "tasks_fts_update"):
+            connection.execute(f"DROP TRIGGER {trigger}")
+        connection.execute("DROP TABLE tasks_fts")
+    connection.close()
+
+    db_manager = DatabaseManager(path)
+    try:
+        assert db_manager.has_search_index
+        assert db_manager.connection.execute("PRAGMA user_version").fetchone()[0] == len(SCHEMA_MIGRATIONS)
+        assert [task.desc for task in db_manager.search("corner")] == ["Buy milk"]
+    finally:
+        db_manager.close()
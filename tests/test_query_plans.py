@@ -0,0 +1,52 @@
+# tests/test_query_plans.py
+# The hot queries must keep using their indexes on databases that look like real ones:
+# mostly tasks without a date (which sort first in the date/time index) and some with one,
+# or the other way round (a few undated tasks at the end of a long dated list).
+
+import pytest
+from database_manager import DatabaseManager, HOT_QUERIES
+
+# (undated tasks, dated tasks)
+MIXES = {"mostly_undated": (20000, 500), "mostly_dated": (300, 20000)}
+
+
+@pytest.fixture(scope="module", params=list(MIXES))
+def db_manager(request, tmp_path_factory):
+    undated_tasks, dated_tasks = MIXES[request.param]
+    db_manager = DatabaseManager(str(tmp_path_factory.mktemp("plans") / "tasks.db"))
+    # Most dated tasks are done or have no reminder email, like in a list that has been used a while
+    rows = [(f"Dated {i}", "", f"2030-01-{i % 28 + 1:02d}", "12:00",
+             "someone@example.com" if i % 10 == 0 else None, int(i % 3 != 0))
+            for i in range(dated_tasks)]
+    rows += [(f"Undated {i}", "", None, None, None, 0) for i in range(undated_tasks)]
+    with db_manager.connection:
+        db_manager.connection.executemany(
+            "INSERT INTO tasks (description, note, date, time, email, status) VALUES (?, ?, ?, ?, ?, ?)", rows
+        )
+        db_manager.connection.execute("ANALYZE") # Plans based on the real row counts
+    yield db_manager
+    db_manager.close()
+
+
+@pytest.mark.parametrize("name", list(HOT_QUERIES))
+def test_hot_query_uses_its_index(db_manager, name):
+    ok, plan = db_manager.check_query_plans()[name]
+    assert ok, f"{name}: {' | '.join(plan)}"
+
+
+def test_first_page_starts_at_the_first_dated_task(db_manager):
+    tasks = db_manager.get_tasks_page(None, 10)
+    assert [task.due_date for task in tasks] == sorted(task.due_date for task in tasks)
+    assert all(task.due_date for task in tasks)
+
+
+def test_full_index_scan_is_not_ok(db_manager):
+    # The old dated-list query (no "date IS NOT NULL") scans the whole date/time index
+    query, params, _ = HOT_QUERIES["list_dated"]
+    old_query = query.replace("date IS NOT NULL AND ", "")
+    HOT_QUERIES["old_list_dated"] = (old_query, params, "idx_tasks_date_time")
+    try:
+        ok, plan = db_manager.check_query_plans()["old_list_dated"]
+    finally:
+        del HOT_QUERIES["old_list_dated"]
+    assert not ok, " | ".join(plan)
@@ -0,0 +1,78 @@
+# tests/test_recurrence.py
+# Repeating tasks: one row per task, with reminders recorded per occurrence.
+
+import pytest
+from database_manager import DatabaseManager
+from recurrence import occurrences
+from task import Task
+
+
+@pytest.fixture
+def db_manager(tmp_path):
+    db_manager = DatabaseManager(str(tmp_path / "tasks.db"))
+    yield db_manager
+    db_manager.close()
+
+
+def repeating_task(db_manager, desc="Standup"):
+    task = Task(desc, "", "2030-01-01", "10:00", "someone@example.com", recurrence="FREQ=DAILY")
+    db_manager.insert_task(task)
+    return task
+
+
+def first_occurrences(task, count):
+    series = occurrences(task)
+    return [next(series) for _ in range(count)]
+
+
+def test_editing_a_repeating_task_keeps_sent_reminders(db_manager):
+    task = repeating_task(db_manager)
+    sent = first_occurrences(task, 3)
+    for occurrence in sent:
+        db_manager.mark_reminder_sent(occurrence)
+    db_manager.update_task(task.id, task.desc, "edited", task.due_date, task.due_time, task.email, task.recurrence)
+    assert all(db_manager.is_reminder_sent(occurrence) for occurrence in sent)
+
+
+def test_bulk_edit_of_a_repeating_task_keeps_sent_reminders(db_manager):
+    task = repeating_task(db_manager)
+    sent = first_occurrences(task, 3)
+    for occurrence in sent:
+        db_manager.mark_reminder_sent(occurrence)
+    task.note = "edited"
+    assert db_manager.update_tasks([task]) == []
+    assert all(db_manager.is_reminder_sent(occurrence) for occurrence in sent)
+
+
+def test_moving_a_repeating_task_forgets_earlier_occurrences(db_manager):
+    task = repeating_task(db_manager)
+    first, second, third = first_occurrences(task, 3)
+    for occurrence in (first, second, third):
+        db_manager.mark_reminder_sent(occurrence)
+    db_manager.update_task(task.id, task.desc, "", second.due_date, task.due_time, task.email, task.recurrence)
+    assert not db_manager.is_reminder_sent(first)
+    assert db_manager.is_reminder_sent(second) and db_manager.is_reminder_sent(third)
+
+
+def test_moving_a_single_task_still_forgets_its_reminder(db_manager):
+    task = Task("Dentist", "", "2030-01-01", "10:00", "someone@example.com")
+    db_manager.insert_task(task)
+    db_manager.mark_reminder_sent(task)
+    db_manager.update_task(task.id, task.desc, "", "2030-01-01", "11:00", task.email)
+    assert not db_manager.is_reminder_sent(task)
+
+
+def test_load_reminders_reads_sent_occurrences_once(db_manager, monkeypatch):
+    from task_service import TaskService
+    tasks = [repeating_task(db_manager, f"Standup {i}") for i in range(20)]
+    for task in tasks:
+        db_manager.mark_reminder_sent(task) # The first occurrence was reminded about
+    calls = []
+    get_sent_occurrences = db_manager.get_sent_occurrences
+    monkeypatch.setattr(db_manager, "get_sent_occurrences", lambda *args: calls.append(args) or get_sent_occurrences(*args))
+    monkeypatch.setattr(db_manager, "is_reminder_sent", lambda task: pytest.fail("one query per occurrence"))
+    service = TaskService(db_manager, 5)
+    assert service.load_reminders() == 20
+    assert calls == [()]
+    upcoming = service.reminder_scheduler._live
+    assert {upcoming[task.id][1].due_date for task in tasks} == {"2030-01-02"}
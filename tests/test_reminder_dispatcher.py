@@ -0,0 +1,46 @@
+# tests/test_reminder_dispatcher.py
+# The sender threads: a send that is waiting to be retried must not keep its domain's slot.
+
+import smtplib
+import threading
+import time
+
+from reminder_dispatcher import ReminderDispatcher
+from task import Task
+
+
+class NullTransport:
+    def close(self):
+        pass
+
+
+def test_backoff_does_not_hold_the_domain_slot():
+    slow = Task("Slow", "", "2030-01-01", "10:00", "slow@example.com", 1)
+    quick = Task("Quick", "", "2030-01-01", "10:00", "quick@example.com", 2)
+    sent = {}
+    failed_once = threading.Event()
+
+    def send(task, transport):
+        if task is slow and not failed_once.is_set():
+            failed_once.set()
+            raise smtplib.SMTPResponseException(451, b"Try again later")
+
+    started = time.monotonic()
+    dispatcher = ReminderDispatcher(
+        send, NullTransport, on_sent=lambda task: sent.setdefault(task.id, time.monotonic() - started),
+        workers=2, per_domain_limit=1, backoff_seconds=1.0,
+    )
+    dispatcher.start()
+    try:
+        dispatcher.submit(slow)
+        failed_once.wait(1)
+        dispatcher.submit(quick)
+        deadline = time.monotonic() + 3
+        while len(sent) < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+    finally:
+        dispatcher.stop(timeout=1)
+    assert set(sent) == {1, 2}
+    assert sent[2] < 0.5 # Sent while the slow one was waiting for its retry
+    assert sent[1] >= 1.0
+    assert dispatcher.stats()["retried"] == 1
@@ -0,0 +1,115 @@
+# tests/test_task_model.py
+# TaskListModel applies changes to the loaded pages in place: inserting, editing or removing
+# a task must never ask the page loader (the database) for the list again.
+
+import pytest
+from task import Task
+from task_model import TaskListModel, task_sort_key
+
+PAGE_SIZE = 5
+
+
+class CountingLoader:
+    """
+    A page loader over a fixed list of tasks (like DatabaseManager.get_tasks_page) that
+    counts how often it is called.
+    """
+    def __init__(self, tasks):
+        self.tasks = sorted(tasks, key=task_sort_key)
+        self.calls = 0
+
+    def __call__(self, after, limit):
+        self.calls += 1
+        start = 0
+        if after is not None:
+            ids = [task.id for task in self.tasks]
+            start = ids.index(after[2]) + 1 # after = (due_date, due_time, id) of the last loaded task
+        return self.tasks[start:start + limit]
+
+
+def dated(task_id, day, time="12:00"):
+    return Task(f"Task {task_id}", "", f"2030-01-{day:02d}", time, None, task_id)
+
+
+def undated(task_id):
+    return Task(f"Task {task_id}", "", None, None, None, task_id)
+
+
+@pytest.fixture
+def model():
+    # Tasks 1..8 are due on Jan 1..8, 9..12 have no date; the first page holds tasks 1..5
+    tasks = [dated(i, i) for i in range(1, 9)] + [undated(i) for i in range(9, 13)]
+    loader = CountingLoader(tasks)
+    model = TaskListModel(page_loader=loader, page_size=PAGE_SIZE)
+    model.reload()
+    model.events = []
+    model.subscribe(lambda event, task, old, new: model.events.append((event, task and task.id, old, new)))
+    model.loader = loader
+    return model
+
+
+def ids(model):
+    return [task.id for task in model.tasks]
+
+
+def test_first_page_is_loaded_once(model):
+    assert model.loader.calls == 1
+    assert ids(model) == [1, 2, 3, 4, 5]
+    assert model.has_more
+
+
+def test_insert_patches_the_loaded_page(model):
+    model.insert(dated(20, 2, "18:00")) # After task 2 (same day, later time)
+    assert ids(model) == [1, 2, 20, 3, 4, 5]
+    assert model.events == [("insert", 20, None, 2)]
+    assert model.loader.calls == 1
+
+
+def test_update_moves_the_task(model):
+    model.update(dated(4, 1, "08:00")) # Task 4 moved before task 1
+    assert ids(model) == [4, 1, 2, 3, 5]
+    assert model.events == [("update", 4, 3, 0)]
+    assert model.loader.calls == 1
+
+
+def test_remove_patches_the_loaded_page(model):
+    model.remove(3)
+    assert ids(model) == [1, 2, 4, 5]
+    assert model.events == [("remove", 3, 2, None)]
+    assert model.index_of(3) is None
+    assert model.loader.calls == 1
+
+
+def test_mark_done_keeps_the_position(model):
+    model.mark_done(2)
+    assert model.get(2).status == 1
+    assert model.events == [("update", 2, 1, 1)]
+    assert model.loader.calls == 1
+
+
+def test_insert_beyond_the_loaded_pages_has_no_index(model):
+    model.insert(dated(21, 20)) # Belongs to a page that isn't loaded yet
+    assert ids(model) == [1, 2, 3, 4, 5]
+    assert model.events == [("insert", 21, None, None)]
+    assert model.get(21) is None
+
+
+def test_update_out_of_and_into_the_loaded_pages(model):
+    model.update(dated(2, 25)) # Moves beyond the loaded pages: removed here, no new index
+    model.update(dated(7, 3, "06:00")) # Task 7 (not loaded) moves into the first page
+    assert ids(model) == [1, 7, 3, 4, 5]
+    assert model.events == [("update", 2, 1, None), ("update", 7, None, 1)]
+    assert model.loader.calls == 1
+
+
+def test_remove_of_an_unloaded_task_is_ignored(model):
+    model.remove(10)
+    assert model.events == []
+    assert ids(model) == [1, 2, 3, 4, 5]
+
+
+def test_load_more_continues_after_the_cursor(model):
+    assert model.load_more() == PAGE_SIZE
+    assert ids(model) == [1, 2, 3, 4, 5, 6, 7, 8, 9, 10]
+    assert model.events == [("extend", None, None, 5)]
+    assert model.loader.calls == 2
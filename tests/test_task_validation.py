@@ -0,0 +1,26 @@
+# tests/test_task_validation.py
+# Dates and times must be stored zero-padded, because the list order and the page cursors
+# compare them as text. The import tool uses the same checks as the Add/Edit screen.
+
+import pytest
+from task_io import record_to_task
+from task_validation import validate_task_fields
+
+
+@pytest.mark.parametrize("due_date", ["2025-5-6", "2025-05-6", "2025-5-06", "25-05-06", "2025-02-30"])
+def test_bad_dates_are_rejected(due_date):
+    assert validate_task_fields("Task", due_date) == f"Invalid date '{due_date}', expected YYYY-MM-DD."
+
+
+@pytest.mark.parametrize("due_time", ["9:05", "09:5", "24:00"])
+def test_bad_times_are_rejected(due_time):
+    assert validate_task_fields("Task", "2025-05-06", due_time) == f"Invalid time '{due_time}', expected HH:MM."
+
+
+def test_padded_date_and_time_are_fine():
+    assert validate_task_fields("Task", "2025-05-06", "09:05", "someone@example.com") is None
+
+
+def test_import_rejects_unpadded_dates():
+    with pytest.raises(ValueError, match="expected YYYY-MM-DD"):
+        record_to_task({"description": "Task", "date": "2025-5-6"})